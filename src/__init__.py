@@ -1,4 +1,5 @@
 from .connect_four import ConnectFour
 from .board import Board
+from .bitboard import BitBoard
 from .player import Player
 from .player_ai import PlayerAI
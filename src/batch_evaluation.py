@@ -0,0 +1,72 @@
+from python_settings import settings
+import numpy as np
+from geometry import evaluation_table, utility_value
+
+def boards_to_array(boards) -> np.ndarray:
+    '''
+    Stacks boards into an (N x ROWS x COLS) int8 array of piece colors. Each board only needs to support indexing by
+    (row, column) coords, so both Board and BitBoard objects can be stacked.
+    '''
+    stacked = np.zeros((len(boards), settings.ROWS, settings.COLS), dtype=np.int8)
+
+    for n, board in enumerate(boards):
+        for i in range(settings.ROWS):
+            for j in range(settings.COLS):
+                stacked[n, i, j] = board[i, j]
+
+    return stacked
+
+def connected(pieces, connect = None) -> np.ndarray:
+    '''
+    Returns an array of N bools, True for every board of the (N x ROWS x COLS) bool array pieces that has connect
+    (settings.CONNECT by default) in a row. These are the same vertical, horizontal and diagonal windows that
+    Board.check_* scans, shifted against each other so that every window of every board is checked at once.
+    '''
+    connect = connect if connect is not None else settings.CONNECT
+    rows, cols = pieces.shape[1], pieces.shape[2]
+    # Window k of a direction holds the slot k steps along the line from the slot each window starts on
+    spans = range(connect)
+    vertical = np.logical_and.reduce([pieces[:, k:rows - connect + 1 + k] for k in spans])
+    horizontal = np.logical_and.reduce([pieces[:, :, k:cols - connect + 1 + k] for k in spans])
+    diagonal_right = np.logical_and.reduce([pieces[:, k:rows - connect + 1 + k, k:cols - connect + 1 + k] for k in spans])
+    diagonal_left = np.logical_and.reduce([pieces[:, connect - 1 - k:rows - k, k:cols - connect + 1 + k] for k in spans])
+
+    return vertical.any(axis=(1, 2)) | horizontal.any(axis=(1, 2)) | \
+        diagonal_right.any(axis=(1, 2)) | diagonal_left.any(axis=(1, 2))
+
+def winners(boards) -> np.ndarray:
+    '''
+    Returns an int8 array with the winning color of every board of the (N x ROWS x COLS) array boards, or
+    settings.EMPTY where there is no winner.
+    '''
+    red_wins = connected(boards == settings.RED)
+    yellow_wins = connected(boards == settings.YELLOW)
+
+    return np.where(red_wins, settings.RED, np.where(yellow_wins, settings.YELLOW, settings.EMPTY)).astype(np.int8)
+
+def positional_scores(boards, player_color) -> np.ndarray:
+    '''
+    Returns the sum of the evaluation table over the pieces of player_color minus the sum over the pieces of the
+    opposing player, for every board of the (N x ROWS x COLS) array boards.
+    '''
+    table = np.asarray(evaluation_table(), dtype=np.int64)
+    opposing_color = settings.YELLOW if player_color == settings.RED else settings.RED
+    signs = (boards == player_color).astype(np.int64) - (boards == opposing_color).astype(np.int64)
+
+    return np.tensordot(signs, table, axes=([1, 2], [0, 1]))
+
+def evaluate_batch(boards, player_color) -> tuple:
+    '''
+    Evaluates every board of the (N x ROWS x COLS) array boards for player_color the same way PlayerAI.evaluate()
+    does, see there for the scoring.
+
+    Returns:
+        A tuple of (scores, winners), two arrays of N values.
+    '''
+    board_winners = winners(boards)
+    opposing_color = settings.YELLOW if player_color == settings.RED else settings.RED
+    scores = utility_value() + positional_scores(boards, player_color)
+    scores += np.where(board_winners == player_color, settings.WINNER_AWARD, 0)
+    scores -= np.where(board_winners == opposing_color, settings.WINNER_AWARD, 0)
+
+    return scores, board_winners
@@ -0,0 +1,204 @@
+from python_settings import settings
+from time import perf_counter
+import argparse
+import json
+import tracemalloc
+
+# Initialize settings.py as environment variable
+import os
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+from board import Board
+from bitboard import BitBoard
+from player_ai import PlayerAI
+from self_play import percentile
+
+# Fixed corpus of mid-game positions as move strings (columns starting at 1, RED moves first), so every run
+# measures the same work
+CORPUS = [
+    '52674443452514722',
+    '62524416624755',
+    '756153721',
+    '534235664251575572',
+    '2573372644577732647',
+    '6112525575615',
+    '213254761',
+    '67724777364123',
+    '574463666131745453',
+    '56147613535',
+    '315276411425411',
+    '13554372774',
+]
+
+def load_position(moves, board_class = BitBoard) -> tuple:
+    '''
+    Plays the move string on a new board_class object and returns the board and the color to move.
+    '''
+    board = board_class()
+    color = settings.RED
+
+    for move in moves:
+        board.move(int(move), color)
+        color = settings.YELLOW if color == settings.RED else settings.RED
+
+    return board, color
+
+def benchmark_player(color, search = settings.ALPHA_BETA_SEARCH, depth = settings.MAX_DEPTH) -> PlayerAI:
+    '''
+    Returns a new PlayerAI that searches to depth. The tactical check is turned off, since it finds the move of
+    most corpus positions without any search and the benchmark would then no longer measure the search.
+    '''
+    return PlayerAI(color, search=search, max_depth=depth, tactical_check=False)
+
+# ===== Benchmarks ===== #
+def benchmark_board(repeat) -> dict:
+    '''
+    Measures moves and winner checks per second on Board and BitBoard over the corpus.
+    '''
+    results = dict()
+
+    for name, board_class in (('board', Board), ('bitboard', BitBoard)):
+        positions = [load_position(moves, board_class) for moves in CORPUS]
+        operations = 0
+        start = perf_counter()
+
+        for _ in range(repeat):
+            for board, color in positions:
+                for player_move in board.all_moves():
+                    board.move(player_move, color)
+                    board.undo_move(player_move)
+                    operations += 1
+
+        results[f'{name}_move_undo_per_sec'] = operations / (perf_counter() - start)
+        operations = 0
+        start = perf_counter()
+
+        for _ in range(repeat):
+            for board, _ in positions:
+                board.winner()
+                operations += 1
+
+        results[f'{name}_winner_per_sec'] = operations / (perf_counter() - start)
+
+    return results
+
+def benchmark_evaluate(repeat) -> dict:
+    '''
+    Measures PlayerAI.evaluate() calls per second over the corpus.
+    '''
+    player = PlayerAI(settings.RED)
+    positions = [load_position(moves)[0] for moves in CORPUS]
+    start = perf_counter()
+
+    for _ in range(repeat):
+        for board in positions:
+            player.evaluate(board)
+
+    return {'evaluate_per_sec': repeat * len(positions) / (perf_counter() - start)}
+
+def benchmark_search(search, depth) -> dict:
+    '''
+    Searches every corpus position to depth with a new PlayerAI and returns the nodes per second, the latency
+    percentiles of the searches in milliseconds and the peak memory allocated by a search in kilobytes. Memory is
+    measured in a second pass since tracing allocations slows the search down.
+    '''
+    latencies = []
+    nodes = 0
+
+    for moves in CORPUS:
+        board, color = load_position(moves)
+        player = benchmark_player(color, search, depth)
+        start = perf_counter()
+        player.best_move(board)
+        latencies.append(perf_counter() - start)
+        nodes += player.node_count
+
+    peak_memory = 0
+
+    for moves in CORPUS:
+        board, color = load_position(moves)
+        player = benchmark_player(color, search, depth)
+        tracemalloc.start()
+        player.best_move(board)
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    latencies.sort()
+
+    return {
+        'nodes_per_sec': nodes / sum(latencies),
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'peak_memory_kb': peak_memory / 1024,
+    }
+
+def run_benchmarks(depths = (2, 4, 6), minimax_depths = (2, 4), repeat = 200) -> dict:
+    '''
+    Runs every benchmark and returns the results as a flat dict of metric name to value. Metrics ending in
+    _per_sec are better when higher, every other metric is better when lower.
+    '''
+    results = dict()
+    results.update(benchmark_board(repeat))
+    results.update(benchmark_evaluate(repeat * 10))
+
+    for search, name, search_depths in ((settings.ALPHA_BETA_SEARCH, 'alpha_beta', depths),
+                                        (settings.MINIMAX_SEARCH, 'minimax', minimax_depths)):
+        for depth in search_depths:
+            for metric, value in benchmark_search(search, depth).items():
+                results[f'{name}_depth_{depth}_{metric}'] = value
+
+    return results
+
+def compare(baseline, current, threshold = 0.10) -> list:
+    '''
+    Compares two benchmark runs and returns a list of (metric, baseline value, current value, relative change)
+    for every metric that got worse by more than threshold. Relative changes are positive when worse.
+    '''
+    regressions = []
+
+    for metric, baseline_value in baseline.items():
+        if metric not in current or baseline_value == 0:
+            continue
+
+        change = (current[metric] - baseline_value) / baseline_value
+
+        if metric.endswith('_per_sec'):
+            change = -change
+
+        if change > threshold:
+            regressions.append((metric, baseline_value, current[metric], change))
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the Connect Four board and AI search.')
+    parser.add_argument('--output', help='writes the results as JSON to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='compares two result files')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative change that counts as a regression')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as baseline_file, open(args.compare[1]) as current_file:
+            regressions = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+
+        for metric, baseline_value, current_value, change in regressions:
+            print(f'REGRESSION {metric}: {baseline_value:.2f} -> {current_value:.2f} ({change:+.1%} worse)')
+
+        if not regressions:
+            print('No regressions')
+
+        raise SystemExit(1 if regressions else 0)
+
+    results = run_benchmarks(repeat=args.repeat)
+
+    for metric, value in results.items():
+        print(f'{metric}: {value:.2f}')
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,489 @@
+from python_settings import settings
+from random import Random
+from geometry import evaluation_table, run_shifts
+
+# Zobrist keys per bitboard size, shared by every BitBoard of that size
+_zobrist_keys = dict()
+
+def zobrist_keys(size: int) -> list:
+    '''
+    Returns the Zobrist keys for bitboards with size bits, where zobrist_keys(size)[color][bit] is the random 64 bit
+    key of a piece of color on that bit. The keys are generated once from settings.ZOBRIST_SEED, so the same position
+    hashes to the same value in every process.
+    '''
+    if size not in _zobrist_keys:
+        random = Random(settings.ZOBRIST_SEED + size)
+        _zobrist_keys[size] = [[random.getrandbits(64) for _ in range(size)] for _ in range(3)]
+
+    return _zobrist_keys[size]
+
+# Mirror tables per number of columns and column height, shared by every BitBoard of that size
+_mirror_tables = dict()
+
+def mirror_tables(cols: int, column_height: int) -> tuple:
+    '''
+    Returns a tuple of (mirror_bits, mirror_keys) for bitboards of cols columns of column_height bits, where
+    mirror_bits[bit] is the bit at the same height in the column mirrored about the center column and
+    mirror_keys[color][bit] is the Zobrist key of the mirrored bit. The tables are built once per size.
+    '''
+    if (cols, column_height) not in _mirror_tables:
+        mirror_bits = [(cols - 1 - bit // column_height) * column_height + bit % column_height
+                       for bit in range(column_height * cols)]
+        mirror_keys = [[keys[mirror_bits[bit]] for bit in range(len(keys))] for keys in zobrist_keys(column_height * cols)]
+        _mirror_tables[cols, column_height] = (mirror_bits, mirror_keys)
+
+    return _mirror_tables[cols, column_height]
+
+def mirror_columns(bits: int, cols: int, column_height: int) -> int:
+    '''
+    Returns bits with the order of its cols groups of column_height bits reversed. This mirrors a piece bitboard or
+    a key about the center column since every column is stored in its own group of column_height bits.
+    '''
+    column_mask = (1 << column_height) - 1
+    mirrored = 0
+
+    for i in range(cols):
+        mirrored |= ((bits >> (i * column_height)) & column_mask) << ((cols - 1 - i) * column_height)
+
+    return mirrored
+
+class BitBoard:
+
+    def __init__(self):
+        '''
+        Initializes a bitboard object. This object exposes the same interface as Board but stores the
+        game state as one integer per piece color plus the next free bit of every column, so that moves
+        and winner checks are a handful of integer operations instead of scans over the whole grid.
+
+        Each column uses settings.ROWS + 1 bits, the extra bit on top of every column acts as a separator
+        so that shifting a bitboard never wraps a four in a row from one column into the next.
+        '''
+        # Settings are read once here since they are looked up on every move of a search
+        self.rows = settings.ROWS
+        self.cols = settings.COLS
+        self.connect = settings.CONNECT
+        self.colors = (settings.RED, settings.YELLOW)
+        self.empty = settings.EMPTY
+        self.column_height = self.rows + 1
+        # Shifts for the vertical, horizontal, diagonal right and diagonal left directions
+        self.directions = (1, self.column_height, self.column_height + 1, self.column_height - 1)
+        # self.run_shifts[direction]: the shifts that find settings.CONNECT in a row in that direction
+        self.run_shifts = run_shifts(self.column_height, self.connect)
+        # self.column_tops[i]: the bit index directly above the last playable row of column i
+        self.column_tops = [i * self.column_height + self.rows for i in range(self.cols)]
+        # self.zobrist_keys[color][bit]: the key xored into self.hash when a piece of color is placed on bit
+        self.zobrist_keys = zobrist_keys(self.column_height * self.cols)
+        # self.mirror_bits[bit]: the bit at the same height in the column mirrored about the center column,
+        # self.mirror_keys[color][bit]: the key xored into self.mirror_hash, the key of the mirrored bit
+        self.mirror_bits, self.mirror_keys = mirror_tables(self.cols, self.column_height)
+        # self.cell_scores[bit]: the evaluation table value of the slot on bit, 0 for the separator bits
+        self.cell_scores = [0] * (self.column_height * self.cols)
+        table = evaluation_table()
+
+        for i in range(self.rows):
+            for j in range(self.cols):
+                self.cell_scores[j * self.column_height + self.rows - 1 - i] = table[i][j]
+
+        self.initialize_new_board()
+
+    def move(self, player_move: int, player_color: int):
+        '''
+        Makes a move based off player_move and player_color. Error checking is done before this
+        function is called, so the column is guaranteed to be available. Only the bitboard of the player
+        that moved can contain a new four in a row, so it is the only one checked for a win.
+        '''
+        column = player_move - 1
+        self.pieces[player_color] |= 1 << self.heights[column]
+        self.hash ^= self.zobrist_keys[player_color][self.heights[column]]
+        self.mirror_hash ^= self.mirror_keys[player_color][self.heights[column]]
+        self.scores[player_color] += self.cell_scores[self.heights[column]]
+        self.heights[column] += 1
+        self.moves_played += 1
+        self.move_stack.append(player_move)
+
+        if self.heights[column] == self.column_tops[column]:
+            self.open_columns ^= 1 << column
+
+        if self.winning_color is None and self.connected(self.pieces[player_color]):
+            self.winning_color = player_color
+            self.winning_ply = self.moves_played
+
+    def undo_move(self, player_move: int):
+        '''
+        Takes back the last move, which has to be the move made in the player_move column. If that move made the
+        four in a row, winning_color is reset. Nothing is allocated, so a search can make and unmake moves on a
+        single bitboard instead of copying it for every child.
+        '''
+        column = self.move_stack.pop() - 1
+
+        if self.heights[column] == self.column_tops[column]:
+            self.open_columns ^= 1 << column
+
+        self.heights[column] -= 1
+        bit = 1 << self.heights[column]
+        color = self.colors[0] if self.pieces[self.colors[0]] & bit else self.colors[1]
+        self.pieces[color] ^= bit
+        self.hash ^= self.zobrist_keys[color][self.heights[column]]
+        self.mirror_hash ^= self.mirror_keys[color][self.heights[column]]
+        self.scores[color] -= self.cell_scores[self.heights[column]]
+
+        if self.winning_ply == self.moves_played:
+            self.winning_color = None
+            self.winning_ply = None
+
+        self.moves_played -= 1
+
+    def all_moves(self) -> list:
+        '''
+        Gets all of the moves that are possible on the current board. Meaning an index of each column that is not
+        full and can receieve a piece.
+
+        Returns a list of these indexes starting at 1
+        '''
+        return [i + 1 for i in range(self.cols) if self.heights[i] != self.column_tops[i]]
+
+    # ===== Move Validation Checking ===== #
+    def valid_move(self, player_move) -> bool:
+        '''
+        Returns a bool:
+            True if the player_move is a valid move that can be made. The requirements for validity
+            is to be a column integer that ranges from [1-COLS] and the column has to be available,
+            meaning the column can not be full. False otherwise.
+        '''
+        return bool(player_move) and player_move.isnumeric() and self.valid_column(int(player_move))
+
+    def valid_column(self, column: int) -> bool:
+        '''
+        Returns a bool:
+            True if the column int ranges from [1-COLS] and the column is not full. False otherwise.
+        '''
+        return 0 < column <= self.cols and self.heights[column - 1] != self.column_tops[column - 1]
+
+    def in_bounds(self, player_move) -> bool:
+        '''
+        Returns a bool:
+            True if the player_move integer is within the range of [1-COLS], meaning it is a valid
+            column argument. False otherwise.
+        '''
+        return player_move > 0 and player_move <= self.cols
+
+    def column_available(self, column: int) -> int:
+        '''
+        Returns an int representing either a valid row that the player_move can be made in or INVALID_COLUMN
+        to represent that the move can not be made in this column. Rows follow the Board convention where
+        row 0 is the top of the board.
+        '''
+        if self.heights[column - 1] == self.column_tops[column - 1]:
+            return settings.INVALID_COLUMN
+
+        return self.column_tops[column - 1] - self.heights[column - 1] - 1
+
+    # ===== Winner/Tie Checks ===== #
+    def winner(self) -> bool:
+        '''
+        Returns a bool:
+            True if a four in a row was made by any of the moves on the board. The check is done once per
+            move in self.move(), so this is a constant time lookup.
+        '''
+        return self.winning_color is not None
+
+    def tie(self) -> bool:
+        '''
+        Returns a bool:
+            True if every slot on the board is full, meaning there are no more available columns for moves.
+            False otherwise.
+        '''
+        return self.moves_played == self.rows * self.cols
+
+    def gameover(self) -> bool:
+        '''
+        Returns a bool:
+            True if there is a winner or tie on the board.
+            False otherwise.
+        '''
+        return self.winning_color is not None or self.moves_played == self.rows * self.cols
+
+    def get_winner(self) -> int:
+        '''
+        Returns the winning color of the board or None. Used to check if winner is found when looking for
+        best move for AI.
+        '''
+        return self.winning_color
+
+    def get_score(self, player_color: int) -> int:
+        '''
+        Returns the sum of the evaluation table over every slot holding a piece of player_color, which is the
+        positional part of the AI's evaluation. The sum is kept up to date by move() and undo_move().
+        '''
+        return self.scores[player_color]
+
+    def child_scores(self, player_color: int) -> list:
+        '''
+        Returns a list with an entry for every move of all_moves(), in the same order: the score get_score() would
+        return for player_color after that move, or None if the move ends the game. The moves are never made, so the
+        children of a position can all be scored in one pass.
+        '''
+        scores = []
+        pieces = self.pieces[player_color]
+        last_move = self.moves_played + 1 == self.rows * self.cols
+
+        for i in range(self.cols):
+            height = self.heights[i]
+
+            if height == self.column_tops[i]:
+                continue
+
+            if last_move or self.connected(pieces | (1 << height)):
+                scores.append(None)
+            else:
+                scores.append(self.scores[player_color] + self.cell_scores[height])
+
+        return scores
+
+    # ===== Four in a Row Checks ===== #
+    def connected(self, pieces: int) -> bool:
+        '''
+        Returns a bool:
+            True if the pieces bitboard contains settings.CONNECT in a row in any direction. Each direction is
+            checked by shifting the bitboard onto itself, for four in a row first to find pairs and then to find
+            pairs of pairs. Other lengths use the shifts of self.run_shifts.
+            False otherwise.
+        '''
+        if self.connect == 4:
+            for shift in self.directions:
+                pairs = pieces & (pieces >> shift)
+
+                if pairs & (pairs >> (2 * shift)):
+                    return True
+
+            return False
+
+        for shifts in self.run_shifts:
+            runs = pieces
+
+            for shift in shifts:
+                runs &= runs >> shift
+
+            if runs:
+                return True
+
+        return False
+
+    # ===== Display Methods ===== #
+    def display(self) -> None:
+        '''
+        Prints the current board and displays to the user.
+        '''
+        print(self)
+
+    # ===== Initialization Methods ===== #
+    def initialize_new_board(self) -> list:
+        '''
+        Initializes a new empty bitboard. This function is called at initialization and when the
+        player wishes to play again.
+
+        Returns the list of piece bitboards indexed by piece color.
+        '''
+        # self.pieces[color]: bitboard of every piece owned by color, index settings.EMPTY is unused
+        self.pieces = [0, 0, 0]
+        # self.heights[i]: the bit index of the next free slot in column i
+        self.heights = [i * self.column_height for i in range(self.cols)]
+        # self.open_columns: bitmask with bit i set while column i + 1 is not full
+        self.open_columns = (1 << self.cols) - 1
+        # self.hash: Zobrist hash of the position, the xor of the keys of every piece on the board
+        self.hash = 0
+        # self.mirror_hash: the hash the position mirrored about the center column would have
+        self.mirror_hash = 0
+        # self.scores[color]: the sum of self.cell_scores over every piece owned by color
+        self.scores = [0, 0, 0]
+        self.moves_played = 0
+        self.winning_color = None
+        # self.winning_ply: the value of moves_played right after the move that made the four in a row
+        self.winning_ply = None
+        # self.move_stack: the column of every move made on the board, used to take moves back
+        self.move_stack = []
+
+        return self.pieces
+
+    @classmethod
+    def from_board(cls, board) -> 'BitBoard':
+        '''
+        Creates a BitBoard holding the same position as board. The board argument only needs to support
+        indexing by (row, column) coords, so both Board and BitBoard objects can be converted.
+        '''
+        bitboard = cls()
+
+        for j in range(settings.COLS):
+            for i in range(settings.ROWS - 1, -1, -1):
+                if board[i, j] == settings.EMPTY:
+                    break
+
+                bitboard._place_piece(j, board[i, j])
+
+        bitboard._find_winner()
+
+        return bitboard
+
+    # ===== Encoding Methods ===== #
+    def to_key(self) -> int:
+        '''
+        Returns the position as a single integer that fits in (ROWS + 1) * COLS bits (49 bits for a 6x7 board, so
+        boards up to 7x8 fit in 64 bits).
+        Every column holds the RED pieces as set bits with a marker bit directly above its top piece, which is what
+        adding the bottom row to the mask of all pieces produces. Equal positions always have equal keys.
+        '''
+        mask = self.pieces[self.colors[0]] | self.pieces[self.colors[1]]
+        bottom_mask = sum(1 << (i * self.column_height) for i in range(self.cols))
+
+        return self.pieces[self.colors[0]] + mask + bottom_mask
+
+    def canonical_key(self) -> int:
+        '''
+        Returns the lower of to_key() and the key of the mirrored position, so that a position and its mirror image
+        share one key.
+        '''
+        return min(self.to_key(), self.mirror(self.to_key()))
+
+    def canonical_hash(self) -> tuple:
+        '''
+        Returns a tuple of (hash, mirrored), where hash is the lower of self.hash and self.mirror_hash and mirrored is
+        True if it is the hash of the mirrored position. Moves stored under the hash have to be mapped through
+        mirror_move() when mirrored is True.
+        '''
+        if self.mirror_hash < self.hash:
+            return self.mirror_hash, True
+
+        return self.hash, False
+
+    def mirror(self, bits: int) -> int:
+        '''
+        Returns bits with the order of the columns reversed, see mirror_columns().
+        '''
+        return mirror_columns(bits, self.cols, self.column_height)
+
+    def mirror_move(self, player_move: int) -> int:
+        '''
+        Returns the column (starting at 1) that player_move is mirrored to about the center column.
+        '''
+        return self.cols + 1 - player_move
+
+    @classmethod
+    def from_key(cls, key: int) -> 'BitBoard':
+        '''
+        Creates a BitBoard holding the position encoded by to_key(). The order the moves were made in is not part of
+        the key, so the move stack of the new board holds the pieces column by column.
+        '''
+        bitboard = cls()
+        column_mask = (1 << bitboard.column_height) - 1
+
+        for j in range(bitboard.cols):
+            column = (key >> (j * bitboard.column_height)) & column_mask
+
+            for height in range(column.bit_length() - 1):
+                bitboard._place_piece(j, bitboard.colors[0] if column >> height & 1 else bitboard.colors[1])
+
+        bitboard._find_winner()
+
+        return bitboard
+
+    def to_move_string(self) -> str:
+        '''
+        Returns the moves made on the board as a string of column digits starting at 1, e.g: '4453'.
+        '''
+        return ''.join(str(player_move) for player_move in self.move_stack)
+
+    @classmethod
+    def from_move_string(cls, moves: str, first_color: int = None) -> 'BitBoard':
+        '''
+        Creates a BitBoard by playing the string of column digits in order, alternating colors starting with
+        first_color (settings.RED if not given).
+        '''
+        bitboard = cls()
+        color = first_color if first_color is not None else settings.RED
+
+        for player_move in moves:
+            bitboard.move(int(player_move), color)
+            color = bitboard.colors[1] if color == bitboard.colors[0] else bitboard.colors[0]
+
+        return bitboard
+
+    def _place_piece(self, column: int, player_color: int) -> None:
+        '''
+        Places a piece of player_color on top of column (starting at 0) without checking for a winner, used to build
+        a position that was not reached by calling move().
+        '''
+        self.pieces[player_color] |= 1 << self.heights[column]
+        self.hash ^= self.zobrist_keys[player_color][self.heights[column]]
+        self.mirror_hash ^= self.mirror_keys[player_color][self.heights[column]]
+        self.scores[player_color] += self.cell_scores[self.heights[column]]
+        self.heights[column] += 1
+        self.moves_played += 1
+        self.move_stack.append(column + 1)
+
+        if self.heights[column] == self.column_tops[column]:
+            self.open_columns ^= 1 << column
+
+    def _find_winner(self) -> None:
+        '''
+        Sets winning_color if any color has four in a row, used after building a position with _place_piece().
+        '''
+        for color in self.colors:
+            if self.connected(self.pieces[color]):
+                self.winning_color = color
+                self.winning_ply = self.moves_played
+                break
+
+    # ===== Override Methods ===== #
+    def __deepcopy__(self, memo: dict) -> 'BitBoard':
+        '''
+        Overrides the __deepcopy__ method so that copies only duplicate the game state. The settings and
+        masks cached in __init__ are never modified, so they are shared between copies.
+        '''
+        bitboard = self.__class__.__new__(self.__class__)
+        bitboard.__dict__.update(self.__dict__)
+        bitboard.pieces = self.pieces.copy()
+        bitboard.heights = self.heights.copy()
+        bitboard.scores = self.scores.copy()
+        bitboard.move_stack = self.move_stack.copy()
+
+        return bitboard
+
+    def __getitem__(self, coords: tuple) -> int:
+        '''
+        Overrides the __getitem__ method so that the bitboard can be indexed with the same (row, column)
+        coords as Board, where row 0 is the top of the board.
+        '''
+        x, y = coords
+        bit = 1 << (y * self.column_height + self.rows - 1 - x)
+
+        for color in self.colors:
+            if self.pieces[color] & bit:
+                return color
+
+        return self.empty
+
+    def __repr__(self) -> str:
+        '''
+        Override the __repr__ method so that we are able to print a displayable board
+        for the user.
+        '''
+        board_str = ""
+
+        for i in range(settings.ROWS):
+            row_str = "|"
+
+            for j in range(settings.COLS):
+                if self[i, j] == settings.RED:
+                    row_str += 'R'
+                elif self[i, j] == settings.YELLOW:
+                    row_str += 'Y'
+                else:
+                    row_str += ' '
+
+                row_str += '|'
+
+            board_str += f'{row_str}\n'
+
+        board_str += '-' * (2 * self.cols + 1)
+
+        return board_str
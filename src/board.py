@@ -1,4 +1,20 @@
 from python_settings import settings
+from bitboard import BitBoard
+from geometry import evaluation_table
+
+class BoardRow(list):
+    '''
+    A row of Board.board. Every slot written, by Board.move() or directly, is reported to the board so the column
+    heights it keeps always follow the grid.
+    '''
+    def __init__(self, board, row, slots):
+        super().__init__(slots)
+        self.board = board
+        self.row = row
+
+    def __setitem__(self, column, color):
+        super().__setitem__(column, color)
+        self.board.slot_changed(self.row, column)
 
 class Board:
 
@@ -9,7 +25,6 @@ class Board:
         (e.g: players, current_turn, etc).
         '''
         self.board = self.initialize_new_board()
-        self.winning_color = None
 
     def move(self, player_move: int, player_color: int):
         '''
@@ -17,8 +32,19 @@ class Board:
         function is called, so row is guaranteed to be available and the board[row][player_move - 1] is updated
         to reflect the move.
         '''
-        row = self.column_available(player_move)
+        row = settings.ROWS - 1 - self.heights[player_move - 1]
         self.board[row][player_move - 1] = player_color
+        self.move_stack.append((player_move, self.winning_color))
+
+    def undo_move(self, player_move: int):
+        '''
+        Takes back the last move, which has to be the move made in the player_move column. The top piece of the
+        column is removed and winning_color is restored to the value it had before that move was made, so a
+        search can make and unmake moves on a single board instead of copying it.
+        '''
+        column, self.winning_color = self.move_stack.pop()
+        row = settings.ROWS - self.heights[column - 1]
+        self.board[row][column - 1] = settings.EMPTY
 
     def all_moves(self) -> list:
         '''
@@ -40,16 +66,24 @@ class Board:
         '''
         Returns a bool:
             True if the player_move is a valid move that can be made. The requirements for validity
-            is to be a column integer that ranges from [1-7] and the column has to be available,
+            is to be a column integer that ranges from [1-COLS] and the column has to be available,
             meaning the column can not be full. False otherwise.
         '''
-        return player_move and player_move.isnumeric() and \
-            self.in_bounds(int(player_move)) and self.column_available(int(player_move)) != settings.INVALID_COLUMN
+        return bool(player_move) and player_move.isnumeric() and self.valid_column(int(player_move))
+
+    def valid_column(self, column: int) -> bool:
+        '''
+        Returns a bool:
+            True if the column int ranges from [1-COLS] and the column is not full, which only takes a lookup of
+            its height. This is the check for moves that are already ints, valid_move() parses strings first.
+            False otherwise.
+        '''
+        return 0 < column <= settings.COLS and self.heights[column - 1] < settings.ROWS
 
     def in_bounds(self, player_move) -> bool:
         '''
         Returns a bool:
-            True if the player_move integer is within the range of [1-7], meaning it is a valid
+            True if the player_move integer is within the range of [1-COLS], meaning it is a valid
             column argument. False otherwise.
         '''
         return player_move > 0 and player_move <= settings.COLS
@@ -57,13 +91,37 @@ class Board:
     def column_available(self, column: int) -> int:
         '''
         Returns an int representing either a valid row that the player_move can be made in or INVALID_COLUMN
-        to represent that the move can not be made in this column.
+        to represent that the move can not be made in this column. The row is the lowest empty slot of the
+        column, which self.heights holds.
         '''
-        for i in range(1, settings.ROWS + 1):
-            if self.board[settings.ROWS - i][column - 1] == settings.EMPTY:
-                return settings.ROWS - i
-        
-        return settings.INVALID_COLUMN
+        if self.heights[column - 1] == settings.ROWS:
+            return settings.INVALID_COLUMN
+
+        return settings.ROWS - 1 - self.heights[column - 1]
+
+    def slot_changed(self, row: int, column: int) -> None:
+        '''
+        Updates the height of the column (starting at 0) after the slot [row][column] was written. The height is
+        the number of pieces stacked from the bottom of the column without an empty slot between them, so only a
+        write at or just above the top of the stack changes it. A write to the top row also updates open_columns.
+        '''
+        if row == 0:
+            if self.board[0][column] == settings.EMPTY:
+                self.open_columns |= 1 << column
+            else:
+                self.open_columns &= ~(1 << column)
+
+        height = self.heights[column]
+
+        if self.board[row][column] == settings.EMPTY:
+            if row >= settings.ROWS - height:
+                self.heights[column] = settings.ROWS - 1 - row
+        elif row == settings.ROWS - 1 - height:
+            # Pieces written above an empty slot join the stack once the slot is filled
+            while height < settings.ROWS and self.board[settings.ROWS - 1 - height][column] != settings.EMPTY:
+                height += 1
+
+            self.heights[column] = height
 
     # ===== Winner/Tie Checks ===== #
     def winner(self) -> bool:
@@ -106,17 +164,32 @@ class Board:
         '''
         return self.winning_color
 
+    def get_score(self, player_color: int) -> int:
+        '''
+        Returns the sum of the evaluation table over every slot holding a piece of player_color, which is the
+        positional part of the AI's evaluation. Pieces can be placed directly on self.board, so the sum is
+        recomputed from the whole board on every call.
+        '''
+        table = evaluation_table()
+        score = 0
+
+        for i in range(settings.ROWS):
+            for j in range(settings.COLS):
+                if self.board[i][j] == player_color:
+                    score += table[i][j]
+
+        return score
+
     # ===== Four in a Row Checks ===== #
     def check_vertical(self) -> bool:
         '''
         Returns a bool:
-            True if there is four in a row -- in a vertical line in the board that is not an empty slot but a piece color.
+            True if there is settings.CONNECT (four) in a row -- in a vertical line in the board that is not an empty slot but a piece color.
             False otherwise.
         '''
-        for i in range(settings.ROWS - 3):
+        for i in range(settings.ROWS - settings.CONNECT + 1):
             for j in range(settings.COLS):
-                if self.board[i][j] != settings.EMPTY and self.board[i][j] == self.board[i + 1][j] == self.board[i + 2][j] == self.board[i + 3][j]:
-                    self.winning_color = self.board[i][j]
+                if self._check_line(i, j, 1, 0):
                     return True
 
         return False
@@ -124,13 +197,12 @@ class Board:
     def check_horizontal(self) -> bool:
         '''
         Returns a bool:
-            True if there is four in a row -- in a horizontal line in the board that is not an empty slot but a piece color.
+            True if there is settings.CONNECT (four) in a row -- in a horizontal line in the board that is not an empty slot but a piece color.
             False otherwise.
         '''
         for i in range(settings.ROWS):
-            for j in range(settings.COLS - 3):
-                if self.board[i][j] != settings.EMPTY and self.board[i][j] == self.board[i][j + 1] == self.board[i][j + 2] == self.board[i][j + 3]:
-                    self.winning_color = self.board[i][j]
+            for j in range(settings.COLS - settings.CONNECT + 1):
+                if self._check_line(i, j, 0, 1):
                     return True
         
         return False
@@ -138,13 +210,12 @@ class Board:
     def check_diagonal_right(self) -> bool:
         '''
         Returns a bool:
-            True if there is four in a row -- in a diagonal right line towards the bottom right of the board; that is not an empty slot but a piece color.
+            True if there is settings.CONNECT (four) in a row -- in a diagonal right line towards the bottom right of the board; that is not an empty slot but a piece color.
             False otherwise.
         '''
-        for i in range(settings.ROWS - 3):
-            for j in range(settings.COLS - 3):
-                if self.board[i][j] != settings.EMPTY and self.board[i][j] == self.board[i + 1][j + 1] == self.board[i + 2][j + 2] == self.board[i + 3][j + 3]:
-                    self.winning_color = self.board[i][j]
+        for i in range(settings.ROWS - settings.CONNECT + 1):
+            for j in range(settings.COLS - settings.CONNECT + 1):
+                if self._check_line(i, j, 1, 1):
                     return True
 
         return False
@@ -152,17 +223,58 @@ class Board:
     def check_diagonal_left(self) -> bool:
         '''
         Returns a bool:
-            True if there is four in a row -- in a diagonal left line towards the bottom left of the board; that is not an empty slot but a piece color.
+            True if there is settings.CONNECT (four) in a row -- in a diagonal left line towards the bottom left of the board; that is not an empty slot but a piece color.
             False otherwise.
         '''
-        for i in range(3, settings.ROWS):
-            for j in range(settings.COLS - 3):
-                if self.board[i][j] != settings.EMPTY and self.board[i][j] == self.board[i - 1][j + 1] == self.board[i - 2][j + 2] == self.board[i - 3][j + 3]:
-                    self.winning_color = self.board[i][j]
+        for i in range(settings.CONNECT - 1, settings.ROWS):
+            for j in range(settings.COLS - settings.CONNECT + 1):
+                if self._check_line(i, j, -1, 1):
                     return True
         
         return False
 
+    def _check_line(self, i: int, j: int, row_step: int, column_step: int) -> bool:
+        '''
+        Returns a bool:
+            True if the slot [i][j] holds a piece color and the next settings.CONNECT - 1 slots in the direction of
+            (row_step, column_step) hold the same color, in which case winning_color is set to it.
+            False otherwise.
+        '''
+        color = self.board[i][j]
+
+        if color == settings.EMPTY:
+            return False
+
+        for k in range(1, settings.CONNECT):
+            if self.board[i + k * row_step][j + k * column_step] != color:
+                return False
+
+        self.winning_color = color
+        return True
+
+    # ===== Encoding Methods ===== #
+    def to_key(self) -> int:
+        '''
+        Returns the position as a single integer, see BitBoard.to_key().
+        '''
+        return BitBoard.from_board(self).to_key()
+
+    @classmethod
+    def from_key(cls, key: int) -> 'Board':
+        '''
+        Creates a Board holding the position encoded by to_key().
+        '''
+        board = cls()
+        bitboard = BitBoard.from_key(key)
+
+        for i in range(settings.ROWS):
+            for j in range(settings.COLS):
+                board.board[i][j] = bitboard[i, j]
+
+        board.move_stack = [(player_move, None) for player_move in bitboard.move_stack]
+
+        return board
+
     # ===== Display Methods ===== #
     def display(self) -> None:
         '''
@@ -176,6 +288,11 @@ class Board:
         Initializes a new board and assigns to self.board. This function is called at initialization
         and when the player wishes to play again.
         '''
+        # self.heights[i]: the number of pieces stacked from the bottom of column i + 1, and self.open_columns: bitmask
+        # with bit i set while the top slot of column i + 1 is empty. Both are kept up to date by slot_changed() on
+        # every write to self.board, including pieces placed directly on it
+        self.heights = [0] * settings.COLS
+        self.open_columns = (1 << settings.COLS) - 1
         new_board = []
 
         for i in range(settings.ROWS):
@@ -184,10 +301,12 @@ class Board:
             for j in range(settings.COLS):
                 new_row.append(settings.EMPTY)
 
-            new_board.append(new_row)
+            new_board.append(BoardRow(self, i, new_row))
         
         self.board = new_board
         self.winning_color = None
+        # self.move_stack: (player_move, winning_color before the move) for every move made on the board
+        self.move_stack = []
 
         return self.board
 
@@ -222,6 +341,6 @@ class Board:
 
             board_str += f'{row_str}\n'
 
-        board_str += '---------------'
+        board_str += '-' * (2 * settings.COLS + 1)
 
         return board_str
\ No newline at end of file
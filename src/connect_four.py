@@ -3,14 +3,22 @@ from random import randint
 from board import Board
 from player import Player
 from player_ai import PlayerAI
+from game_events import ConsoleObserver
 
 class ConnectFour:
 
-    def __init__(self, player1, player2):
+    def __init__(self, player1, player2, observer = None, ai_options = None):
         '''
         Initializes a ConnectFour game object. This object contains both players, the board, and all of the
         game attributes associated to the game state. The game is ran through this object.
+
+        Every event of the game is reported to observer, a GameObserver that defaults to a ConsoleObserver which
+        prints the game to the console. ai_options are keyword arguments for the PlayerAI objects
+        (e.g: {'difficulty': settings.HARD}).
         '''
+        self.observer = observer if observer is not None else ConsoleObserver()
+        self.ai_options = ai_options if ai_options is not None else dict()
+
         # Connect Four Objects #
         self.board = Board()
         self.player1 = self.create_player(player1, settings.RED)
@@ -26,13 +34,13 @@ class ConnectFour:
         '''
         Runs the entirity of the Connect Four game in this method.
         '''
-        print("Connect Four Started")
+        self.observer.game_started()
         
         while not self.gameover:
-            self.board.display()
+            self.observer.board_changed(self.board)
             self.progress_turn()
 
-        self.board.display()
+        self.observer.board_changed(self.board)
 
     def progress_turn(self) -> None:
         '''
@@ -41,6 +49,39 @@ class ConnectFour:
         that there is still no winner OR tie, then the next_turn is called and displayed.
         '''
         self.handle_move()
+        self.end_turn()
+
+    def submit_move(self, player_move: str) -> bool:
+        '''
+        Makes player_move for the current_turn_player and ends the turn, for callers that receive moves from
+        somewhere other than Player.get_move() (e.g: a client of the game server).
+
+        Returns a bool:
+            True if the move was made. False if the game is over or the move is not valid, nothing is changed then.
+        '''
+        if not self.board.valid_move(player_move):
+            return False
+
+        return self.submit_column(int(player_move))
+
+    def submit_column(self, column: int) -> bool:
+        '''
+        Same as submit_move() for a move that is already a column int.
+        '''
+        if self.gameover or not self.board.valid_column(column):
+            return False
+
+        self.board.move(column, self.current_turn_player.get_color())
+        self.observer.move_made(self.current_turn_player, column)
+        self.end_turn()
+
+        return True
+
+    def end_turn(self) -> None:
+        '''
+        Checks for a winner OR tie after the current_turn_player moved, and passes the turn to the other player
+        if the game is not over.
+        '''
         self.check_for_gameover()
 
         if not self.gameover:
@@ -52,13 +93,16 @@ class ConnectFour:
         Handles the move aspect of each turn. Takes input from user and validates it
         until it is a proper move that can be made on the board. Once the move is
         validated, the move is made on the board to reflect the move changes.
+        Moves are column ints from Player.get_column(), so only human input is parsed
+        and a move is validated with a single lookup of its column height.
         '''
-        player_move = None
+        player_move = self.current_turn_player.get_column(board=self.board)
 
-        while not self.board.valid_move(player_move):
-            player_move = self.current_turn_player.get_move(board=self.board)
+        while not self.board.valid_column(player_move):
+            player_move = self.current_turn_player.get_column(board=self.board)
         
-        self.board.move(int(player_move), self.current_turn_player.get_color())
+        self.board.move(player_move, self.current_turn_player.get_color())
+        self.observer.move_made(self.current_turn_player, player_move)
     
     def next_turn(self) -> None:
         '''
@@ -96,10 +140,7 @@ class ConnectFour:
         Displays the next turn, this function is called after the current_turn_player is changed
         hence displaying the next player's turn.
         '''
-        if self.current_turn_player.get_color() == settings.RED:
-            print("Player1 (RED)'s Turn to Move")
-        else:
-            print("Player2 (YELLOW)'s Turn to Move")
+        self.observer.turn_changed(self.current_turn_player)
 
     def display_game_results(self) -> None:
         '''
@@ -119,11 +160,7 @@ class ConnectFour:
         '''
         self.last_winner = self.current_turn_player
         self.current_turn_player.add_win()
-
-        if self.current_turn_player.get_color() == settings.RED:
-            print("Player1 (RED) Wins!")
-        else:
-            print("Player2 (YELLOW) Wins!")
+        self.observer.game_over(self.current_turn_player)
 
     def _handle_and_display_tie(self) -> None:
         '''
@@ -131,31 +168,29 @@ class ConnectFour:
         announced that the game ended in a Tie.
         '''
         self.last_winner = None
-        print("Tie!")
+        self.observer.game_over(None)
 
     def display_overall_results(self) -> None:
         ''' 
         Displays all of the current wins for both players. This function is called
         after a game has been completed.
         '''
-        print('-' * 30)
-        print("Current Wins: ")
-        player1_ai = ""
-        player2_ai = ""
-        print(f"Player1 ({self.player1.get_player_str()}): {self.player1.get_wins()} --- Player2 ({self.player2.get_player_str()}): {self.player2.get_wins()}")
-        print('-' * 30)
+        self.observer.results_updated(self.player1, self.player2)
 
 
     # ===== Initialization Methods ===== #
     def create_player(self, player, piece_color) -> Player or PlayerAI:
         '''
         Creates a Player object that will be playing Connect Four. The Player object will 
-        either be a human player of type 'Player' or an AI of type 'PlayerAI.'
+        either be a human player of type 'Player' or an AI of type 'PlayerAI.' A REMOTE_AI_PLAYER is a 'Player'
+        that never reads a move, its moves are searched elsewhere and made with submit_column().
         '''
         if player == settings.HUMAN_PLAYER:
             return Player(piece_color)
+        elif player == settings.REMOTE_AI_PLAYER:
+            return Player(piece_color, settings.AI_STR, read_move=None)
         else:
-            return PlayerAI(piece_color)
+            return PlayerAI(piece_color, **self.ai_options)
 
     def decide_first_move(self) -> Player:
         '''
@@ -164,12 +199,10 @@ class ConnectFour:
         '''
         randomize_turn = randint(settings.RED, settings.YELLOW)
         
-        if randomize_turn == settings.RED:
-            print("Player1 -- (RED) is first!")
-            return self.player1
-        else:
-            print("Player2 -- (YELLOW) is first!")
-            return self.player2
+        first_player = self.player1 if randomize_turn == settings.RED else self.player2
+        self.observer.first_player_chosen(first_player)
+
+        return first_player
         
     def restart(self) -> None:
         '''
@@ -0,0 +1,102 @@
+from python_settings import settings
+
+class GameObserver:
+
+    def __init__(self):
+        '''
+        Initializes a game observer object. ConnectFour reports everything that happens in a game to its observer
+        instead of printing it, so the game can run headless or be embedded. Every event does nothing here,
+        subclasses override the events they are interested in.
+        '''
+        pass
+
+    def game_started(self) -> None:
+        '''
+        Called when ConnectFour.play() starts a game.
+        '''
+        pass
+
+    def first_player_chosen(self, player) -> None:
+        '''
+        Called when the player that makes the first move of a game has been chosen.
+        '''
+        pass
+
+    def board_changed(self, board) -> None:
+        '''
+        Called by ConnectFour.play() before every turn and once the game is over, with the current board.
+        '''
+        pass
+
+    def move_made(self, player, player_move: int) -> None:
+        '''
+        Called after player made their move in the player_move column (starting at 1).
+        '''
+        pass
+
+    def turn_changed(self, player) -> None:
+        '''
+        Called when the turn passes to player.
+        '''
+        pass
+
+    def game_over(self, winner) -> None:
+        '''
+        Called once a game is over with the player that won, or None if the game ended in a tie.
+        '''
+        pass
+
+    def results_updated(self, player1, player2) -> None:
+        '''
+        Called with both players after the results of a game have been counted.
+        '''
+        pass
+
+class NullObserver(GameObserver):
+    '''
+    Observer that ignores every event, for games that are run without any output.
+    '''
+    pass
+
+class ConsoleObserver(GameObserver):
+
+    def __init__(self, output = print):
+        '''
+        Initializes a console observer object, which reports the game with the same messages the console game has
+        always shown. Every message, including the board rendered as a string, is passed to output, which prints
+        it by default.
+        '''
+        super().__init__()
+        self.output = output
+
+    def game_started(self) -> None:
+        self.output("Connect Four Started")
+
+    def first_player_chosen(self, player) -> None:
+        if player.get_color() == settings.RED:
+            self.output("Player1 -- (RED) is first!")
+        else:
+            self.output("Player2 -- (YELLOW) is first!")
+
+    def board_changed(self, board) -> None:
+        self.output(str(board))
+
+    def turn_changed(self, player) -> None:
+        if player.get_color() == settings.RED:
+            self.output("Player1 (RED)'s Turn to Move")
+        else:
+            self.output("Player2 (YELLOW)'s Turn to Move")
+
+    def game_over(self, winner) -> None:
+        if winner is None:
+            self.output("Tie!")
+        elif winner.get_color() == settings.RED:
+            self.output("Player1 (RED) Wins!")
+        else:
+            self.output("Player2 (YELLOW) Wins!")
+
+    def results_updated(self, player1, player2) -> None:
+        self.output('-' * 30)
+        self.output("Current Wins: ")
+        self.output(f"Player1 ({player1.get_player_str()}): {player1.get_wins()} --- Player2 ({player2.get_player_str()}): {player2.get_wins()}")
+        self.output('-' * 30)
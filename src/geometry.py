@@ -0,0 +1,137 @@
+from python_settings import settings
+
+# Initialize settings.py as environment variable
+import os
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+# Tables per (rows, cols, connect), computed the first time a board of that size is used
+_evaluation_tables = dict()
+_winning_lines = dict()
+
+def board_size() -> tuple:
+    '''
+    Returns the (rows, cols, connect) of the configured board, which every function below defaults to.
+    '''
+    return settings.ROWS, settings.COLS, settings.CONNECT
+
+def line_cells(rows: int, cols: int, connect: int) -> list:
+    '''
+    Returns the (row, column) cells of every connect in a row that fits on a rows x cols board, with row 0 at the
+    bottom. The lines are listed vertical first, then horizontal, diagonal right and diagonal left.
+    '''
+    lines = []
+
+    for row_step, column_step in ((1, 0), (0, 1), (1, 1), (-1, 1)):
+        for row in range(rows):
+            for column in range(cols):
+                cells = [(row + k * row_step, column + k * column_step) for k in range(connect)]
+
+                if all(0 <= i < rows and 0 <= j < cols for i, j in cells):
+                    lines.append(cells)
+
+    return lines
+
+def evaluation_table(rows = None, cols = None, connect = None) -> list:
+    '''
+    Returns the evaluation table of the board, where evaluation_table()[i][j] is the number of connect in a rows that
+    include the space [i][j] with row 0 at the top like Board. For the standard 6x7 board this is the table the AI
+    has always used, from 3 in the corners up to 13 in the middle of the center column.
+    '''
+    size = (rows, cols, connect) if rows is not None else board_size()
+
+    if size not in _evaluation_tables:
+        rows, cols, connect = size
+        table = [[0] * cols for _ in range(rows)]
+
+        for cells in line_cells(rows, cols, connect):
+            for i, j in cells:
+                table[rows - 1 - i][j] += 1
+
+        _evaluation_tables[size] = table
+
+    return _evaluation_tables[size]
+
+def utility_value(rows = None, cols = None, connect = None) -> int:
+    '''
+    Returns half the sum of the evaluation table (138 for the standard board), which PlayerAI adds to every evaluation.
+    '''
+    return sum(map(sum, evaluation_table(rows, cols, connect))) // 2
+
+def winning_lines(rows = None, cols = None, connect = None) -> tuple:
+    '''
+    Returns a tuple of (lines, cell_lines) using BitBoard bit indexes. lines holds the bits of every connect in a row
+    that fits on the board (69 for the standard board) and cell_lines[bit] holds the index of every line through that
+    bit.
+    '''
+    size = (rows, cols, connect) if rows is not None else board_size()
+
+    if size not in _winning_lines:
+        rows, cols, connect = size
+        column_height = rows + 1
+        lines = [tuple(j * column_height + i for i, j in cells) for cells in line_cells(rows, cols, connect)]
+        cell_lines = [[] for _ in range(column_height * cols)]
+
+        for index, line in enumerate(lines):
+            for bit in line:
+                cell_lines[bit].append(index)
+
+        _winning_lines[size] = (lines, cell_lines)
+
+    return _winning_lines[size]
+
+def run_shifts(column_height: int, connect: int) -> tuple:
+    '''
+    Returns the shifts that find connect in a row on a bitboard with columns of column_height bits, one tuple per
+    direction (vertical, horizontal, diagonal right and diagonal left). Anding a bitboard with itself shifted by each
+    shift of a direction in turn leaves the bits that start a run of connect pieces, the runs double in length with
+    every shift so four in a row takes two shifts and five in a row three.
+    '''
+    directions = (1, column_height, column_height + 1, column_height - 1)
+    steps = []
+    length = 1
+
+    while length < connect:
+        step = min(length, connect - length)
+        steps.append(step)
+        length += step
+
+    return tuple(tuple(step * direction for step in steps) for direction in directions)
+
+def winning_slots(pieces: int, column_height: int, connect: int) -> int:
+    '''
+    Returns a bitmask of the bits that would complete connect in a row for the pieces bitboard, including bits that
+    are already taken or lie outside of the board, so callers mask the result with the free slots.
+    '''
+    if connect == 4:
+        # Unrolled for the standard board since the solver calls this on every node
+        result = (pieces << 1) & (pieces << 2) & (pieces << 3)
+
+        for shift in (column_height, column_height + 1, column_height - 1):
+            pairs = (pieces << shift) & (pieces << (2 * shift))
+            result |= pairs & (pieces << (3 * shift))
+            result |= pairs & (pieces >> shift)
+            pairs = (pieces >> shift) & (pieces >> (2 * shift))
+            result |= pairs & (pieces << shift)
+            result |= pairs & (pieces >> (3 * shift))
+
+        return result
+
+    result = 0
+
+    for direction in (1, column_height, column_height + 1, column_height - 1):
+        # before[k]: bits with k pieces directly below/left of them, after[k]: with k pieces above/right of them
+        before = [-1]
+        after = [-1]
+
+        for k in range(1, connect):
+            before.append(before[-1] & (pieces << (k * direction)))
+            after.append(after[-1] & (pieces >> (k * direction)))
+
+        # A vertical line can only be completed on top
+        if direction == 1:
+            result |= before[connect - 1]
+        else:
+            for k in range(connect):
+                result |= before[k] & after[connect - 1 - k]
+
+    return result
@@ -0,0 +1,371 @@
+from python_settings import settings
+from array import array
+from math import log, sqrt
+from random import Random
+from time import perf_counter, time
+from geometry import run_shifts
+
+# Initialize settings.py as environment variable
+import os
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class MonteCarloTreeSearch:
+
+    def __init__(self, max_nodes = settings.MCTS_MAX_NODES, exploration = settings.MCTS_EXPLORATION, seed = None):
+        '''
+        Initializes a Monte Carlo tree search object. The search grows a tree of the positions below the board by
+        repeatedly walking down it with UCT, scoring the position it ends on with a random playout, and adding the
+        result to every node of the walk. The more iterations it runs the stronger its move, so it can be stopped
+        after any number of iterations or any amount of time.
+
+        The tree is a pool of at most max_nodes nodes kept in preallocated arrays, a node is an index into them and
+        the children of a node are stored next to each other. Positions are a pair of ints like in the Solver,
+        the pieces of the player to move and the mask of every piece, so the playouts only do integer operations.
+        The subtree of the position reached on the next turn is kept, see search().
+
+        exploration is the UCT constant, higher values spread the iterations over more moves. seed seeds the random
+        playouts.
+        '''
+        self.rows = settings.ROWS
+        self.cols = settings.COLS
+        self.connect = settings.CONNECT
+        self.max_nodes = max_nodes
+        self.exploration = exploration
+        self.random = Random(seed)
+
+        column_height = self.rows + 1
+        # Shifts for the vertical, horizontal, diagonal right and diagonal left directions
+        self.directions = (1, column_height, column_height + 1, column_height - 1)
+        self.run_shifts = run_shifts(column_height, self.connect)
+        # self.bottom_masks[i], self.top_masks[i]: the bottom and top playable bit of column i
+        self.bottom_masks = [1 << (i * column_height) for i in range(self.cols)]
+        self.top_masks = [1 << (i * column_height + self.rows - 1) for i in range(self.cols)]
+        # self.column_masks[i]: every playable bit of column i
+        self.column_masks = [((1 << self.rows) - 1) << (i * column_height) for i in range(self.cols)]
+        self.board_mask = sum(self.column_masks)
+        # Reused by every playout for the columns that are not full yet
+        self.open_columns = [0] * self.cols
+
+        # Stats of the last search
+        self.iterations = 0
+        self.elapsed = 0.0
+        self.reused_visits = 0
+        self.clear()
+
+    def search(self, board, color, iterations = settings.MCTS_ITERATIONS, time_budget_ms = settings.MCTS_TIME_BUDGET_MS,
+               deadline = None) -> int:
+        '''
+        Runs iterations iterations from the position of board with color to move, or fewer when time_budget_ms runs
+        out first. Either budget can be None to only use the other one. board is a BitBoard or any board with pieces
+        and heights like it. deadline is an optional time.time() at which the search stops whatever its budgets,
+        which unlike perf_counter() can be compared across processes. A search started after its deadline runs no
+        iterations.
+
+        When the position is the root of the last search or one of its grandchildren, which is the case on the next
+        turn of a game, the search continues from the subtree of that position and its iterations are kept.
+
+        Returns:
+            The column (starting at 1) of the root move with the most visits, the lowest one for a tie, or -1 if
+            there is no move.
+        '''
+        current = board.pieces[color]
+        mask = board.pieces[settings.RED] | board.pieces[settings.YELLOW]
+
+        if mask == self.board_mask or board.gameover():
+            return -1
+
+        self.reuse_tree(current, mask)
+        self.reused_visits = self.visits[0]
+        start = perf_counter()
+        stop = start + time_budget_ms / 1000 if time_budget_ms is not None else None
+
+        if deadline is not None:
+            stop = min(stop, start + deadline - time()) if stop is not None else start + deadline - time()
+
+        count = 0
+
+        while iterations is None or count < iterations:
+            if stop is not None and count & 63 == 0 and perf_counter() > stop:
+                break
+
+            self.iterate()
+            count += 1
+
+        self.iterations = count
+        self.elapsed = perf_counter() - start
+
+        return self.best_move()
+
+    def best_move(self) -> int:
+        '''
+        Returns the column (starting at 1) of the root move with the most visits, or -1 if the root has no children.
+        '''
+        best_column = -1
+        most_visits = -1
+        first = self.first_child[0]
+
+        for child in range(first, first + self.child_count[0] if first != -1 else first):
+            if self.visits[child] > most_visits:
+                best_column = self.moves[child] + 1
+                most_visits = self.visits[child]
+
+        return best_column
+
+    def get_root_visits(self) -> dict:
+        '''
+        Returns a dict of the number of visits of every root move by column (starting at 1).
+        '''
+        first = self.first_child[0]
+
+        if first == -1:
+            return dict()
+
+        return {self.moves[child] + 1: self.visits[child] for child in range(first, first + self.child_count[0])}
+
+    # ===== Iterations ===== #
+    def iterate(self) -> None:
+        '''
+        Runs one iteration: selects a path down the tree with UCT, adds the children of the node it ends on, plays
+        out the position of one of them at random and adds the result to every node of the path.
+        '''
+        first_child, moves, visits = self.first_child, self.moves, self.visits
+        node = 0
+        current, mask = self.root_current, self.root_mask
+        # reward: the result for the player that moved to node, 1 for a win, 0.5 for a tie and 0 for a loss
+        reward = None
+
+        while first_child[node] != -1:
+            node = self.select_child(node)
+            current, mask, reward = self.play(current, mask, moves[node])
+
+            if reward is not None:
+                break
+
+        if reward is None and (visits[node] > 0 or node == 0) and self.size + self.cols <= self.max_nodes:
+            self.expand(node, mask)
+            node = first_child[node]
+            current, mask, reward = self.play(current, mask, moves[node])
+
+        if reward is None:
+            reward = (1 - self.rollout(current, mask)) / 2
+
+        parents, wins = self.parents, self.wins
+
+        while node != -1:
+            visits[node] += 1
+            wins[node] += reward
+            reward = 1 - reward
+            node = parents[node]
+
+    def select_child(self, node) -> int:
+        '''
+        Returns the child of node with the highest UCT score, or its first child that was not visited yet.
+        '''
+        visits, wins = self.visits, self.wins
+        first = self.first_child[node]
+        exploration = self.exploration * sqrt(log(visits[node]))
+        best_child = first
+        best_score = -1.0
+
+        for child in range(first, first + self.child_count[node]):
+            child_visits = visits[child]
+
+            if child_visits == 0:
+                return child
+
+            score = wins[child] / child_visits + exploration / sqrt(child_visits)
+
+            if score > best_score:
+                best_child = child
+                best_score = score
+
+        return best_child
+
+    def expand(self, node, mask) -> None:
+        '''
+        Adds a child to node for every column that is not full in mask.
+        '''
+        first = self.size
+
+        for column in range(self.cols):
+            if not mask & self.top_masks[column]:
+                self.moves[self.size] = column
+                self.parents[self.size] = node
+                self.first_child[self.size] = -1
+                self.visits[self.size] = 0
+                self.wins[self.size] = 0.0
+                self.size += 1
+
+        self.first_child[node] = first
+        self.child_count[node] = self.size - first
+
+    def play(self, current, mask, column) -> tuple:
+        '''
+        Returns a tuple of (current, mask, reward) after the player to move plays column, where reward is 1 if the
+        move wins, 0.5 if it fills the board and None if the game goes on.
+        '''
+        move = (mask + self.bottom_masks[column]) & self.column_masks[column]
+        current |= move
+        mask |= move
+
+        if self.connected(current):
+            return current ^ mask, mask, 1
+
+        if mask == self.board_mask:
+            return current ^ mask, mask, 0.5
+
+        return current ^ mask, mask, None
+
+    def rollout(self, current, mask) -> int:
+        '''
+        Plays random moves from the position until the game is over, without creating any objects besides ints.
+
+        Returns:
+            1 if the player to move wins, -1 if they lose and 0 for a tie.
+        '''
+        open_columns, top_masks = self.open_columns, self.top_masks
+        bottom_masks, column_masks = self.bottom_masks, self.column_masks
+        connected, random = self.connected, self.random.random
+        count = 0
+
+        for column in range(self.cols):
+            if not mask & top_masks[column]:
+                open_columns[count] = column
+                count += 1
+
+        result = 1
+
+        while count:
+            index = int(random() * count)
+            column = open_columns[index]
+            move = (mask + bottom_masks[column]) & column_masks[column]
+            current |= move
+
+            if connected(current):
+                return result
+
+            mask |= move
+
+            if mask & top_masks[column]:
+                count -= 1
+                open_columns[index] = open_columns[count]
+
+            current ^= mask
+            result = -result
+
+        return 0
+
+    def connected(self, pieces) -> bool:
+        '''
+        Returns True if the pieces bitboard contains settings.CONNECT in a row, the same check as BitBoard.connected().
+        '''
+        if self.connect == 4:
+            for shift in self.directions:
+                pairs = pieces & (pieces >> shift)
+
+                if pairs & (pairs >> (2 * shift)):
+                    return True
+
+            return False
+
+        for shifts in self.run_shifts:
+            runs = pieces
+
+            for shift in shifts:
+                runs &= runs >> shift
+
+            if runs:
+                return True
+
+        return False
+
+    # ===== Tree Reuse ===== #
+    def reuse_tree(self, current, mask) -> None:
+        '''
+        Makes the node of the position the root of the tree, keeping its subtree, when the position is the root
+        or a grandchild of the root. The tree is cleared for any other position.
+        '''
+        if (current, mask) == (self.root_current, self.root_mask):
+            return
+
+        if self.first_child[0] != -1 and mask & self.root_mask == self.root_mask:
+            for child in self.children(0):
+                child_current, child_mask, reward = self.play(self.root_current, self.root_mask, self.moves[child])
+
+                if reward is None and mask & child_mask == child_mask and self.first_child[child] != -1:
+                    for grandchild in self.children(child):
+                        position = self.play(child_current, child_mask, self.moves[grandchild])
+
+                        if position[:2] == (current, mask):
+                            self.reroot(grandchild)
+                            self.root_current, self.root_mask = current, mask
+                            return
+
+        self.clear()
+        self.root_current, self.root_mask = current, mask
+
+    def reroot(self, node) -> None:
+        '''
+        Copies the subtree of node to new arrays with node as the root, dropping every other node.
+        '''
+        old_moves, old_first_child, old_child_count = self.moves, self.first_child, self.child_count
+        old_visits, old_wins = self.visits, self.wins
+        self.allocate()
+        self.moves[0] = old_moves[node]
+        self.visits[0] = old_visits[node]
+        self.wins[0] = old_wins[node]
+        # Breadth first, copying the children of every node as one block
+        queue = [node]
+        size = 1
+
+        for new_node, old_node in enumerate(queue):
+            first = old_first_child[old_node]
+
+            if first == -1:
+                continue
+
+            count = old_child_count[old_node]
+            self.first_child[new_node] = size
+            self.child_count[new_node] = count
+
+            for old_child in range(first, first + count):
+                self.moves[size] = old_moves[old_child]
+                self.parents[size] = new_node
+                self.visits[size] = old_visits[old_child]
+                self.wins[size] = old_wins[old_child]
+                queue.append(old_child)
+                size += 1
+
+        self.size = size
+
+    def children(self, node) -> range:
+        '''
+        Returns the range of the children of node.
+        '''
+        return range(self.first_child[node], self.first_child[node] + self.child_count[node])
+
+    # ===== Initialization Methods ===== #
+    def clear(self) -> None:
+        '''
+        Removes every node of the tree.
+        '''
+        self.allocate()
+        self.size = 1
+        self.root_current = None
+        self.root_mask = None
+
+    def allocate(self) -> None:
+        '''
+        Allocates the node arrays with a root node at index 0 and every other node free.
+        '''
+        # self.moves[node]: the column (starting at 0) of the move that leads to node
+        self.moves = array('b', [0]) * self.max_nodes
+        # self.parents[node]: the index of the parent of node, -1 for the root
+        self.parents = array('i', [-1]) * self.max_nodes
+        # self.first_child[node]: the index of the first child of node, -1 if node has not been expanded
+        self.first_child = array('i', [-1]) * self.max_nodes
+        self.child_count = array('b', [0]) * self.max_nodes
+        # self.visits[node], self.wins[node]: the number of iterations through node and the sum of their results for
+        # the player that moved to node
+        self.visits = array('i', [0]) * self.max_nodes
+        self.wins = array('d', [0.0]) * self.max_nodes
@@ -0,0 +1,123 @@
+from python_settings import settings
+import mmap
+import struct
+import tempfile
+
+# Initialize settings.py as environment variable
+import os
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class MoveCache:
+
+    # File layout: a header followed by a fixed number of slots
+    HEADER = struct.Struct('<4sBBB5xQ')
+    SLOT = struct.Struct('<QQ')
+    MAGIC = b'CNMC'
+
+    def __init__(self, path, slots = settings.MOVE_CACHE_SLOTS):
+        '''
+        Initializes a move cache object. The cache keeps the moves PlayerAI has searched in a memory-mapped file, so
+        they survive restarts and are shared by every process on the host that uses the same file.
+
+        Every key maps to a single slot of (check, data) where check is key ^ data. Slots are written without any
+        locking, so two processes writing the same slot at once can leave it holding half of each entry. Such a
+        slot no longer passes check ^ data == key and reads as a miss, the same as a slot holding another key.
+
+        Nothing is read when the object is created, the file is created with slots slots if it does not exist yet
+        and memory-mapped the first time the cache is used. An existing file keeps its own number of slots.
+        '''
+        self.path = path
+        self.slots = slots
+        self.file = None
+        self.map = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def probe(self, key: int, depth: int) -> int or None:
+        '''
+        Returns the move stored for the 64 bit key when it was searched to at least depth, or None otherwise.
+        '''
+        self.open()
+        check, data = self.SLOT.unpack_from(self.map, self.slot_offset(key))
+
+        if data == 0 or check ^ data != key or data >> 8 < depth:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return data & 0xFF
+
+    def store(self, key: int, depth: int, move: int) -> None:
+        '''
+        Stores the move searched to depth for the 64 bit key. An entry of the same key that was searched deeper is kept.
+        '''
+        self.open()
+        offset = self.slot_offset(key)
+        check, data = self.SLOT.unpack_from(self.map, offset)
+
+        if data != 0 and check ^ data == key and data >> 8 > depth:
+            return
+
+        data = depth << 8 | move
+        self.map[offset:offset + self.SLOT.size] = self.SLOT.pack(key ^ data, data)
+        self.stores += 1
+
+    def slot_offset(self, key: int) -> int:
+        '''
+        Returns the offset in the file of the slot of the key.
+        '''
+        return self.HEADER.size + (key % self.slots) * self.SLOT.size
+
+    def open(self) -> None:
+        '''
+        Memory-maps the cache file, creating it first if it does not exist. Only the first call does anything.
+        Raises ValueError if the file is not a move cache or was built for another board size or connect.
+        '''
+        if self.map is not None:
+            return
+
+        if not os.path.exists(self.path):
+            self.create()
+
+        self.file = open(self.path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        magic, rows, cols, connect, self.slots = self.HEADER.unpack_from(self.map, 0)
+
+        if magic != self.MAGIC or (rows, cols, connect) != (settings.ROWS, settings.COLS, settings.CONNECT):
+            self.close()
+            raise ValueError(f'{self.path} is not a move cache for a {settings.ROWS}x{settings.COLS} '
+                             f'connect {settings.CONNECT} board')
+
+    def create(self) -> None:
+        '''
+        Creates an empty cache file. The file is written under a temporary name and then linked to self.path, so
+        other processes never map a file without its header, and only the first of several processes creating the
+        cache at once gets its file linked. The slots are left as a hole in the file until they are written.
+        '''
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+
+        try:
+            with os.fdopen(descriptor, 'wb') as cache_file:
+                cache_file.write(self.HEADER.pack(self.MAGIC, settings.ROWS, settings.COLS, settings.CONNECT, self.slots))
+                cache_file.truncate(self.HEADER.size + self.slots * self.SLOT.size)
+
+            os.link(temporary_path, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(temporary_path)
+
+    def close(self) -> None:
+        '''
+        Flushes, unmaps and closes the cache file. The cache is opened again on the next probe or store.
+        '''
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.file.close()
+
+        self.file = None
+        self.map = None
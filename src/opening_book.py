@@ -0,0 +1,116 @@
+from python_settings import settings
+import mmap
+import struct
+
+class OpeningBook:
+
+    # File layout: a header followed by records sorted by key
+    HEADER = struct.Struct('<4sBBBBI')
+    RECORD = struct.Struct('<Qb')
+    MAGIC = b'CNOB'
+
+    def __init__(self, path):
+        '''
+        Initializes an opening book object. The book holds the exact solver score of every position up to a number of
+        plies, keyed by the same canonical position + mask key as the solver's transposition table, so a position
+        and its mirror image share one record.
+
+        Nothing is read when the object is created, the file is memory-mapped the first time the book is used and
+        lookups binary search the mapped records, so only the pages that are actually touched get loaded.
+        '''
+        self.path = path
+        self.file = None
+        self.map = None
+        self.plies = None
+        self.count = 0
+
+    def lookup(self, key) -> int or None:
+        '''
+        Returns the score stored for the key, or None if the position is not in the book.
+        '''
+        self.open()
+        low = 0
+        high = self.count - 1
+
+        while low <= high:
+            middle = (low + high) // 2
+            record_key, score = self.RECORD.unpack_from(self.map, self.HEADER.size + middle * self.RECORD.size)
+
+            if record_key == key:
+                return score
+            elif record_key < key:
+                low = middle + 1
+            else:
+                high = middle - 1
+
+        return None
+
+    def get_plies(self) -> int:
+        '''
+        Returns the number of plies covered by the book, every position with at most this many pieces is in it.
+        '''
+        self.open()
+
+        return self.plies
+
+    def open(self) -> None:
+        '''
+        Memory-maps the book file and reads its header, only the first call does anything. Raises ValueError if the
+        file is not an opening book or was built for another board size or connect.
+        '''
+        if self.map is not None:
+            return
+
+        self.file = open(self.path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, rows, cols, connect, self.plies, self.count = self.HEADER.unpack_from(self.map, 0)
+
+        if magic != self.MAGIC or (rows, cols, connect) != (settings.ROWS, settings.COLS, settings.CONNECT):
+            self.close()
+            raise ValueError(f'{self.path} is not an opening book for a {settings.ROWS}x{settings.COLS} '
+                             f'connect {settings.CONNECT} board')
+
+    def close(self) -> None:
+        '''
+        Unmaps and closes the book file. The book is opened again on the next lookup.
+        '''
+        if self.map is not None:
+            self.map.close()
+            self.file.close()
+
+        self.file = None
+        self.map = None
+
+    @classmethod
+    def build(cls, path, plies, solver) -> 'OpeningBook':
+        '''
+        Solves every position that can be reached in at most plies moves without the game ending and writes their
+        scores to path as an opening book. This takes a long time for more than a few plies and is meant to be run
+        once, offline, with the resulting file shipped alongside the game.
+        '''
+        scores = dict()
+        positions = [(0, 0, 0)]
+
+        while positions:
+            position, mask, moves = positions.pop()
+            key = solver.canonical_key(position, mask)
+
+            if key in scores or solver.can_win_next(position, mask):
+                continue
+
+            scores[key] = solver.solve_position(position, mask, moves)
+
+            if moves < plies:
+                possible = solver.possible(mask)
+
+                for column_mask in solver.column_masks:
+                    if possible & column_mask:
+                        positions.append((position ^ mask, mask | (possible & column_mask), moves + 1))
+
+        with open(path, 'wb') as book_file:
+            book_file.write(cls.HEADER.pack(cls.MAGIC, settings.ROWS, settings.COLS, settings.CONNECT, plies, len(scores)))
+
+            for key in sorted(scores):
+                book_file.write(cls.RECORD.pack(key, scores[key]))
+
+        return cls(path)
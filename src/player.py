@@ -2,14 +2,16 @@ from python_settings import settings
 
 class Player:
     
-    def __init__(self, color, player_str = "HUMAN"):
+    def __init__(self, color, player_str = "HUMAN", read_move = input):
         '''
         Initializes a Player object that possesses their piece color and total win count.
         The player takes input from their respective user and returns the move to get
-        validated.
+        validated. read_move is called with the prompt to get the move, it reads from the
+        console by default.
         '''
         self.color = color
         self.player_str = player_str
+        self.read_move = read_move
         self.wins = 0
 
     def get_move(self, **kwargs) -> str:
@@ -18,9 +20,21 @@ class Player:
         will be called until a valid move is made. None of the validation is done on the Player
         object's side.
         '''
-        user_move = input("Input an int column from [1-7]: ")
+        user_move = self.read_move(f"Input an int column from [1-{settings.COLS}]: ")
         return user_move
 
+    def get_column(self, **kwargs) -> int:
+        '''
+        Returns the move of get_move() as a column int, or INVALID_COLUMN if it is not a number. ConnectFour asks
+        every player for columns, PlayerAI overrides this to return its column without going through a string.
+        '''
+        player_move = self.get_move(**kwargs)
+
+        if player_move and player_move.isnumeric():
+            return int(player_move)
+
+        return settings.INVALID_COLUMN
+
     def get_color(self) -> int:
         '''
         Return the piece color that the player object has ownership of.
@@ -1,66 +1,318 @@
 from python_settings import settings
 from math import inf
-from copy import deepcopy
-from random import randint
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter, time
+from random import getrandbits, randrange, Random
 from player import Player
+from bitboard import BitBoard
+from threat_bitboard import ThreatBitBoard
+from transposition_table import TranspositionTable
+from solver import Solver, SolverTimeout
+from opening_book import OpeningBook
+from move_cache import MoveCache
+from mcts import MonteCarloTreeSearch
+from search_stats import SearchStats
+from geometry import evaluation_table, utility_value
 
 # Initialize settings.py as environment variable
 import os
 os.environ["SETTINGS_MODULE"] = 'settings' 
 
+class SearchTimeout(Exception):
+    '''
+    Raised inside the alpha-beta search when the time budget of the move runs out.
+    '''
+    pass
+
+# Players used by search_root_move() in worker processes, one per color and search options so their tables are kept
+# between tasks
+worker_players = dict()
+
+def search_root_move(board, move, depth, color, search_options, deadline = None) -> int:
+    '''
+    Runs in a worker process of PlayerAI.executor. Makes the root move for color on board and returns the exact
+    alpha-beta value of the resulting position searched to depth, by a player created with the search_options of
+    the AI that submitted the task, see PlayerAI.search_options(). Raises SearchTimeout when the time.time()
+    deadline passes first.
+    '''
+    key = (color, tuple(sorted(search_options.items())))
+
+    if key not in worker_players:
+        worker_players[key] = PlayerAI(color, **search_options)
+
+    player = worker_players[key]
+    player.reset_move_ordering()
+    board.move(move, color)
+    player.deadline = perf_counter() + deadline - time() if deadline is not None else None
+
+    try:
+        return player.alpha_beta(board, depth - 1, -inf, inf, player.opposite_player(color))
+    finally:
+        player.deadline = None
+
+# Trees grown by search_mcts_tree() in worker processes, one per color so they are kept between turns. Each entry is
+# a tuple of (tree, root, reported) where reported holds the root visits already returned for root
+worker_trees = dict()
+
+def search_mcts_tree(board, color, iterations, time_budget_ms, deadline = None) -> tuple:
+    '''
+    Runs in a worker process of PlayerAI.executor. Grows the worker's own tree for color from board with the same
+    budgets as a serial MCTS move, stopping at the time.time() deadline of the move at the latest.
+
+    Returns:
+        A tuple of (visits, rollouts, elapsed). visits[column] is the number of visits of each root move that the
+        worker has not returned before, so a worker that gets two tasks of the same move does not count its tree
+        twice. rollouts is the number of iterations run and elapsed the seconds they took.
+    '''
+    tree, root, reported = worker_trees.get(color, (None, None, None))
+
+    if tree is None:
+        tree = MonteCarloTreeSearch()
+
+    tree.search(board, color, iterations, time_budget_ms, deadline)
+    visits = tree.get_root_visits()
+    new_root = (tree.root_current, tree.root_mask)
+    worker_trees[color] = (tree, new_root, visits)
+
+    if root == new_root:
+        visits = {column: count - reported.get(column, 0) for column, count in visits.items()}
+
+    return visits, tree.iterations, tree.elapsed
+
 class PlayerAI(Player):
     
-    def __init__(self, color, difficulty = settings.MEDIUM, player_str = settings.AI_STR):
+    def __init__(self, color, difficulty = settings.MEDIUM, player_str = settings.AI_STR, search = settings.ALPHA_BETA_SEARCH,
+                 max_depth = settings.MAX_DEPTH, transposition_table = None, shared_table = False,
+                 time_budget_ms = settings.HARD_TIME_BUDGET_MS, opening_book_path = settings.OPENING_BOOK_PATH,
+                 workers = settings.SEARCH_WORKERS, collect_stats = False, batch_leaves = settings.BATCH_LEAF_EVALUATION,
+                 evaluation = settings.EVALUATION, tactical_check = settings.TACTICAL_CHECK,
+                 move_cache_path = settings.MOVE_CACHE_PATH, mcts_iterations = settings.MCTS_ITERATIONS,
+                 mcts_time_budget_ms = settings.MCTS_TIME_BUDGET_MS):
         self.difficulty = difficulty
+        self.search = search
+        # self.evaluation: settings.POSITIONAL_EVALUATION or settings.THREAT_EVALUATION, threat evaluation searches on
+        # ThreatBitBoards since it needs their open line counts. Batch leaf evaluation only scores positions
+        self.evaluation = evaluation
+        self.board_class = ThreatBitBoard if evaluation == settings.THREAT_EVALUATION else BitBoard
+        # Immediate wins, forced blocks and moves that let the opponent win right away are found before searching
+        self.tactical_check = tactical_check
+        self.max_depth = max_depth
+        self.batch_leaves = batch_leaves and evaluation == settings.POSITIONAL_EVALUATION
+        self.time_budget_ms = time_budget_ms
+        # Budgets of every MCTS move, the search stops at whichever runs out first
+        self.mcts_iterations = mcts_iterations
+        self.mcts_time_budget_ms = mcts_time_budget_ms
+        # Root moves are split across a pool of self.workers processes when there is more than one worker
+        self.workers = workers
+        self.executor = None
+        # self.node_count: number of positions visited by minimax() and alpha_beta() since the AI was created
+        self.node_count = 0
+        # self.stats: the SearchStats of the move being searched when collect_stats is set, None otherwise.
+        # self.last_stats: the SearchStats of the last move
+        self.collect_stats = collect_stats
+        self.stats = None
+        self.last_stats = None
+        # self.deadline: perf_counter() time at which the current search has to stop, None for a fixed depth search
+        self.deadline = None
         super().__init__(color, player_str)
 
+        # The transposition table is kept between turns, and between games when a shared table is used
+        if transposition_table is not None:
+            self.transposition_table = transposition_table
+        elif shared_table:
+            self.transposition_table = TranspositionTable.shared()
+        else:
+            self.transposition_table = TranspositionTable()
+
+        # The solver is created on the first PERFECT move, it has its own table since its entries hold exact game
+        # results rather than evaluations
+        self.opening_book = OpeningBook(opening_book_path) if opening_book_path is not None else None
+        self.solver = None
+        # The tree search is created on the first MCTS move and keeps its tree between turns
+        self.mcts = None
+        # self.mcts_rollouts: number of rollouts of the last MCTS move, self.mcts_rollout_rates: the rollouts per
+        # second of every worker that searched it
+        self.mcts_rollouts = 0
+        self.mcts_rollout_rates = []
+        # Moves searched by best_move() are kept on disk when a move cache file is given, see MoveCache
+        self.move_cache = MoveCache(move_cache_path) if move_cache_path is not None else None
+
+        # self.table_keys[player]: xored into the board hash so that entries depend on the player to move, on which
+        # color the AI evaluates for and on how it evaluates, since a shared table can hold entries of any AI
+        salt = Random(f'{settings.ZOBRIST_SEED}:{self.color}:{self.evaluation}')
+        self.table_keys = {settings.RED: salt.getrandbits(64), settings.YELLOW: salt.getrandbits(64)}
+        # self.cache_key: xored into the board hash for the move cache, whose moves also depend on the tactical check
+        self.cache_key = Random(f'{settings.ZOBRIST_SEED}:{self.color}:{self.evaluation}:{self.tactical_check}').getrandbits(64)
+
+        # Columns ordered from the center outwards, center columns are part of the most four in a rows
+        center = (settings.COLS + 1) / 2
+        self.center_distance = {column: abs(column - center) for column in range(1, settings.COLS + 1)}
+        # self.killer_moves[depth]: the last moves that caused a cutoff at that depth of the alpha-beta search
+        self.killer_moves = dict()
+        # self.history_table[color][column]: how often the column caused a cutoff for color, weighted by depth
+        self.history_table = dict()
+
         # self.evaluation_table[i][j]: indicates the number of four connected positions including the space [i][j]
-        self.evaluation_table = [
-            [3, 4, 5, 7, 5, 4, 3],
-            [4, 6, 8, 10, 8, 6, 4],
-            [5, 8, 11, 13, 11, 8, 5],
-            [5, 8, 11, 13, 11, 8, 5],
-            [4, 6, 8, 10, 8, 6, 4],
-            [3, 4, 5, 7, 5, 4, 3]
-        ]
+        self.evaluation_table = evaluation_table()
+        # Evaluation constants are read once since evaluate() is called at every leaf of the search
+        self.utility_value = utility_value()
+        self.winner_award = settings.WINNER_AWARD
 
     def get_move(self, **kwargs) -> str:
         '''
         Overrides get_move() from the parent class 'Player' and returns
         a move based off the board and difficulty mode of the AI.
         '''
+        return str(self.get_column(**kwargs))
+
+    def get_column(self, **kwargs) -> int:
+        '''
+        Overrides get_column() from the parent class 'Player' and returns the column (starting at 1) of the move
+        chosen for the board by the difficulty mode of the AI, without going through a string.
+        '''
         board = kwargs['board']
 
+        if self.collect_stats:
+            return self.get_move_with_stats(board)[0]
+
+        return self.choose_column(board)
+
+    def get_move_with_stats(self, board) -> tuple:
+        '''
+        Returns the column of choose_column() together with the SearchStats of the search that chose it. The node
+        and table counters are the difference of the AI's running totals before and after the search, nodes
+        searched by worker processes of the parallel search are not included.
+        '''
+        stats = SearchStats()
+        stats.difficulty = self.difficulty
+        nodes, probes = self.node_count, self.transposition_table.hits + self.transposition_table.misses
+        table_hits = self.transposition_table.hits
+        self.stats = stats
+        start = perf_counter()
+
+        try:
+            stats.move = self.choose_column(board)
+        finally:
+            self.stats = None
+
+        stats.elapsed = perf_counter() - start
+        stats.nodes = self.node_count - nodes
+        stats.table_probes = self.transposition_table.hits + self.transposition_table.misses - probes
+        stats.table_hits = self.transposition_table.hits - table_hits
+        self.last_stats = stats
+
+        return stats.move, stats
+
+    def choose_column(self, board) -> int:
+        '''
+        Returns the column (starting at 1) of the move chosen for the board by the difficulty mode of the AI.
+        '''
         if self.difficulty == settings.EASY:
-            return self.random_move(board)
+            return self.random_column(board)
 
         elif self.difficulty == settings.MEDIUM:
-            return self.best_move(board)
+            return self.best_column(board)
+
+        elif self.difficulty == settings.HARD:
+            return self.iterative_deepening_column(board)
+
+        elif self.difficulty == settings.PERFECT:
+            return self.perfect_column(board)
+
+        elif self.difficulty == settings.MCTS:
+            return self.mcts_column(board)
 
     # ===== Easy Difficulty ===== #
     def random_move(self, board) -> str:
         '''
         Easy Difficulty: 
-            Returns a random column move.
+            Returns a random column move, see random_column().
         '''
-        return str(randint(1, settings.COLS))
+        return str(self.random_column(board))
+
+    def random_column(self, board) -> int:
+        '''
+        Returns a column (starting at 1) picked uniformly at random among the columns that are not full, or -1 if
+        every column is full. The column is drawn from board.open_columns, so a full column is never returned and
+        no move has to be retried however late in the game it is.
+        '''
+        open_columns = board.open_columns
+
+        if not open_columns:
+            return -1
+
+        # Drops the lowest open column a random number of times, the lowest remaining one is the pick
+        for _ in range(randrange(bin(open_columns).count('1'))):
+            open_columns &= open_columns - 1
+
+        return (open_columns & -open_columns).bit_length()
 
     # ===== Medium Difficulty ===== #
     def best_move(self, board) -> str:
+        '''
+        Medium Difficulty:
+            Returns the best move as a column string, see best_column().
+        '''
+        return str(self.best_column(board))
+
+    def best_column(self, board) -> int:
         '''
         Medium Difficulty:
             Returns a better move based off the minimax algorithm and our evaluation function based off piece positioning.
+            The search runs on a BitBoard copy of the board since it is much cheaper to move and check for winners.
+            Depending on self.search, either plain minimax or alpha-beta is used, both return the same move.
+            Tactical moves are returned without searching, see tactical_moves(). With a move cache, a move already
+            searched to at least self.max_depth by any AI of the same color and evaluation is returned from it, and
+            every searched move is stored in it.
+        '''
+        search_board = self.create_search_board(board)
+        tactical_move, moves = self.tactical_moves(search_board)
+
+        if tactical_move is not None:
+            return tactical_move
+
+        if self.move_cache is None:
+            return self.search_best_move(search_board, moves)
+
+        cache_key = search_board.hash ^ self.cache_key
+        cached_move = self.move_cache.probe(cache_key, self.max_depth)
+
+        if cached_move is not None:
+            return cached_move
+
+        column = self.search_best_move(search_board, moves)
+
+        if column != -1:
+            self.move_cache.store(cache_key, self.max_depth, column)
+
+        return column
+
+    def search_best_move(self, board, moves) -> int:
         '''
+        Returns the column of the best move of best_move() found by a search to self.max_depth, or -1 if there is no
+        move. Only the root moves are searched when they are given.
+        '''
+        if self.search == settings.ALPHA_BETA_SEARCH and self.workers > 1:
+            return self.parallel_alpha_beta_move(board, self.max_depth, moves)
+
+        if self.search == settings.ALPHA_BETA_SEARCH:
+            self.reset_move_ordering()
+            return self.alpha_beta_move(board, self.max_depth, moves=moves)
+
         move_dict = dict()
-        highest_value = self.minimax(deepcopy(board), settings.MAX_DEPTH, self.color, move_dict)
+        start = perf_counter()
+        highest_value = self.minimax(board, self.max_depth, self.color, move_dict, moves)
+
+        if self.stats is not None:
+            self.stats.depth_times[self.max_depth] = perf_counter() - start
 
         for move in move_dict.keys():
             if move_dict[move] == highest_value:
-                return str(move)
+                return move
 
-        return str(-1)
+        return -1
 
-    def minimax(self, board, depth, maximizing_player, move_dict) -> int:
+    def minimax(self, board, depth, maximizing_player, move_dict, root_moves = None) -> int:
         '''
         Minimax algorithm that is a decision rule for evaluating the best move to make on the current board.
         Minimizes the possible loss for a worst case scenario. Recursive algorithm for choosing the next move
@@ -68,15 +320,21 @@ class PlayerAI(Player):
         the maximum valued move and minimize the opposing player's.
 
         Returns:
-            An integer representing the highest value of the moves that can be made on the board state. At MAX_DEPTH,
+            An integer representing the highest value of the moves that can be made on the board state. At self.max_depth,
             we add those possible column moves to move_dict and assign the value to the respective column that led to it.
             We return the max value and use it in best_move to find the respective column and make the move.
+            Only the root_moves are searched at self.max_depth when they are given.
         '''
+        self.node_count += 1
+
         if depth == 0 or board.gameover():
+            if self.stats is not None:
+                self.stats.record_leaf(board)
+
             return self.evaluate(board)
         
         # List of all available columns
-        moves = board.all_moves()
+        moves = root_moves if root_moves is not None else board.all_moves()
         # Next Player that will be used in minimax alg
         next_player = self.opposite_player(maximizing_player)
 
@@ -85,12 +343,12 @@ class PlayerAI(Player):
             value = -inf
             
             for i in range(len(moves)):
-                board_copy = deepcopy(board)
-                board_copy.move(moves[i], maximizing_player)
-                value = max(value, self.minimax(board_copy, depth - 1, next_player, move_dict))
+                board.move(moves[i], maximizing_player)
+                value = max(value, self.minimax(board, depth - 1, next_player, move_dict))
+                board.undo_move(moves[i])
 
                 # Only reaches here top level and adds the value of each move to the move_dict so that we can access it later
-                if depth == settings.MAX_DEPTH:
+                if depth == self.max_depth:
                     move_dict[moves[i]] = value
 
         # AI is looking for the min value that can be gained from the opposing player
@@ -98,12 +356,433 @@ class PlayerAI(Player):
             value = inf
 
             for i in range(len(moves)):
-                board_copy = deepcopy(board)
-                board_copy.move(moves[i], maximizing_player)
-                value = min(value, self.minimax(board_copy, depth - 1, next_player, move_dict))
+                board.move(moves[i], maximizing_player)
+                value = min(value, self.minimax(board, depth - 1, next_player, move_dict))
+                board.undo_move(moves[i])
 
         return value
 
+    # ===== Hard Difficulty ===== #
+    def iterative_deepening_column(self, board, deadline = None) -> int:
+        '''
+        Hard Difficulty:
+            Returns the best move of an alpha-beta search that is repeated one depth deeper at a time until
+            self.time_budget_ms runs out, or until the perf_counter() deadline when one is given. The move of the
+            last search that completed is returned, and each search starts with the best move of the previous one,
+            whose transposition table entries also order the moves of the positions below it. The first depth is
+            always completed so that a move is returned. With more than one worker, every depth after the first
+            searches its root moves on the process pool, see parallel_alpha_beta_move().
+        '''
+        search_board = self.create_search_board(board)
+        tactical_move, moves = self.tactical_moves(search_board)
+
+        if tactical_move is not None:
+            return tactical_move
+
+        if deadline is None:
+            deadline = perf_counter() + self.time_budget_ms / 1000
+
+        self.reset_move_ordering()
+        best_column = self.alpha_beta_move(search_board, 1, moves=moves)
+        self.deadline = deadline
+
+        try:
+            for depth in range(2, settings.ROWS * settings.COLS - search_board.moves_played + 1):
+                if self.search == settings.ALPHA_BETA_SEARCH and self.workers > 1:
+                    best_column = self.parallel_alpha_beta_move(search_board, depth, moves)
+                else:
+                    best_column = self.alpha_beta_move(search_board, depth, best_column, moves)
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+
+        return best_column
+
+    # ===== Perfect Difficulty ===== #
+    def perfect_column(self, board) -> int:
+        '''
+        Perfect Difficulty:
+            Returns the move with the best exact game result from the solver. Early positions take too long to solve
+            at interactive latency, so positions with fewer than settings.SOLVER_MIN_MOVES pieces are only solved when
+            the opening book covers all of their moves, and are otherwise searched like the HARD difficulty.
+            The move takes at most self.time_budget_ms like a HARD move: the solver gets settings.SOLVER_BUDGET_SHARE
+            of it, and if the position is not solved by then the rest of the budget goes to the HARD search. The
+            solver's table keeps what it solved, so the following moves are more likely to be solved in time.
+        '''
+        search_board = self.create_search_board(board)
+        book_plies = self.opening_book.get_plies() if self.opening_book is not None else -1
+        start = perf_counter()
+
+        if search_board.moves_played < settings.SOLVER_MIN_MOVES and search_board.moves_played >= book_plies:
+            return self.iterative_deepening_column(board)
+
+        if self.solver is None:
+            self.solver = Solver(opening_book=self.opening_book)
+
+        try:
+            return self.solver.best_move(search_board, self.color,
+                                         start + self.time_budget_ms * settings.SOLVER_BUDGET_SHARE / 1000)
+        except SolverTimeout:
+            return self.iterative_deepening_column(board, start + self.time_budget_ms / 1000)
+
+    # ===== MCTS Difficulty ===== #
+    def mcts_column(self, board) -> int:
+        '''
+        MCTS Difficulty:
+            Returns the most visited move of a Monte Carlo tree search that runs for self.mcts_iterations iterations
+            or self.mcts_time_budget_ms, whichever comes first. Tactical moves are returned without searching, see
+            tactical_moves(). The tree is kept between turns, so the iterations spent on the opponent's reply carry
+            over to the next move. With more than one worker every worker grows its own tree, see parallel_mcts_move().
+        '''
+        search_board = self.create_search_board(board)
+        tactical_move, _ = self.tactical_moves(search_board)
+
+        if tactical_move is not None:
+            return tactical_move
+
+        if self.workers > 1:
+            column = self.parallel_mcts_move(search_board)
+        else:
+            if self.mcts is None:
+                self.mcts = MonteCarloTreeSearch(seed=getrandbits(64))
+
+            column = self.mcts.search(search_board, self.color, self.mcts_iterations, self.mcts_time_budget_ms)
+            self.mcts_rollouts = self.mcts.iterations
+            self.mcts_rollout_rates = [self.mcts.iterations / self.mcts.elapsed if self.mcts.elapsed else 0.0]
+
+        if self.stats is not None:
+            self.stats.rollouts = self.mcts_rollouts
+            self.stats.rollout_rates = self.mcts_rollout_rates.copy()
+
+        return column
+
+    def parallel_mcts_move(self, board) -> int:
+        '''
+        Root parallel MCTS: every worker process grows an independent tree from the board with the full budgets of a
+        serial move, and the visits of each root move are summed over the trees. Returns the column with the most
+        visits in total, the lowest one for a tie, or -1 if there is no move. Within the same time budget every
+        worker adds its rollouts, so more workers make for a stronger move at the same latency.
+
+        Every task gets the absolute deadline of the move, so a task that has to wait for a process busy with another
+        task only searches for the time left and the move never takes much longer than self.mcts_time_budget_ms.
+        '''
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        deadline = time() + self.mcts_time_budget_ms / 1000 if self.mcts_time_budget_ms is not None else None
+        tasks = [self.executor.submit(search_mcts_tree, board, self.color, self.mcts_iterations, self.mcts_time_budget_ms,
+                                      deadline) for _ in range(self.workers)]
+        visits = dict()
+        self.mcts_rollouts = 0
+        self.mcts_rollout_rates = []
+
+        for task in tasks:
+            root_visits, rollouts, elapsed = task.result()
+            self.mcts_rollouts += rollouts
+            self.mcts_rollout_rates.append(rollouts / elapsed if elapsed else 0.0)
+
+            for column, count in root_visits.items():
+                visits[column] = visits.get(column, 0) + count
+
+        return min(visits, key=lambda column: (-visits[column], column), default=-1)
+
+    def create_search_board(self, board) -> BitBoard:
+        '''
+        Returns a copy of the board to search on, a ThreatBitBoard for the threat evaluation and a BitBoard otherwise.
+        The AI is to move, so it is the color that moved first when both colors have the same number of pieces.
+        '''
+        search_board = self.board_class.from_board(board)
+
+        if self.evaluation == settings.THREAT_EVALUATION and search_board.first_color is None:
+            search_board.first_color = self.color
+
+        return search_board
+
+    def tactical_moves(self, board) -> tuple:
+        '''
+        Finds the moves that do not need a search, each check only makes a move and looks for a win on the board:
+            If the AI can win with its next move, the lowest winning column is returned right away.
+            If the opponent could win with their next move, the AI has to block the lowest such column.
+            Moves that put a piece below a slot where the opponent would complete a four in a row are dropped
+            from the search, unless every move does.
+
+        Returns:
+            A tuple of (move, moves). move is the column to play without searching or None, in which case moves
+            holds the root moves to search, or None to search every move.
+        '''
+        if not self.tactical_check or board.gameover():
+            return None, None
+
+        opposing_color = self.opposite_player(self.color)
+        moves = board.all_moves()
+        safe_moves = []
+
+        for color in (self.color, opposing_color):
+            for move in moves:
+                board.move(move, color)
+                winning_color = board.get_winner()
+                board.undo_move(move)
+
+                if winning_color == color:
+                    return move, None
+
+        for move in moves:
+            board.move(move, self.color)
+            # The only slot the move makes playable for the opponent is the one on top of it
+            gives_win = board.column_available(move) != settings.INVALID_COLUMN
+
+            if gives_win:
+                board.move(move, opposing_color)
+                gives_win = board.get_winner() == opposing_color
+                board.undo_move(move)
+
+            board.undo_move(move)
+
+            if not gives_win:
+                safe_moves.append(move)
+
+        if len(safe_moves) == 1:
+            return safe_moves[0], None
+
+        return None, safe_moves if safe_moves and len(safe_moves) < len(moves) else None
+
+    # ===== Alpha-Beta Search ===== #
+    def alpha_beta_move(self, board, depth, first_move = None, moves = None) -> int:
+        '''
+        Searches every root move with alpha-beta and returns the column of the best one, or -1 if there is no move.
+        When first_move is given it is searched before every other root move. When moves is given only those root
+        moves are searched.
+
+        Plain minimax picks the lowest column among the moves with the highest value. To return that same column,
+        moves to the left of the current best are searched with a window that also proves ties, while moves to the right
+        only need to prove they are strictly better. Any value returned inside its window is exact.
+        '''
+        if depth == 0 or board.gameover():
+            return -1
+
+        start = perf_counter()
+        next_player = self.opposite_player(self.color)
+        best_value = -inf
+        best_column = -1
+
+        root_moves = moves if moves is not None else board.all_moves()
+
+        for move in self.order_moves(root_moves, depth, self.color, first_move):
+            if best_column == -1:
+                alpha = -inf
+            elif move < best_column:
+                alpha = best_value - 1
+            else:
+                alpha = best_value
+
+            board.move(move, self.color)
+            value = self.alpha_beta(board, depth - 1, alpha, inf, next_player)
+            board.undo_move(move)
+
+            if best_column == -1 or value > best_value or (value == best_value and move < best_column):
+                best_value = value
+                best_column = move
+
+        if self.stats is not None:
+            self.stats.depth_times[depth] = perf_counter() - start
+
+        return best_column
+
+    def parallel_alpha_beta_move(self, board, depth, moves = None) -> int:
+        '''
+        Searches every root move (or only moves, when given) in its own task on the process pool and returns the column
+        of the best one, or -1 if there is no move. Each task finds the exact value of its move with the same search
+        options as this AI, so the lowest column with the highest value is the same move the serial search returns.
+        Raises SearchTimeout when self.deadline is set and passes before every task is done, the tasks that did not
+        start yet are cancelled.
+        '''
+        if depth == 0 or board.gameover():
+            return -1
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        moves = moves if moves is not None else board.all_moves()
+        search_options = self.search_options()
+        # Workers compare the deadline to time.time() since perf_counter() is not shared between processes
+        deadline = time() + self.deadline - perf_counter() if self.deadline is not None else None
+        tasks = [self.executor.submit(search_root_move, board, move, depth, self.color, search_options, deadline)
+                 for move in moves]
+        try:
+            values = [task.result() for task in tasks]
+        except SearchTimeout:
+            for task in tasks:
+                task.cancel()
+
+            raise
+
+        return moves[values.index(max(values))]
+
+    def search_options(self) -> dict:
+        '''
+        Returns the keyword arguments of a PlayerAI that searches positions the same way as this one, used to
+        create the players of the worker processes.
+        '''
+        return {
+            'search': self.search,
+            'max_depth': self.max_depth,
+            'time_budget_ms': self.time_budget_ms,
+            'evaluation': self.evaluation,
+            'tactical_check': self.tactical_check,
+            'batch_leaves': self.batch_leaves,
+        }
+
+    def close(self) -> None:
+        '''
+        Shuts down the process pool of the parallel search, if one was started, and closes the move cache. A new
+        pool is started by the next parallel search and the cache is opened again on its next use.
+        '''
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+        if self.move_cache is not None:
+            self.move_cache.close()
+
+    def alpha_beta(self, board, depth, alpha, beta, maximizing_player) -> int:
+        '''
+        Minimax with alpha-beta pruning. alpha is the value the AI is already guaranteed and beta is the value the opposing
+        player is already guaranteed, so once alpha >= beta the remaining moves of the node can not change the result and
+        are skipped. Moves are ordered so that the ones most likely to cause that cutoff are searched first.
+
+        Returns:
+            An integer equal to the minimax value of the board when it lies between alpha and beta, otherwise a bound
+            on the same side of the window as the minimax value.
+        '''
+        self.node_count += 1
+
+        if depth == 0 or board.gameover():
+            if self.stats is not None:
+                self.stats.record_leaf(board)
+
+            return self.evaluate(board)
+
+        if depth == 1 and self.batch_leaves:
+            return self.evaluate_children(board, maximizing_player)
+
+        # A search that runs out of time is abandoned, the board it ran on is a copy and is discarded with it
+        if self.deadline is not None and perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+        # Entries are only used for cutoffs at the same depth, so the result is the same as without the table.
+        # A position and its mirror image have the same value and share an entry, whose move is stored for the
+        # position with the lower hash
+        position_hash, mirrored = board.canonical_hash()
+        key = position_hash ^ self.table_keys[maximizing_player]
+        entry = self.transposition_table.probe(key)
+        table_move = None
+
+        if entry is not None:
+            entry_depth, entry_value, bound, table_move = entry
+
+            if mirrored:
+                table_move = board.mirror_move(table_move)
+
+            if entry_depth == depth:
+                if bound == settings.TT_EXACT:
+                    return entry_value
+                elif bound == settings.TT_LOWER_BOUND:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+
+                if alpha >= beta:
+                    return entry_value
+
+        original_alpha, original_beta = alpha, beta
+        moves = self.order_moves(board.all_moves(), depth, maximizing_player, table_move)
+        next_player = self.opposite_player(maximizing_player)
+        best_column = moves[0]
+
+        # AI is looking for the max value that can be gained
+        if maximizing_player == self.color:
+            value = -inf
+
+            for move in moves:
+                board.move(move, maximizing_player)
+                child_value = self.alpha_beta(board, depth - 1, alpha, beta, next_player)
+                board.undo_move(move)
+
+                if child_value > value:
+                    value = child_value
+                    best_column = move
+
+                alpha = max(alpha, value)
+
+                if alpha >= beta:
+                    self.record_cutoff(move, depth, maximizing_player)
+                    break
+
+        # AI is looking for the min value that can be gained from the opposing player
+        else:
+            value = inf
+
+            for move in moves:
+                board.move(move, maximizing_player)
+                child_value = self.alpha_beta(board, depth - 1, alpha, beta, next_player)
+                board.undo_move(move)
+
+                if child_value < value:
+                    value = child_value
+                    best_column = move
+
+                beta = min(beta, value)
+
+                if alpha >= beta:
+                    self.record_cutoff(move, depth, maximizing_player)
+                    break
+
+        if value <= original_alpha:
+            bound = settings.TT_UPPER_BOUND
+        elif value >= original_beta:
+            bound = settings.TT_LOWER_BOUND
+        else:
+            bound = settings.TT_EXACT
+
+        self.transposition_table.store(key, depth, value, bound, board.mirror_move(best_column) if mirrored else best_column)
+
+        return value
+
+    def reset_move_ordering(self) -> None:
+        '''
+        Clears the killer moves and history scores before the search of a new move.
+        '''
+        self.killer_moves = dict()
+        self.history_table = {settings.RED: [0] * (settings.COLS + 1), settings.YELLOW: [0] * (settings.COLS + 1)}
+
+    def order_moves(self, moves, depth, player_color, table_move = None) -> list:
+        '''
+        Returns the moves sorted so that the best move found by an earlier search of the position (table_move) is
+        searched first, then the killer moves of this depth, followed by the moves with the highest history score
+        for player_color, with ties broken by searching center columns first.
+        '''
+        killers = self.killer_moves.get(depth, ())
+        history = self.history_table[player_color]
+
+        return sorted(moves, key=lambda move: (move != table_move, move not in killers, -history[move], self.center_distance[move]))
+
+    def record_cutoff(self, move, depth, player_color) -> None:
+        '''
+        Records a move that caused a cutoff as a killer move for this depth and adds to its history score, so that
+        it is tried earlier in sibling nodes and later searches.
+        '''
+        killers = self.killer_moves.setdefault(depth, [])
+
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+        self.history_table[player_color][move] += depth * depth
+
+        if self.stats is not None:
+            self.stats.cutoffs += 1
+
     def evaluate(self, board):
         '''
         Evaluates the current board state and returns an integer score for that board state.
@@ -111,8 +790,11 @@ class PlayerAI(Player):
         values. The AI is looking for the highest value that can be gained for itself, so the scoring
         is as follows:
 
-        utility: settings.UTILITY_VALUE (138) since the sum of self.evaluation_table is 276 (138 * 2)
+        utility: half the sum of self.evaluation_table, 138 for the standard board since its sum is 276 (138 * 2)
         award: Adds value of self.evaluation_table[i][j] if piece_color is equal to the AI's, subtracts otherwise.
+               The board keeps the sum of these values per piece color, see board.get_score().
+               With settings.THREAT_EVALUATION, the difference of the threat scores of both players is added as well,
+               see ThreatBitBoard.get_threat_score().
 
         This allows an evaluation to lead to:
             < 0 if the opposing player has a better board position
@@ -126,24 +808,75 @@ class PlayerAI(Player):
         Returns:
             An integer: utility + award
         '''
-        utility = settings.UTILITY_VALUE
-        award = 0
+        if self.stats is not None:
+            self.stats.evaluations += 1
 
-        # boards that have a winner() result in the highest gain/loss since they take priority
-        if board.get_winner() == self.color:
-            award += settings.WINNER_AWARD
-        elif board.get_winner() == self.opposite_player(self.color):
-            award -= settings.WINNER_AWARD
+        opposing_color = self.opposite_player(self.color)
+        winning_color = board.get_winner()
 
         # adds/subtracts piece colors on the board depending on their position
-        for i in range(settings.ROWS):
-            for j in range(settings.COLS):
-                if board[i, j] == self.color:
-                    award += self.evaluation_table[i][j]
-                elif board[i, j] == self.opposite_player(self.color):
-                    award -= self.evaluation_table[i][j]
-        
-        return utility + award
+        award = board.get_score(self.color) - board.get_score(opposing_color)
+
+        # boards that have a winner() result in the highest gain/loss since they take priority
+        if winning_color == self.color:
+            award += self.winner_award
+        elif winning_color == opposing_color:
+            award -= self.winner_award
+
+        # open lines and odd/even threats, only tracked by ThreatBitBoards
+        if self.board_class is ThreatBitBoard:
+            award += board.get_threat_score(self.color) - board.get_threat_score(opposing_color)
+
+        return self.utility_value + award
+
+    def evaluate_children(self, board, player_color) -> int:
+        '''
+        Returns the value of a node one move above the leaves, where player_color is to move, by scoring all of its
+        children in one pass with board.child_scores() instead of making each move and calling evaluate() on it.
+        Children that end the game fall back to evaluate() since they need the winner award.
+
+        Returns:
+            The max of the children's evaluations if player_color is the AI's, the min otherwise. This is the exact
+            value alpha_beta() would find at depth 1.
+        '''
+        own_score = board.get_score(self.color)
+        opposing_score = board.get_score(self.opposite_player(self.color))
+        maximizing = player_color == self.color
+        values = []
+        terminal_children = 0
+
+        for move, score in zip(board.all_moves(), board.child_scores(player_color)):
+            if score is None:
+                board.move(move, player_color)
+                values.append(self.evaluate(board))
+                board.undo_move(move)
+                terminal_children += 1
+            elif maximizing:
+                values.append(self.utility_value + score - opposing_score)
+            else:
+                values.append(self.utility_value + own_score - score)
+
+        self.node_count += len(values)
+
+        # evaluate() already counted the evaluations of the children that end the game
+        if self.stats is not None:
+            self.stats.leaves += len(values)
+            self.stats.evaluations += len(values) - terminal_children
+            self.stats.terminal_hits += terminal_children
+
+        return max(values) if maximizing else min(values)
+
+    def evaluate_batch(self, boards) -> tuple:
+        '''
+        Evaluates many positions at once with NumPy, boards is an (N x ROWS x COLS) array of piece colors
+        (see batch_evaluation.boards_to_array). NumPy is only imported here, the rest of the AI does not need it.
+
+        Returns:
+            A tuple of (scores, winners), two arrays holding what evaluate() and get_winner() give for each board.
+        '''
+        from batch_evaluation import evaluate_batch
+
+        return evaluate_batch(boards, self.color)
 
     def opposite_player(self, color_arg):
         '''
@@ -0,0 +1,64 @@
+from array import array
+import sys
+
+# Initialize settings.py as environment variable
+import os
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+from bitboard import BitBoard
+
+def pack_positions(boards) -> array:
+    '''
+    Returns an array of unsigned 64 bit ints holding the to_key() of every board, 8 bytes per position. Each board
+    only needs to support indexing by (row, column) coords, so both Board and BitBoard objects can be packed.
+    Raises ValueError if the board dimensions need keys of more than 64 bits.
+    '''
+    keys = array('Q')
+
+    for board in boards:
+        key = board.to_key() if isinstance(board, BitBoard) else BitBoard.from_board(board).to_key()
+
+        if key.bit_length() > 64:
+            raise ValueError(f'Position key needs {key.bit_length()} bits, packed positions hold at most 64')
+
+        keys.append(key)
+
+    return keys
+
+def unpack_positions(keys, board_class = BitBoard) -> list:
+    '''
+    Returns a board_class object for every key of keys, the reverse of pack_positions().
+    '''
+    return [board_class.from_key(key) for key in keys]
+
+def write_positions(path, boards) -> int:
+    '''
+    Appends the packed keys of boards to path as little endian unsigned 64 bit ints, the same layout as a
+    numpy.uint64 array, so that the file can be memory mapped by other tools.
+
+    Returns the number of positions written.
+    '''
+    keys = pack_positions(boards)
+
+    if sys.byteorder != 'little':
+        keys.byteswap()
+
+    with open(path, 'ab') as positions_file:
+        keys.tofile(positions_file)
+
+    return len(keys)
+
+def read_positions(path) -> array:
+    '''
+    Returns every key stored in path by write_positions() as an array of unsigned 64 bit ints. Use
+    unpack_positions() to turn them back into boards.
+    '''
+    keys = array('Q')
+
+    with open(path, 'rb') as positions_file:
+        keys.frombytes(positions_file.read())
+
+    if sys.byteorder != 'little':
+        keys.byteswap()
+
+    return keys
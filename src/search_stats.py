@@ -0,0 +1,82 @@
+import json
+
+class SearchStats:
+
+    def __init__(self):
+        '''
+        Initializes a search stats object. PlayerAI fills one of these in for every move when it is created with
+        collect_stats=True, so that depth and time budgets can be tuned from what the search actually did.
+        '''
+        self.move = None
+        self.difficulty = None
+        self.nodes = 0
+        self.leaves = 0
+        self.evaluations = 0
+        self.terminal_hits = 0
+        self.table_probes = 0
+        self.table_hits = 0
+        self.cutoffs = 0
+        # self.depth_times[depth]: seconds spent on the root search of each completed depth
+        self.depth_times = dict()
+        self.elapsed = 0.0
+        # Rollouts of an MCTS move, and the rollouts per second of every worker that searched it
+        self.rollouts = 0
+        self.rollout_rates = []
+
+    def record_leaf(self, board) -> None:
+        '''
+        Counts a leaf of the search, and whether the game was over on it.
+        '''
+        self.leaves += 1
+
+        if board.gameover():
+            self.terminal_hits += 1
+
+    def branching_factor(self) -> float:
+        '''
+        Returns the average number of children searched per interior node, which shows how well moves are
+        ordered since every cutoff lowers it.
+        '''
+        interior_nodes = self.nodes - self.leaves
+
+        if interior_nodes <= 0:
+            return 0.0
+
+        return (self.nodes - 1) / interior_nodes
+
+    def max_depth(self) -> int:
+        '''
+        Returns the deepest completed search depth, or 0 if no depth was completed.
+        '''
+        return max(self.depth_times, default=0)
+
+    def to_record(self) -> dict:
+        '''
+        Returns the stats as a flat dict of JSON serializable values.
+        '''
+        return {
+            'move': self.move,
+            'difficulty': self.difficulty,
+            'nodes': self.nodes,
+            'leaves': self.leaves,
+            'evaluations': self.evaluations,
+            'terminal_hits': self.terminal_hits,
+            'table_probes': self.table_probes,
+            'table_hits': self.table_hits,
+            'cutoffs': self.cutoffs,
+            'branching_factor': self.branching_factor(),
+            'max_depth': self.max_depth(),
+            'depth_ms': {str(depth): time * 1000 for depth, time in self.depth_times.items()},
+            'elapsed_ms': self.elapsed * 1000,
+            'nodes_per_sec': self.nodes / self.elapsed if self.elapsed else 0.0,
+            'rollouts': self.rollouts,
+            'worker_rollouts_per_sec': self.rollout_rates,
+        }
+
+def write_records(path, stats) -> None:
+    '''
+    Appends the record of every SearchStats in stats to path as one JSON object per line.
+    '''
+    with open(path, 'a') as records_file:
+        for search_stats in stats:
+            records_file.write(json.dumps(search_stats.to_record()) + '\n')
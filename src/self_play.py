@@ -0,0 +1,174 @@
+from python_settings import settings
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+import argparse
+import json
+import random
+
+# Initialize settings.py as environment variable
+import os
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+from bitboard import BitBoard
+from player_ai import PlayerAI
+
+def play_game(red_config, yellow_config, first_color, seed, opening_moves = 0) -> dict:
+    '''
+    Plays a single AI vs AI game on a BitBoard without any output. red_config and yellow_config are the keyword
+    arguments of each PlayerAI (e.g: {'difficulty': settings.MEDIUM, 'max_depth': 4}), and seed seeds the random
+    moves of the game so that it can be replayed. The game starts with opening_moves random moves, the search
+    difficulties always play the same game from the same position, so the opening is what makes their games differ.
+
+    Returns a dict with the winning color (None for a tie), the number of moves including the opening, the opening
+    as a string of columns and the time of every move the AIs made in seconds per color.
+    '''
+    random.seed(seed)
+    board = BitBoard()
+    players = {
+        settings.RED: PlayerAI(settings.RED, **red_config),
+        settings.YELLOW: PlayerAI(settings.YELLOW, **yellow_config),
+    }
+    move_times = {settings.RED: [], settings.YELLOW: []}
+    color = first_color
+    opening = ''
+
+    while len(opening) < opening_moves and not board.gameover():
+        player_move = random.choice(board.all_moves())
+        board.move(player_move, color)
+        opening += str(player_move)
+        color = settings.YELLOW if color == settings.RED else settings.RED
+
+    while not board.gameover():
+        start = perf_counter()
+        player_move = players[color].get_column(board=board)
+
+        while not board.valid_column(player_move):
+            player_move = players[color].get_column(board=board)
+
+        move_times[color].append(perf_counter() - start)
+        board.move(player_move, color)
+        color = settings.YELLOW if color == settings.RED else settings.RED
+
+    for player in players.values():
+        player.close()
+
+    return {'winner': board.get_winner(), 'moves': board.moves_played, 'opening': opening, 'move_times': move_times}
+
+def percentile(values, fraction) -> float:
+    '''
+    Returns the value below which fraction of the sorted values fall, using the nearest rank.
+    '''
+    if not values:
+        return 0.0
+
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+class SelfPlay:
+
+    def __init__(self, red_config, yellow_config, games, first_color = None, seed = 0, workers = 1,
+                 opening_moves = settings.SELF_PLAY_OPENING_MOVES):
+        '''
+        Initializes a self play object, which plays games between two AI configurations without any I/O and
+        aggregates their results. This is used to regression test evaluation and search changes.
+
+        first_color is the color that moves first in every game, or None to alternate starting with RED.
+        Game i is played with seed + i, so a run with the same arguments plays the same games, and starts with
+        opening_moves random moves drawn from its seed, see play_game().
+        Games are spread across workers processes when there is more than one worker.
+        '''
+        self.red_config = red_config
+        self.yellow_config = yellow_config
+        self.games = games
+        self.first_color = first_color
+        self.seed = seed
+        self.workers = workers
+        self.opening_moves = opening_moves
+
+    def run(self) -> dict:
+        '''
+        Plays every game and returns the aggregate results.
+        '''
+        red_configs = [self.red_config] * self.games
+        yellow_configs = [self.yellow_config] * self.games
+        first_colors = [self.get_first_color(i) for i in range(self.games)]
+        seeds = [self.seed + i for i in range(self.games)]
+        opening_moves = [self.opening_moves] * self.games
+
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                chunksize = max(1, self.games // (self.workers * 4))
+                results = list(executor.map(play_game, red_configs, yellow_configs, first_colors, seeds, opening_moves,
+                                            chunksize=chunksize))
+        else:
+            results = list(map(play_game, red_configs, yellow_configs, first_colors, seeds, opening_moves))
+
+        return self.aggregate(results, first_colors)
+
+    def aggregate(self, results, first_colors) -> dict:
+        '''
+        Returns the win, draw and first mover rates of the game results together with the number of moves per game,
+        the number of different openings and percentiles of the time per move of each color in milliseconds.
+        '''
+        games = len(results)
+        red_wins = sum(1 for result in results if result['winner'] == settings.RED)
+        yellow_wins = sum(1 for result in results if result['winner'] == settings.YELLOW)
+        first_mover_wins = sum(1 for result, first_color in zip(results, first_colors) if result['winner'] == first_color)
+        summary = {
+            'games': games,
+            'red_wins': red_wins,
+            'yellow_wins': yellow_wins,
+            'draws': games - red_wins - yellow_wins,
+            'red_win_rate': red_wins / games if games else 0.0,
+            'yellow_win_rate': yellow_wins / games if games else 0.0,
+            'draw_rate': (games - red_wins - yellow_wins) / games if games else 0.0,
+            'first_mover_win_rate': first_mover_wins / games if games else 0.0,
+            'average_moves': sum(result['moves'] for result in results) / games if games else 0.0,
+            'openings': len({(result['opening'], first_color) for result, first_color in zip(results, first_colors)}),
+        }
+
+        for color, name in ((settings.RED, 'red'), (settings.YELLOW, 'yellow')):
+            move_times = sorted(time * 1000 for result in results for time in result['move_times'][color])
+            summary[f'{name}_move_ms'] = {
+                'moves': len(move_times),
+                'mean': sum(move_times) / len(move_times) if move_times else 0.0,
+                'p50': percentile(move_times, 0.50),
+                'p95': percentile(move_times, 0.95),
+                'p99': percentile(move_times, 0.99),
+                'max': move_times[-1] if move_times else 0.0,
+            }
+
+        return summary
+
+    def get_first_color(self, game) -> int:
+        '''
+        Returns the color that moves first in the game with index game.
+        '''
+        if self.first_color is not None:
+            return self.first_color
+
+        return settings.RED if game % 2 == 0 else settings.YELLOW
+
+def main():
+    parser = argparse.ArgumentParser(description='Plays AI vs AI Connect Four games and prints aggregate results.')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--red-difficulty', type=int, default=settings.MEDIUM)
+    parser.add_argument('--yellow-difficulty', type=int, default=settings.MEDIUM)
+    parser.add_argument('--red-depth', type=int, default=settings.MAX_DEPTH)
+    parser.add_argument('--yellow-depth', type=int, default=settings.MAX_DEPTH)
+    parser.add_argument('--first', choices=['red', 'yellow', 'alternate'], default='alternate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--opening-moves', type=int, default=settings.SELF_PLAY_OPENING_MOVES)
+    args = parser.parse_args()
+
+    first_colors = {'red': settings.RED, 'yellow': settings.YELLOW, 'alternate': None}
+    self_play = SelfPlay(
+        {'difficulty': args.red_difficulty, 'max_depth': args.red_depth},
+        {'difficulty': args.yellow_difficulty, 'max_depth': args.yellow_depth},
+        args.games, first_colors[args.first], args.seed, args.workers, args.opening_moves,
+    )
+
+    print(json.dumps(self_play.run(), indent=2))
+
+if __name__ == '__main__':
+    main()
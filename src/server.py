@@ -0,0 +1,335 @@
+from python_settings import settings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from time import perf_counter
+import argparse
+import asyncio
+import json
+
+# Initialize settings.py as environment variable
+import os
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+from connect_four import ConnectFour
+from game_events import ConsoleObserver
+from player_ai import PlayerAI
+from self_play import percentile
+
+# AIs of the sessions whose moves were searched by this worker process, keyed by (server key, session id) and kept
+# between moves so their tables and trees carry over. The least recently used are dropped past
+# settings.SERVER_WORKER_PLAYERS, which bounds the memory of every worker process
+worker_players = OrderedDict()
+
+def search_session_move(session_key, color, ai_options, board) -> tuple:
+    '''
+    Runs in a worker process of GameServer.executor. Returns a tuple of (column, seconds) with the column of the
+    move chosen by the session's AI for board and the time its search took.
+    '''
+    if session_key not in worker_players:
+        worker_players[session_key] = PlayerAI(color, **ai_options)
+
+        if len(worker_players) > settings.SERVER_WORKER_PLAYERS:
+            worker_players.popitem(last=False)[1].close()
+
+    worker_players.move_to_end(session_key)
+    start = perf_counter()
+    column = worker_players[session_key].get_column(board=board)
+
+    return column, perf_counter() - start
+
+class GameSession:
+
+    def __init__(self, session_id, ai_options = None):
+        '''
+        Initializes a game session object. A session is one human vs AI ConnectFour game hosted by the server, the
+        messages the game would print are collected and sent to the client with the next response instead.
+        The AI's moves are searched by the server in its worker processes, see GameServer.run_ai_turn(), so the
+        game's AI is a REMOTE_AI_PLAYER without any tables of its own.
+        '''
+        self.session_id = session_id
+        self.ai_options = ai_options if ai_options is not None else dict()
+        self.messages = []
+        observer = ConsoleObserver(self.messages.append)
+        self.connect_four = ConnectFour(settings.HUMAN_PLAYER, settings.REMOTE_AI_PLAYER, observer)
+        # Requests of a session are handled one at a time, while requests of other sessions keep being served
+        self.lock = asyncio.Lock()
+        # self.latencies[kind]: seconds taken by every request ('request') and AI move search ('search')
+        self.latencies = {'request': [], 'search': []}
+
+    def ai_turn(self, column, search_time) -> int:
+        '''
+        Makes the AI's move in column, which was searched in search_time seconds, and ends its turn.
+
+        Returns the column (starting at 1) of the move made.
+        '''
+        self.latencies['search'].append(search_time)
+        self.connect_four.submit_column(column)
+        self.finish_game()
+
+        return column
+
+    def human_turn(self, player_move) -> bool:
+        '''
+        Makes the human's move, returns False if it is not their turn or the move is not valid.
+        '''
+        if self.ai_to_move():
+            return False
+
+        made = self.connect_four.submit_move(str(player_move))
+        self.finish_game()
+
+        return made
+
+    def finish_game(self) -> None:
+        '''
+        Announces the result once the game is over.
+        '''
+        if self.connect_four.gameover:
+            self.connect_four.display_game_results()
+
+    def restart(self) -> None:
+        '''
+        Starts a new game in the session, the win counts are kept.
+        '''
+        self.connect_four.restart()
+
+    def ai_to_move(self) -> bool:
+        '''
+        Returns True if the game is not over and it is the AI's turn.
+        '''
+        return not self.connect_four.gameover and self.connect_four.current_turn_player == self.connect_four.player2
+
+    # ===== Get Methods ===== #
+    def get_state(self) -> dict:
+        '''
+        Returns the state of the game as a JSON serializable dict, together with the messages of the game since
+        the last call.
+        '''
+        connect_four = self.connect_four
+        winner = connect_four.get_last_winner() if connect_four.gameover else None
+        state = {
+            'session': self.session_id,
+            'board': [row.copy() for row in connect_four.board.board],
+            'moves': ''.join(str(player_move) for player_move, _ in connect_four.board.move_stack),
+            'turn': 'ai' if self.ai_to_move() else ('human' if not connect_four.gameover else None),
+            'gameover': connect_four.gameover,
+            'tie': connect_four.tie,
+            'winner': None if winner is None else ('human' if winner == connect_four.player1 else 'ai'),
+            'wins': {'human': connect_four.player1.get_wins(), 'ai': connect_four.player2.get_wins()},
+            'messages': self.messages.copy(),
+        }
+        self.messages.clear()
+
+        return state
+
+    def get_latency(self) -> dict:
+        '''
+        Returns the number of requests and AI searches of the session with their latency percentiles in milliseconds.
+        '''
+        latency = dict()
+
+        for kind, times in self.latencies.items():
+            times = sorted(time * 1000 for time in times)
+            latency[kind] = {
+                'count': len(times),
+                'mean': sum(times) / len(times) if times else 0.0,
+                'p50': percentile(times, 0.50),
+                'p95': percentile(times, 0.95),
+                'max': times[-1] if times else 0.0,
+            }
+
+        return latency
+
+class GameServer:
+
+    def __init__(self, workers = 4, ai_options = None):
+        '''
+        Initializes a game server object. The server hosts any number of GameSessions over a line-delimited JSON
+        protocol, every request is one JSON object on its own line and gets exactly one JSON object line back:
+            {"command": "new"}                                  starts a session, "difficulty" is optional and has to
+                                                                be one of settings.DIFFICULTIES
+            {"command": "move", "session": id, "column": 4}     makes the human's move, the AI answers in the response
+            {"command": "state", "session": id}                 returns the state of the game
+            {"command": "restart", "session": id}               starts a new game in the session
+            {"command": "latency", "session": id}               returns the latency stats of the session
+            {"command": "close", "session": id}                 ends the session
+
+        AI moves are searched in a pool of workers processes so that a slow search never blocks the event loop or
+        slows the searches of other sessions, they keep being served while it runs. With more concurrent searches
+        than workers the extra searches wait for a free worker. A request that fails unexpectedly gets an "error" response
+        and the connection stays open.
+        '''
+        self.ai_options = ai_options if ai_options is not None else dict()
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        # Tells the sessions of this server apart from those of other servers in the worker processes
+        self.server_key = id(self)
+        self.sessions = dict()
+        self.session_ids = count(1)
+        self.commands = {
+            'new': self.new_session,
+            'move': self.move,
+            'state': self.state,
+            'restart': self.restart,
+            'latency': self.latency,
+            'close': self.close_session,
+        }
+
+    async def handle_client(self, reader, writer) -> None:
+        '''
+        Serves the requests of a connected client until it disconnects.
+        '''
+        try:
+            while True:
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                try:
+                    response = await self.handle_request(line)
+                except Exception as error:
+                    # A request that fails unexpectedly gets an error response, the connection keeps being served
+                    response = {'ok': False, 'error': f'internal error: {type(error).__name__}'}
+
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line) -> dict:
+        '''
+        Returns the response to the request line. Invalid requests get a response with an "error" instead.
+        '''
+        start = perf_counter()
+
+        try:
+            request = json.loads(line)
+            command = self.commands[request['command']]
+
+            if command != self.new_session and request.get('session') not in self.sessions:
+                return {'ok': False, 'error': 'unknown session'}
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return {'ok': False, 'error': 'invalid request'}
+
+        response = await command(request)
+        session = self.sessions.get(response.get('session'))
+
+        if session is not None:
+            session.latencies['request'].append(perf_counter() - start)
+
+        return response
+
+    # ===== Commands ===== #
+    async def new_session(self, request) -> dict:
+        ai_options = dict(self.ai_options)
+
+        if 'difficulty' in request:
+            difficulty = request['difficulty']
+
+            if not isinstance(difficulty, int) or isinstance(difficulty, bool) or difficulty not in settings.DIFFICULTIES:
+                return {'ok': False, 'error': 'invalid difficulty'}
+
+            ai_options['difficulty'] = difficulty
+
+        session_id = next(self.session_ids)
+        session = GameSession(session_id, ai_options)
+        self.sessions[session_id] = session
+
+        async with session.lock:
+            if session.ai_to_move():
+                await self.run_ai_turn(session)
+
+            return {'ok': True, **session.get_state()}
+
+    async def move(self, request) -> dict:
+        session = self.sessions[request['session']]
+
+        async with session.lock:
+            if not session.human_turn(request.get('column')):
+                return {'ok': False, 'error': 'invalid move', **session.get_state()}
+
+            ai_move = await self.run_ai_turn(session) if session.ai_to_move() else None
+
+            return {'ok': True, 'ai_move': ai_move, **session.get_state()}
+
+    async def state(self, request) -> dict:
+        session = self.sessions[request['session']]
+
+        async with session.lock:
+            return {'ok': True, **session.get_state()}
+
+    async def restart(self, request) -> dict:
+        session = self.sessions[request['session']]
+
+        async with session.lock:
+            session.restart()
+            ai_move = await self.run_ai_turn(session) if session.ai_to_move() else None
+
+            return {'ok': True, 'ai_move': ai_move, **session.get_state()}
+
+    async def latency(self, request) -> dict:
+        session = self.sessions[request['session']]
+
+        return {'ok': True, 'session': session.session_id, 'latency': session.get_latency()}
+
+    async def close_session(self, request) -> dict:
+        session = self.sessions.pop(request['session'])
+
+        return {'ok': True, 'session': session.session_id, 'latency': session.get_latency()}
+
+    async def run_ai_turn(self, session) -> int:
+        '''
+        Searches the AI's move of the session in the executor, makes it and returns its column.
+        '''
+        connect_four = session.connect_four
+        column, search_time = await asyncio.get_running_loop().run_in_executor(
+            self.executor, search_session_move, (self.server_key, session.session_id),
+            connect_four.player2.get_color(), session.ai_options, connect_four.board)
+
+        return session.ai_turn(column, search_time)
+
+    # ===== Serving ===== #
+    async def start(self, host = '127.0.0.1', port = 8765, path = None) -> asyncio.AbstractServer:
+        '''
+        Starts listening on a Unix socket at path, or on host:port when no path is given.
+        '''
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path=path)
+
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def close(self) -> None:
+        '''
+        Shuts the executor down, waiting for searches that are still running.
+        '''
+        self.executor.shutdown()
+
+async def serve(game_server, host, port, path) -> None:
+    server = await game_server.start(host, port, path)
+
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description='Hosts Connect Four games against the AI over line-delimited JSON.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='listens on this Unix socket path instead of TCP')
+    parser.add_argument('--workers', type=int, default=4, help='processes that search AI moves')
+    parser.add_argument('--difficulty', type=int, default=settings.MEDIUM)
+    args = parser.parse_args()
+
+    game_server = GameServer(args.workers, {'difficulty': args.difficulty})
+
+    try:
+        asyncio.run(serve(game_server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        game_server.close()
+
+if __name__ == '__main__':
+    main()
@@ -4,11 +4,15 @@ RED = 1
 YELLOW = 2
 ROWS = 6
 COLS = 7
+# Number of pieces in a row that win the game
+CONNECT = 4
 INVALID_COLUMN = -1
 
 # Human or AI Identifiers
 HUMAN_PLAYER = 1
 AI_PLAYER = 2
+# An AI whose moves are searched elsewhere and submitted to the game, like the AIs of the game server's sessions
+REMOTE_AI_PLAYER = 3
 HUMAN_STR = "HUMAN"
 AI_STR = "AI"
 
@@ -16,8 +20,73 @@ AI_STR = "AI"
 EASY = 1
 MEDIUM = 2
 HARD = 3
+PERFECT = 4
+# Monte Carlo tree search, its strength follows its iteration and time budgets rather than a search depth
+MCTS = 5
+DIFFICULTIES = (EASY, MEDIUM, HARD, PERFECT, MCTS)
+
+# AI Search Modes
+MINIMAX_SEARCH = 1
+ALPHA_BETA_SEARCH = 2
+# Scores every child of the nodes one move above the leaves in a single pass instead of searching them one by one
+BATCH_LEAF_EVALUATION = True
+
+# AI Evaluation Modes
+# Positional scores pieces by the evaluation table, threat also scores open lines and odd/even threats
+POSITIONAL_EVALUATION = 1
+THREAT_EVALUATION = 2
+EVALUATION = POSITIONAL_EVALUATION
+
+# Looks for immediate wins, forced blocks and moves that give the opponent an immediate win before searching
+TACTICAL_CHECK = True
+
+# Transposition Table Constants
+TT_MAX_ENTRIES = 1 << 18
+TT_DEPTH_PREFERRED = 1
+TT_LRU = 2
+TT_EXACT = 0
+TT_LOWER_BOUND = 1
+TT_UPPER_BOUND = 2
+ZOBRIST_SEED = 20200601
+
+# Parallel Search Constants
+SEARCH_WORKERS = 1
+# AIs kept by every search process of the game server, one per session. Every AI holds its transposition table
+# (about 4 MB) and an MCTS AI its node pool as well (about 23 MB), so a process can grow to about 8 * 27 MB
+SERVER_WORKER_PLAYERS = 8
+
+# Iterative Deepening Constants
+HARD_TIME_BUDGET_MS = 1000
+
+# Monte Carlo Tree Search Constants
+MCTS_ITERATIONS = 20000
+MCTS_TIME_BUDGET_MS = 1000
+MCTS_MAX_NODES = 1 << 20
+MCTS_EXPLORATION = 1.4
+
+# Solver Constants
+# Positions with fewer pieces that are not covered by the opening book are searched like HARD instead of solved
+SOLVER_MIN_MOVES = 18
+# Share of the HARD time budget a PERFECT move gives the solver before falling back to the HARD search
+SOLVER_BUDGET_SHARE = 0.5
+OPENING_BOOK_PATH = None
+
+# Move Cache Constants
+# File that keeps searched moves across restarts and worker processes, None to not use one
+MOVE_CACHE_PATH = None
+MOVE_CACHE_SLOTS = 1 << 20
+
+# Self Play Constants
+# Random moves played at the start of every self play game, so that games with different seeds differ even when
+# neither AI makes random moves
+SELF_PLAY_OPENING_MOVES = 2
 
 # Minimax/Evaluation Constants
-MAX_DEPTH = 4
-UTILITY_VALUE = 138
-WINNER_AWARD = 10000000
\ No newline at end of file
+MAX_DEPTH = 6
+WINNER_AWARD = 10000000
+# Threat evaluation values, see ThreatBitBoard.get_threat_score()
+OPEN_TWO_VALUE = 2
+OPEN_THREE_VALUE = 10
+ODD_EVEN_THREAT_VALUE = 20
+
+# The evaluation table and utility value follow from ROWS, COLS and CONNECT, see geometry.evaluation_table()
\ No newline at end of file
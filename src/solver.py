@@ -0,0 +1,297 @@
+from python_settings import settings
+from time import perf_counter
+from transposition_table import TranspositionTable
+from bitboard import mirror_columns
+from geometry import winning_slots
+
+class SolverTimeout(Exception):
+    '''
+    Raised inside the solver's search when its deadline passes.
+    '''
+    pass
+
+class Solver:
+
+    def __init__(self, transposition_table = None, opening_book = None):
+        '''
+        Initializes a solver object. The solver computes the exact game theoretical value of a position, assuming
+        both players play perfectly from there on, with a negamax search that only ever uses null windows.
+
+        Scores are given for the player to move:
+            > 0 if they win, the sooner the win the higher the score
+            == 0 if the game ends in a tie
+            < 0 if they lose, the later the loss the closer to 0 the score
+
+        A win made with the piece that fills the board up to n pieces scores (ROWS * COLS + 2 - n) // 2, see
+        plies_to_end() to get the distance back. Positions are stored in the transposition table by their
+        position + mask key, which is unique, or the key of their mirror image when it is lower since both have
+        the same score. The search carries the mirror image along with the position, so it never has to reverse
+        the columns of a key. The opening book (if any) is consulted before searching.
+        '''
+        self.rows = settings.ROWS
+        self.cols = settings.COLS
+        self.connect = settings.CONNECT
+        self.size = self.rows * self.cols
+        self.column_height = self.rows + 1
+        self.bottom_mask = sum(1 << (i * self.column_height) for i in range(self.cols))
+        self.board_mask = self.bottom_mask * ((1 << self.rows) - 1)
+        # self.column_masks[i]: every playable bit of column i, self.column_order: columns from the center outwards
+        self.column_masks = [((1 << self.rows) - 1) << (i * self.column_height) for i in range(self.cols)]
+        self.column_order = sorted(range(self.cols), key=lambda i: abs(2 * i - self.cols + 1))
+        # self.mirror_moves[move]: the move mirrored about the center column, for every single bit move
+        self.mirror_moves = {1 << bit: 1 << mirror_columns(1 << bit, self.cols, self.column_height).bit_length() - 1
+                             for bit in range(self.column_height * self.cols)}
+
+        self.transposition_table = transposition_table if transposition_table is not None else TranspositionTable()
+        self.opening_book = opening_book
+        self.node_count = 0
+        # self.deadline: perf_counter() time at which the search raises SolverTimeout, None to search until solved.
+        # Only whole nodes are stored in the transposition table, so its entries stay exact after a timeout
+        self.deadline = None
+
+    # ===== Solving ===== #
+    def solve(self, board, player_color) -> int:
+        '''
+        Returns the exact score of the BitBoard board for player_color, who is the player to move.
+        '''
+        pieces = board.pieces[player_color]
+        mask = board.pieces[settings.RED] | board.pieces[settings.YELLOW]
+
+        return self.solve_position(pieces, mask, board.moves_played)
+
+    def solve_position(self, position, mask, moves) -> int:
+        '''
+        Returns the exact score of the position, where position holds the pieces of the player to move and mask holds
+        every piece on the board. The score is narrowed down by repeated null window searches, each of which only
+        answers whether the score is above a guess, since those searches cut off the most.
+        '''
+        if self.can_win_next(position, mask):
+            return (self.size + 1 - moves) // 2
+
+        book_score = self.book_lookup(position, mask, moves)
+
+        if book_score is not None:
+            return book_score
+
+        mirror_position = mirror_columns(position, self.cols, self.column_height)
+        mirror_mask = mirror_columns(mask, self.cols, self.column_height)
+        low = -((self.size - moves) // 2)
+        high = (self.size + 1 - moves) // 2
+
+        while low < high:
+            guess = low + (high - low) // 2
+
+            # Guesses are pulled towards 0 since most positions are close to a draw
+            if guess <= 0 and int(low / 2) < guess:
+                guess = int(low / 2)
+            elif guess >= 0 and int(high / 2) > guess:
+                guess = int(high / 2)
+
+            score = self.negamax(position, mask, mirror_position, mirror_mask, moves, guess, guess + 1)
+
+            if score <= guess:
+                high = score
+            else:
+                low = score
+
+        return low
+
+    def negamax(self, position, mask, mirror_position, mirror_mask, moves, alpha, beta) -> int:
+        '''
+        Negamax search of a position in which the player to move can not win with their next move. Only moves that
+        do not let the opponent win right away are searched, and the score range of the position is narrowed by
+        the fewest and most moves left in the game, as well as by the upper bound stored in the transposition table.
+        mirror_position and mirror_mask are position and mask mirrored about the center column.
+
+        Returns:
+            An integer equal to the score of the position when it lies between alpha and beta, otherwise a bound
+            on the same side of the window as the score.
+        '''
+        self.node_count += 1
+
+        if self.deadline is not None and self.node_count & 1023 == 0 and perf_counter() > self.deadline:
+            raise SolverTimeout()
+
+        non_losing_moves = self.possible_non_losing_moves(position, mask)
+
+        if non_losing_moves == 0:
+            return -((self.size - moves) // 2)
+
+        if moves >= self.size - 2:
+            return 0
+
+        # The opponent can not win with their next move, so the lowest score is losing two moves later
+        low = -((self.size - 2 - moves) // 2)
+
+        if alpha < low:
+            alpha = low
+
+            if alpha >= beta:
+                return alpha
+
+        # The player can not win with their next move either
+        high = (self.size - 1 - moves) // 2
+        key = position + mask
+        mirror_key = mirror_position + mirror_mask
+
+        if mirror_key < key:
+            key = mirror_key
+
+        entry = self.transposition_table.probe(key)
+
+        if entry is not None:
+            high = entry[1]
+
+        if beta > high:
+            beta = high
+
+            if alpha >= beta:
+                return beta
+
+        for move in self.order_moves(position, mask, non_losing_moves):
+            score = -self.negamax(position ^ mask, mask | move, mirror_position ^ mirror_mask,
+                                  mirror_mask | self.mirror_moves[move], moves + 1, -beta, -alpha)
+
+            if score >= beta:
+                return score
+
+            if score > alpha:
+                alpha = score
+
+        self.transposition_table.store(key, self.size - moves, alpha, settings.TT_UPPER_BOUND, None)
+
+        return alpha
+
+    def best_move(self, board, player_color, deadline = None) -> int:
+        '''
+        Returns the column (starting at 1) of the move with the highest score for player_color on the BitBoard board,
+        preferring center columns between equal scores, or -1 if there is no move. Raises SolverTimeout if the
+        perf_counter() deadline passes before every move is solved.
+        '''
+        self.deadline = deadline
+
+        try:
+            return self.solve_best_move(board, player_color)
+        finally:
+            self.deadline = None
+
+    def solve_best_move(self, board, player_color) -> int:
+        '''
+        Returns the move of best_move() without a deadline.
+        '''
+        pieces = board.pieces[player_color]
+        mask = board.pieces[settings.RED] | board.pieces[settings.YELLOW]
+        possible = self.possible(mask)
+        best_score = None
+        best_column = -1
+
+        for i in self.column_order:
+            move = possible & self.column_masks[i]
+
+            if not move:
+                continue
+
+            if self.winning_position(pieces, mask) & move:
+                return i + 1
+
+            score = -self.solve_position(pieces ^ mask, mask | move, board.moves_played + 1)
+
+            if best_score is None or score > best_score:
+                best_score = score
+                best_column = i + 1
+
+        return best_column
+
+    def plies_to_end(self, score, moves) -> int or None:
+        '''
+        Returns the number of moves left until the game is won by either player, given the score of a position with
+        moves pieces on the board, or None if the score is a tie.
+        '''
+        if score == 0:
+            return None
+
+        # The winning piece fills the board up to one of these two counts, the parity tells which player placed it
+        pieces_at_win = self.size + 2 - 2 * abs(score)
+
+        if (pieces_at_win - moves) % 2 != (1 if score > 0 else 0):
+            pieces_at_win -= 1
+
+        return pieces_at_win - moves
+
+    # ===== Opening Book ===== #
+    def book_lookup(self, position, mask, moves) -> int or None:
+        '''
+        Returns the score of the position stored in the opening book, or None if there is no book or the position
+        is not in it.
+        '''
+        if self.opening_book is None or moves > self.opening_book.get_plies():
+            return None
+
+        return self.opening_book.lookup(self.canonical_key(position, mask))
+
+    def canonical_key(self, position, mask) -> int:
+        '''
+        Returns the lower of the position + mask key of the position and of its mirror image about the center column.
+        Each column of the key only depends on the same column of position and mask, so the key of the mirror image
+        is the key with the order of its columns reversed.
+        '''
+        key = position + mask
+
+        return min(key, mirror_columns(key, self.cols, self.column_height))
+
+    # ===== Move Generation ===== #
+    def possible(self, mask) -> int:
+        '''
+        Returns a bitmask of the lowest free slot of every column that is not full.
+        '''
+        return (mask + self.bottom_mask) & self.board_mask
+
+    def can_win_next(self, position, mask) -> bool:
+        '''
+        Returns a bool:
+            True if the player owning position can make four in a row with their next move.
+            False otherwise.
+        '''
+        return bool(self.winning_position(position, mask) & self.possible(mask))
+
+    def possible_non_losing_moves(self, position, mask) -> int:
+        '''
+        Returns a bitmask of the moves that do not hand the opponent a win with their next move. If the opponent has
+        a winning move, it has to be blocked, and if they have two there is nothing to play.
+        '''
+        possible_mask = self.possible(mask)
+        opponent_win = self.winning_position(position ^ mask, mask)
+        forced_moves = possible_mask & opponent_win
+
+        if forced_moves:
+            if forced_moves & (forced_moves - 1):
+                return 0
+
+            possible_mask = forced_moves
+
+        # Playing directly below a slot the opponent wins with lets them play there
+        return possible_mask & ~(opponent_win >> 1)
+
+    def order_moves(self, position, mask, moves_mask) -> list:
+        '''
+        Returns the moves of moves_mask as single bit masks, sorted so that the moves creating the most winning
+        slots for the player are searched first, with ties broken by searching center columns first.
+        '''
+        scored_moves = []
+
+        for i in self.column_order:
+            move = moves_mask & self.column_masks[i]
+
+            if move:
+                scored_moves.append((-bin(self.winning_position(position | move, mask)).count('1'), len(scored_moves), move))
+
+        scored_moves.sort()
+
+        return [move for _, _, move in scored_moves]
+
+    def winning_position(self, position, mask) -> int:
+        '''
+        Returns a bitmask of the free slots that would complete settings.CONNECT in a row for the player owning position,
+        including slots that can not be played yet.
+        '''
+        return winning_slots(position, self.column_height, self.connect) & (self.board_mask ^ mask)
@@ -0,0 +1,149 @@
+from python_settings import settings
+from bitboard import BitBoard
+from geometry import winning_lines, winning_slots
+
+class ThreatBitBoard(BitBoard):
+
+    def __init__(self):
+        '''
+        Initializes a threat bitboard object. This is a BitBoard that also keeps, for every winning line, how many
+        pieces each color has on it, and for each color how many lines it holds 1, 2, 3... pieces of without any
+        opposing piece (open lines). Only the lines through the slot of a move are updated when it is made or taken
+        back, so PlayerAI can score open 2s and 3s at every leaf without scanning the board. With settings.CONNECT
+        other than four, open 2s and 3s are the open lines two and one pieces short of a win.
+        '''
+        # self.lines[index]: the bits of a winning line, self.cell_lines[bit]: the index of every line through bit
+        self.lines, self.cell_lines = winning_lines()
+        self.board_mask = sum(((1 << settings.ROWS) - 1) << (i * (settings.ROWS + 1)) for i in range(settings.COLS))
+        # self.odd_rows: every bit on the first, third and fifth row from the bottom
+        self.odd_rows = sum(sum(1 << (j * (settings.ROWS + 1) + i) for i in range(0, settings.ROWS, 2))
+                            for j in range(settings.COLS))
+        # Threat values are read once since get_threat_score() is called at every leaf of the search
+        self.open_two_value = settings.OPEN_TWO_VALUE
+        self.open_three_value = settings.OPEN_THREE_VALUE
+        self.odd_even_threat_value = settings.ODD_EVEN_THREAT_VALUE
+        super().__init__()
+
+    def move(self, player_move: int, player_color: int):
+        bit = self.heights[player_move - 1]
+
+        if self.moves_played == 0:
+            self.first_color = player_color
+
+        super().move(player_move, player_color)
+        self._add_to_lines(bit, player_color)
+
+    def undo_move(self, player_move: int):
+        column = self.move_stack[-1] - 1
+        bit = self.heights[column] - 1
+        color = self.colors[0] if self.pieces[self.colors[0]] >> bit & 1 else self.colors[1]
+        self._remove_from_lines(bit, color)
+        super().undo_move(player_move)
+
+        if self.moves_played == 0:
+            self.first_color = None
+
+    # ===== Threat Scoring ===== #
+    def threats(self, player_color: int) -> int:
+        '''
+        Returns a bitmask of the empty slots that would complete a winning line for player_color, including slots
+        that can not be played yet.
+        '''
+        mask = self.pieces[self.colors[0]] | self.pieces[self.colors[1]]
+
+        return winning_slots(self.pieces[player_color], self.column_height, self.connect) & (self.board_mask ^ mask)
+
+    def get_threat_score(self, player_color: int) -> int:
+        '''
+        Returns the threat score of player_color:
+            settings.OPEN_TWO_VALUE for every open line holding 2 of their pieces
+            settings.OPEN_THREE_VALUE for every open line holding 3 of their pieces
+            settings.ODD_EVEN_THREAT_VALUE for every threat on a row of the parity that favours them, which are the odd
+            rows (counted from 1 at the bottom) for the player that moved first and the even rows for the other player.
+            Those are the threats the zugzwang of a full board forces the opponent to let them complete.
+        '''
+        open_lines = self.open_lines[player_color]
+        score = self.open_two_value * open_lines[self.connect - 2] + self.open_three_value * open_lines[self.connect - 1]
+
+        if self.first_color is not None:
+            parity_rows = self.odd_rows if player_color == self.first_color else self.board_mask ^ self.odd_rows
+            score += self.odd_even_threat_value * bin(self.threats(player_color) & parity_rows).count('1')
+
+        return score
+
+    # ===== Line Updates ===== #
+    def _add_to_lines(self, bit: int, player_color: int) -> None:
+        '''
+        Counts a new piece of player_color on bit in every line through it. A line that was open for player_color
+        moves up one count, and the first piece of player_color on a line closes it for the other color.
+        '''
+        opposing_color = self.colors[1] if player_color == self.colors[0] else self.colors[0]
+        own_counts, opposing_counts = self.line_counts[player_color], self.line_counts[opposing_color]
+        own_open, opposing_open = self.open_lines[player_color], self.open_lines[opposing_color]
+
+        for line in self.cell_lines[bit]:
+            own, opposing = own_counts[line], opposing_counts[line]
+
+            if opposing == 0:
+                own_open[own] -= 1
+                own_open[own + 1] += 1
+
+            if own == 0:
+                opposing_open[opposing] -= 1
+
+            own_counts[line] = own + 1
+
+    def _remove_from_lines(self, bit: int, player_color: int) -> None:
+        '''
+        Reverses _add_to_lines() for the piece of player_color on bit.
+        '''
+        opposing_color = self.colors[1] if player_color == self.colors[0] else self.colors[0]
+        own_counts, opposing_counts = self.line_counts[player_color], self.line_counts[opposing_color]
+        own_open, opposing_open = self.open_lines[player_color], self.open_lines[opposing_color]
+
+        for line in self.cell_lines[bit]:
+            own, opposing = own_counts[line] - 1, opposing_counts[line]
+
+            if opposing == 0:
+                own_open[own + 1] -= 1
+                own_open[own] += 1
+
+            if own == 0:
+                opposing_open[opposing] += 1
+
+            own_counts[line] = own
+
+    # ===== Initialization Methods ===== #
+    def initialize_new_board(self) -> list:
+        # self.line_counts[color][line]: number of pieces of color on the line
+        self.line_counts = [None] + [[0] * len(self.lines) for _ in self.colors]
+        # self.open_lines[color][n]: number of lines holding n pieces of color and none of the opposing color
+        self.open_lines = [None] + [[len(self.lines)] + [0] * self.connect for _ in self.colors]
+        # self.first_color: the color that made the first move, None on an empty board or when it is not known
+        self.first_color = None
+
+        return super().initialize_new_board()
+
+    def _place_piece(self, column: int, player_color: int) -> None:
+        bit = self.heights[column]
+        super()._place_piece(column, player_color)
+        self._add_to_lines(bit, player_color)
+
+    def _find_winner(self) -> None:
+        '''
+        Sets winning_color like BitBoard._find_winner(), and first_color when the piece counts tell which color
+        moved first. With equal counts the color to move moved first, which only the caller knows.
+        '''
+        super()._find_winner()
+        first_count, second_count = (bin(self.pieces[color]).count('1') for color in self.colors)
+
+        if first_count != second_count:
+            self.first_color = self.colors[0] if first_count > second_count else self.colors[1]
+
+    # ===== Override Methods ===== #
+    def __deepcopy__(self, memo: dict) -> 'ThreatBitBoard':
+        threat_bitboard = super().__deepcopy__(memo)
+        threat_bitboard.line_counts = [None] + [counts.copy() for counts in self.line_counts[1:]]
+        threat_bitboard.open_lines = [None] + [counts.copy() for counts in self.open_lines[1:]]
+
+        return threat_bitboard
@@ -0,0 +1,115 @@
+from python_settings import settings
+from collections import OrderedDict
+
+# Initialize settings.py as environment variable
+import os
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TranspositionTable:
+
+    # Tables shared by every PlayerAI in the process, see TranspositionTable.shared()
+    shared_tables = dict()
+
+    def __init__(self, max_entries = settings.TT_MAX_ENTRIES, replacement = settings.TT_DEPTH_PREFERRED):
+        '''
+        Initializes a transposition table object. This object caches search results by position hash so that a
+        position reached through different move orders, or again on a later turn, does not have to be searched twice.
+
+        Every entry is a tuple of (depth, value, bound, best_move). At most max_entries entries are kept, which caps the
+        memory of the table. When it is full, replacement decides which entry is kept:
+            TT_DEPTH_PREFERRED: every hash maps to a single slot and an entry only replaces one of a lower depth,
+                                since deeper results were more expensive to compute.
+            TT_LRU: the least recently used entry is evicted.
+        '''
+        self.max_entries = max_entries
+        self.replacement = replacement
+        self.clear()
+
+    def probe(self, key: int) -> tuple or None:
+        '''
+        Returns the (depth, value, bound, best_move) entry stored for the key or None if there is no entry.
+        '''
+        if self.replacement == settings.TT_LRU:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                self.entries.move_to_end(key)
+        else:
+            slot = key % self.max_entries
+            entry = self.entries[slot] if self.keys[slot] == key else None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    def store(self, key: int, depth: int, value: int, bound: int, best_move: int) -> None:
+        '''
+        Stores the result of searching the position with hash key to depth. bound is one of TT_EXACT, TT_LOWER_BOUND or
+        TT_UPPER_BOUND and tells whether value is the exact value of the position or only a bound on it.
+        '''
+        if self.replacement == settings.TT_LRU:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            elif len(self.entries) >= self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+            self.entries[key] = (depth, value, bound, best_move)
+        else:
+            slot = key % self.max_entries
+            stored_key = self.keys[slot]
+
+            if stored_key is not None and stored_key != key:
+                if self.entries[slot][0] > depth:
+                    return
+
+                self.evictions += 1
+
+            self.keys[slot] = key
+            self.entries[slot] = (depth, value, bound, best_move)
+
+        self.stores += 1
+
+    def clear(self) -> None:
+        '''
+        Removes every entry from the table and resets its counters.
+        '''
+        if self.replacement == settings.TT_LRU:
+            self.entries = OrderedDict()
+        else:
+            self.keys = [None] * self.max_entries
+            self.entries = [None] * self.max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    # ===== Get Methods ===== #
+    def get_stats(self) -> dict:
+        '''
+        Returns a dict of the hit, miss, store and eviction counters of the table.
+        '''
+        probes = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / probes if probes else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }
+
+    @classmethod
+    def shared(cls, name = 'default') -> 'TranspositionTable':
+        '''
+        Returns the process wide table registered under name, creating it on first use. Players that use the same
+        shared table keep its entries across games for as long as the process runs.
+        '''
+        if name not in cls.shared_tables:
+            cls.shared_tables[name] = cls()
+
+        return cls.shared_tables[name]
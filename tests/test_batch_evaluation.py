@@ -0,0 +1,58 @@
+import unittest
+import os
+from random import Random
+from python_settings import settings
+from bitboard import BitBoard
+from player_ai import PlayerAI
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+try:
+    import numpy
+    from batch_evaluation import boards_to_array, evaluate_batch
+except ImportError:
+    numpy = None
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestBatchEvaluation(unittest.TestCase):
+    '''
+    Tests the NumPy batch evaluation against PlayerAI.evaluate().
+    '''
+    def setUp(self):
+        random = Random(4)
+        self.boards = []
+
+        for _ in range(200):
+            board = BitBoard()
+            color = settings.RED
+
+            for _ in range(random.randint(0, settings.ROWS * settings.COLS)):
+                if board.gameover():
+                    break
+
+                board.move(random.choice(board.all_moves()), color)
+                color = settings.YELLOW if color == settings.RED else settings.RED
+
+            self.boards.append(board)
+
+    def test_matches_evaluate(self):
+        stacked = boards_to_array(self.boards)
+
+        for color in (settings.RED, settings.YELLOW):
+            player = PlayerAI(color)
+            scores, winners = player.evaluate_batch(stacked)
+
+            for n, board in enumerate(self.boards):
+                self.assertEqual(player.evaluate(board), scores[n])
+                self.assertEqual(board.get_winner() or settings.EMPTY, winners[n])
+
+    def test_shapes(self):
+        scores, winners = evaluate_batch(boards_to_array(self.boards), settings.RED)
+
+        self.assertEqual((len(self.boards),), scores.shape)
+        self.assertEqual((len(self.boards),), winners.shape)
+        self.assertGreater((winners != settings.EMPTY).sum(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
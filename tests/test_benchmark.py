@@ -0,0 +1,30 @@
+import unittest
+import os
+from benchmark import CORPUS, benchmark_player, compare, load_position
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestBenchmark(unittest.TestCase):
+    '''
+    Tests the benchmark corpus and the comparison of benchmark runs.
+    '''
+    def test_corpus(self):
+        for moves in CORPUS:
+            board, color = load_position(moves)
+            self.assertEqual(False, board.gameover())
+            self.assertEqual(len(moves), board.moves_played)
+            # Every corpus position is searched, none is decided by the tactical check
+            self.assertEqual(None, benchmark_player(color).tactical_moves(board)[0])
+
+    def test_compare(self):
+        baseline = {'search_nodes_per_sec': 1000.0, 'search_p95_ms': 10.0, 'evaluate_per_sec': 500.0}
+        current = {'search_nodes_per_sec': 800.0, 'search_p95_ms': 10.5, 'evaluate_per_sec': 900.0}
+        regressions = compare(baseline, current, threshold=0.10)
+
+        self.assertEqual(['search_nodes_per_sec'], [regression[0] for regression in regressions])
+        self.assertAlmostEqual(0.2, regressions[0][3])
+        self.assertEqual([], compare(baseline, baseline))
+
+
+if __name__ == '__main__':
+    unittest.main()
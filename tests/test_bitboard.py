@@ -0,0 +1,208 @@
+import unittest
+import os
+from random import Random
+from copy import deepcopy
+from python_settings import settings
+from board import Board
+from bitboard import BitBoard
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestBitBoard(unittest.TestCase):
+    '''
+    Tests the bitboard object for Connect Four against the behaviour of Board.
+    '''
+    def setUp(self):
+        self.board1 = BitBoard()
+        self.board2 = BitBoard()
+
+    def test_vertical_winner(self):
+        self.board1.move(1, settings.YELLOW)
+        self.board1.move(2, settings.RED)
+        self.board1.move(1, settings.YELLOW)
+        self.board1.move(2, settings.RED)
+        self.assertEqual(False, self.board1.winner())
+
+        self.board1.move(1, settings.RED)
+        self.board1.move(1, settings.RED)
+        self.board1.move(1, settings.RED)
+        self.assertEqual(False, self.board1.winner())
+        self.board1.move(1, settings.RED)
+        self.assertEqual(True, self.board1.winner())
+        self.assertEqual(settings.RED, self.board1.get_winner())
+
+    def test_horizontal_winner(self):
+        for column in range(4, 7):
+            self.board1.move(column, settings.YELLOW)
+            self.assertEqual(False, self.board1.winner())
+
+        self.board1.move(7, settings.YELLOW)
+        self.assertEqual(True, self.board1.winner())
+        self.assertEqual(settings.YELLOW, self.board1.get_winner())
+
+    def test_no_wrap_between_columns(self):
+        # Three pieces at the top of column 1 and one at the bottom of column 2 must not connect
+        for _ in range(3):
+            self.board1.move(1, settings.YELLOW)
+
+        for _ in range(3):
+            self.board1.move(1, settings.RED)
+
+        self.board1.move(2, settings.RED)
+        self.assertEqual(False, self.board1.winner())
+
+    def test_diagonal_winners(self):
+        # Diagonal right towards the top right of the board
+        for column, fillers in ((1, 0), (2, 1), (3, 2), (4, 3)):
+            for _ in range(fillers):
+                self.board1.move(column, settings.YELLOW)
+
+            self.board1.move(column, settings.RED)
+
+        self.assertEqual(settings.RED, self.board1.get_winner())
+
+        # Diagonal left towards the top left of the board
+        for column, fillers in ((7, 0), (6, 1), (5, 2), (4, 3)):
+            for _ in range(fillers):
+                self.board2.move(column, settings.RED)
+
+            self.board2.move(column, settings.YELLOW)
+
+        self.assertEqual(settings.YELLOW, self.board2.get_winner())
+
+    def test_column_available(self):
+        self.assertEqual(5, self.board1.column_available(1))
+        self.assertEqual(5, self.board1.column_available(7))
+
+        for _ in range(settings.ROWS):
+            self.board1.move(3, settings.RED)
+
+        self.assertEqual(settings.INVALID_COLUMN, self.board1.column_available(3))
+        self.assertNotIn(3, self.board1.all_moves())
+        self.assertEqual(False, self.board1.valid_move('3'))
+        self.assertEqual(True, self.board1.valid_move('4'))
+
+    def test_matches_board(self):
+        # Plays random games on both boards and compares every observable attribute after each move
+        random = Random(0)
+
+        for _ in range(50):
+            board = Board()
+            bitboard = BitBoard()
+            color = settings.RED
+
+            while not board.gameover():
+                player_move = random.choice(board.all_moves())
+                board.move(player_move, color)
+                bitboard.move(player_move, color)
+                color = settings.YELLOW if color == settings.RED else settings.RED
+
+                self.assertEqual(board.winner(), bitboard.winner())
+                self.assertEqual(board.tie(), bitboard.tie())
+                self.assertEqual(board.all_moves(), bitboard.all_moves())
+                self.assertEqual(sum(1 << (column - 1) for column in board.all_moves()), board.open_columns)
+                self.assertEqual(board.open_columns, bitboard.open_columns)
+                self.assertEqual(repr(board), repr(bitboard))
+                self.assertEqual(board.get_score(settings.RED), bitboard.get_score(settings.RED))
+                self.assertEqual(board.get_score(settings.YELLOW), bitboard.get_score(settings.YELLOW))
+
+                for column in range(1, settings.COLS + 1):
+                    self.assertEqual(board.column_available(column), bitboard.column_available(column))
+
+            self.assertEqual(board.get_winner(), bitboard.get_winner())
+            self.assertEqual(board.get_winner(), BitBoard.from_board(board).get_winner())
+            self.assertEqual(repr(board), repr(BitBoard.from_board(board)))
+            self.assertEqual(board.open_columns, BitBoard.from_board(board).open_columns)
+            self.assertEqual(board.open_columns, Board.from_key(board.to_key()).open_columns)
+
+    def test_undo_move(self):
+        # Makes and unmakes every move of random games and checks the board is restored after each undo
+        random = Random(1)
+
+        for _ in range(20):
+            color = settings.RED
+            self.board1.initialize_new_board()
+
+            while not self.board1.gameover():
+                before = (repr(self.board1), self.board1.open_columns, self.board1.pieces.copy(), self.board1.scores.copy(), self.board1.hash)
+
+                for player_move in self.board1.all_moves():
+                    self.board1.move(player_move, color)
+                    self.board1.undo_move(player_move)
+
+                    self.assertEqual(None, self.board1.get_winner())
+                    self.assertEqual(before, (repr(self.board1), self.board1.open_columns, self.board1.pieces, self.board1.scores, self.board1.hash))
+
+                self.board1.move(random.choice(self.board1.all_moves()), color)
+                color = settings.YELLOW if color == settings.RED else settings.RED
+
+    def test_deepcopy(self):
+        self.board1.move(4, settings.RED)
+        board_copy = deepcopy(self.board1)
+        board_copy.move(4, settings.YELLOW)
+
+        self.assertEqual(settings.EMPTY, self.board1[4, 3])
+        self.assertEqual(settings.YELLOW, board_copy[4, 3])
+        self.assertEqual(1, self.board1.moves_played)
+
+    def test_key_round_trip(self):
+        # Every position of random games has a unique key that decodes back to the same position
+        random = Random(2)
+        keys = dict()
+
+        for _ in range(20):
+            color = settings.RED
+            self.board1.initialize_new_board()
+
+            while not self.board1.gameover():
+                self.board1.move(random.choice(self.board1.all_moves()), color)
+                color = settings.YELLOW if color == settings.RED else settings.RED
+                key = self.board1.to_key()
+                decoded = BitBoard.from_key(key)
+
+                self.assertLess(key.bit_length(), 64)
+                self.assertEqual(keys.setdefault(key, repr(self.board1)), repr(self.board1))
+                self.assertEqual(repr(self.board1), repr(decoded))
+                self.assertEqual(self.board1.hash, decoded.hash)
+                self.assertEqual(self.board1.get_winner(), decoded.get_winner())
+                self.assertEqual(key, decoded.to_key())
+
+    def test_mirror_hash(self):
+        board = BitBoard.from_move_string('1213')
+        mirrored_board = BitBoard.from_move_string('7675')
+
+        self.assertEqual(board.hash, mirrored_board.mirror_hash)
+        self.assertEqual(board.mirror_hash, mirrored_board.hash)
+        self.assertEqual(board.canonical_hash()[0], mirrored_board.canonical_hash()[0])
+        self.assertNotEqual(board.canonical_hash()[1], mirrored_board.canonical_hash()[1])
+        self.assertEqual(board.canonical_key(), mirrored_board.canonical_key())
+        self.assertEqual(mirrored_board.to_key(), board.mirror(board.to_key()))
+        # The mirror tables are built once and shared by every board of the same size
+        self.assertIs(board.mirror_keys, mirrored_board.mirror_keys)
+
+        board.undo_move(3)
+        mirrored_board.undo_move(5)
+        self.assertEqual(board.hash, mirrored_board.mirror_hash)
+
+    def test_move_string(self):
+        board = BitBoard.from_move_string('4453')
+
+        self.assertEqual('4453', board.to_move_string())
+        self.assertEqual(settings.RED, board[5, 3])
+        self.assertEqual(settings.YELLOW, board[4, 3])
+        self.assertEqual(settings.YELLOW, BitBoard.from_move_string('4', settings.YELLOW)[5, 3])
+
+    def test_initialize_new_board(self):
+        self.board1.move(1, settings.YELLOW)
+        self.board1.move(2, settings.RED)
+        self.board1.initialize_new_board()
+
+        for i in range(settings.ROWS):
+            for j in range(settings.COLS):
+                self.assertEqual(self.board1[i, j], settings.EMPTY)
+
+        self.assertEqual(False, self.board1.gameover())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -165,6 +165,73 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(5, self.board1.column_available(3))
         self.assertEqual(5, self.board1.column_available(7))
 
+    def test_undo_move(self):
+        self.board1.move(1, settings.RED)
+        self.board1.move(1, settings.RED)
+        self.board1.move(1, settings.RED)
+        self.board1.move(1, settings.RED)
+        self.assertEqual(True, self.board1.winner())
+
+        self.board1.undo_move(1)
+        self.assertEqual(None, self.board1.get_winner())
+        self.assertEqual(settings.EMPTY, self.board1.board[2][0])
+        self.assertEqual(settings.RED, self.board1.board[3][0])
+        self.assertEqual(2, self.board1.column_available(1))
+
+    def test_valid_column(self):
+        for row in range(settings.ROWS):
+            self.assertEqual(True, self.board1.valid_column(2))
+            self.board1.move(2, settings.RED if row % 2 == 0 else settings.YELLOW)
+
+        self.assertEqual(False, self.board1.valid_column(2))
+        self.assertEqual(False, self.board1.valid_move('2'))
+        self.assertEqual(True, self.board1.valid_column(1))
+        self.assertEqual(False, self.board1.valid_column(0))
+        self.assertEqual(False, self.board1.valid_column(settings.COLS + 1))
+        self.assertEqual(False, self.board1.valid_move('x'))
+
+        self.board1.undo_move(2)
+        self.assertEqual(True, self.board1.valid_column(2))
+        self.assertEqual(0, self.board1.column_available(2))
+        self.assertEqual(self.board1.heights, Board.from_key(self.board1.to_key()).heights)
+
+    def test_direct_placement(self):
+        # Pieces written straight to the grid count for moves the same as pieces played with move()
+        self.board1.board[5][0] = settings.RED
+        self.board1.board[4][0] = settings.YELLOW
+        self.assertEqual(3, self.board1.column_available(1))
+        self.board1.move(1, settings.RED)
+        self.assertEqual(settings.RED, self.board1.board[3][0])
+
+        for row in range(3):
+            self.board1.board[row][0] = settings.YELLOW
+
+        self.assertEqual(False, self.board1.valid_column(1))
+        self.assertEqual(settings.INVALID_COLUMN, self.board1.column_available(1))
+
+        self.board1.board[0][0] = settings.EMPTY
+        self.assertEqual(True, self.board1.valid_column(1))
+        self.assertEqual(0, self.board1.column_available(1))
+
+        # A floating piece does not fill the slots below it
+        self.board1.board[2][1] = settings.RED
+        self.assertEqual(5, self.board1.column_available(2))
+
+        for row in (5, 4, 3):
+            self.board1.board[row][1] = settings.YELLOW
+
+        self.assertEqual(1, self.board1.column_available(2))
+
+    def test_key_round_trip(self):
+        self.board1.move(4, settings.RED)
+        self.board1.move(4, settings.YELLOW)
+        self.board1.move(3, settings.RED)
+        board = Board.from_key(self.board1.to_key())
+
+        self.assertEqual(repr(self.board1), repr(board))
+        self.assertEqual(self.board1.to_key(), board.to_key())
+        self.assertEqual(4, board.column_available(3))
+
     def test_initialize_new_board(self):
         for i in range(settings.ROWS):
             for j in range(settings.COLS):
@@ -0,0 +1,84 @@
+import unittest
+import os
+from python_settings import settings
+from connect_four import ConnectFour
+from game_events import GameObserver, NullObserver, ConsoleObserver
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class RecordingObserver(GameObserver):
+    '''
+    Observer that records the name of every event it receives.
+    '''
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def first_player_chosen(self, player):
+        self.events.append('first_player_chosen')
+
+    def move_made(self, player, player_move):
+        self.events.append('move_made')
+
+    def turn_changed(self, player):
+        self.events.append('turn_changed')
+
+    def game_over(self, winner):
+        self.events.append('game_over')
+
+class TestConnectFour(unittest.TestCase):
+    '''
+    Tests the ConnectFour game loop without console I/O.
+    '''
+    def test_headless_game(self):
+        connect_four = ConnectFour(settings.AI_PLAYER, settings.AI_PLAYER, NullObserver(), {'max_depth': 2})
+
+        while not connect_four.gameover:
+            connect_four.progress_turn()
+
+        connect_four.display_game_results()
+        self.assertEqual(True, connect_four.board.winner() or connect_four.board.tie())
+
+    def test_human_input(self):
+        connect_four = ConnectFour(settings.HUMAN_PLAYER, settings.HUMAN_PLAYER, NullObserver())
+        moves = iter(['', 'x', '0', '9', '3'])
+        connect_four.current_turn_player.read_move = lambda prompt: next(moves)
+        color = connect_four.current_turn_player.get_color()
+
+        connect_four.handle_move()
+        self.assertEqual([(3, None)], connect_four.board.move_stack)
+        self.assertEqual(color, connect_four.board[settings.ROWS - 1, 2])
+
+    def test_observer_events(self):
+        observer = RecordingObserver()
+        connect_four = ConnectFour(settings.HUMAN_PLAYER, settings.HUMAN_PLAYER, observer)
+        first_color = connect_four.current_turn_player.get_color()
+
+        for column in (1, 2, 1, 2, 1, 2, 1):
+            self.assertEqual(True, connect_four.submit_move(str(column)))
+
+        self.assertEqual(False, connect_four.submit_move('3'))
+        connect_four.display_game_results()
+
+        self.assertEqual(['first_player_chosen'] + ['move_made', 'turn_changed'] * 6 + ['move_made', 'game_over'], observer.events)
+        self.assertEqual(first_color, connect_four.get_last_winner().get_color())
+
+    def test_console_messages(self):
+        messages = []
+        connect_four = ConnectFour(settings.HUMAN_PLAYER, settings.HUMAN_PLAYER, ConsoleObserver(messages.append))
+        first = 'Player1 -- (RED) is first!' if connect_four.current_turn_player.get_color() == settings.RED \
+            else 'Player2 -- (YELLOW) is first!'
+        connect_four.submit_move('4')
+        connect_four.display_overall_results()
+
+        self.assertEqual(first, messages[0])
+        self.assertIn(messages[1], ("Player1 (RED)'s Turn to Move", "Player2 (YELLOW)'s Turn to Move"))
+        self.assertEqual('Player1 (HUMAN): 0 --- Player2 (HUMAN): 0', messages[4])
+
+        # The board is passed to output like every other message instead of being printed
+        connect_four.observer.board_changed(connect_four.board)
+        self.assertEqual(str(connect_four.board), messages[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import os
+from random import Random
+from unittest.mock import patch
+from python_settings import settings
+from board import Board
+from bitboard import BitBoard
+from threat_bitboard import ThreatBitBoard
+from player_ai import PlayerAI
+from geometry import evaluation_table, utility_value, winning_lines, winning_slots
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+def board_size(rows, cols, connect):
+    '''
+    Returns the patches that configure a board of rows x cols with connect in a row for the duration of a test.
+    '''
+    return patch.multiple(settings, ROWS=rows, COLS=cols, CONNECT=connect)
+
+class TestGeometry(unittest.TestCase):
+    '''
+    Tests the evaluation tables and line indexes generated per board size, and the boards on other sizes.
+    '''
+    def test_standard_board(self):
+        self.assertEqual([
+            [3, 4, 5, 7, 5, 4, 3],
+            [4, 6, 8, 10, 8, 6, 4],
+            [5, 8, 11, 13, 11, 8, 5],
+            [5, 8, 11, 13, 11, 8, 5],
+            [4, 6, 8, 10, 8, 6, 4],
+            [3, 4, 5, 7, 5, 4, 3],
+        ], evaluation_table(6, 7, 4))
+        self.assertEqual(138, utility_value(6, 7, 4))
+        self.assertIs(evaluation_table(6, 7, 4), evaluation_table(6, 7, 4))
+
+    def test_line_counts(self):
+        for rows, cols, connect in ((6, 7, 4), (7, 8, 4), (8, 9, 5)):
+            lines, cell_lines = winning_lines(rows, cols, connect)
+            expected = rows * (cols - connect + 1) + cols * (rows - connect + 1) + \
+                2 * (rows - connect + 1) * (cols - connect + 1)
+
+            self.assertEqual(expected, len(lines))
+            self.assertEqual(connect * expected, sum(map(sum, evaluation_table(rows, cols, connect))))
+            self.assertEqual(connect * expected, sum(len(cell) for cell in cell_lines))
+
+    def test_winning_slots(self):
+        # Three in a row on the bottom row of a board with columns of 9 bits, with the fourth missing on either side
+        pieces = 1 << 9 | 1 << 18 | 1 << 27
+
+        self.assertEqual(1 | 1 << 36, winning_slots(pieces, 9, 4) & (1 | 1 << 36))
+        self.assertEqual(0, winning_slots(pieces, 9, 5) & (1 | 1 << 36))
+        self.assertNotEqual(0, winning_slots(pieces | 1 << 36, 9, 5) & (1 | 1 << 45))
+
+    def test_connect_five_matches_board(self):
+        random = Random(0)
+
+        with board_size(8, 9, 5):
+            for _ in range(20):
+                board = Board()
+                bitboard = ThreatBitBoard()
+                color = settings.RED
+
+                while not board.gameover():
+                    player_move = random.choice(board.all_moves())
+                    board.move(player_move, color)
+                    bitboard.move(player_move, color)
+                    color = settings.YELLOW if color == settings.RED else settings.RED
+
+                    self.assertEqual(board.winner(), bitboard.winner())
+                    self.assertEqual(repr(board), repr(bitboard))
+                    self.assertEqual(board.get_score(settings.RED), bitboard.get_score(settings.RED))
+
+                self.assertEqual(board.get_winner(), bitboard.get_winner())
+                self.assertEqual(board.get_winner(), BitBoard.from_board(board).get_winner())
+
+    def test_larger_board_search(self):
+        with board_size(7, 8, 4):
+            board = Board()
+
+            for column in (1, 2, 3):
+                board.move(column, settings.RED)
+
+            self.assertEqual(16, len(repr(board).splitlines()[0]) - 1)
+            self.assertEqual(True, board.valid_move('8'))
+            self.assertEqual(False, board.valid_move('9'))
+
+            for evaluation in (settings.POSITIONAL_EVALUATION, settings.THREAT_EVALUATION):
+                self.assertEqual('4', PlayerAI(settings.YELLOW, max_depth=2, evaluation=evaluation).best_move(board))
+                self.assertEqual('4', PlayerAI(settings.RED, max_depth=2, evaluation=evaluation).best_move(board))
+
+            minimax_ai = PlayerAI(settings.YELLOW, search=settings.MINIMAX_SEARCH, max_depth=3, tactical_check=False)
+            alpha_beta_ai = PlayerAI(settings.YELLOW, max_depth=3, tactical_check=False)
+            board.move(4, settings.YELLOW)
+            self.assertEqual(minimax_ai.best_move(board), alpha_beta_ai.best_move(board))
+
+
+if __name__ == '__main__':
+    unittest.main()
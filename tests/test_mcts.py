@@ -0,0 +1,115 @@
+import unittest
+import os
+from time import perf_counter
+from python_settings import settings
+from bitboard import BitBoard
+from board import Board
+from mcts import MonteCarloTreeSearch
+from player_ai import PlayerAI, search_mcts_tree
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestMonteCarloTreeSearch(unittest.TestCase):
+    '''
+    Tests the Monte Carlo tree search and the MCTS difficulty of PlayerAI.
+    '''
+    def test_finds_wins_and_blocks(self):
+        mcts = MonteCarloTreeSearch(seed=0)
+
+        # RED wins on top of column 1, then YELLOW has to block it
+        board = BitBoard.from_move_string('121212')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        self.assertEqual(1, mcts.search(board, color, 2000, None))
+        self.assertEqual(2000, mcts.iterations)
+
+        board = BitBoard.from_move_string('12121')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        self.assertEqual(1, mcts.search(board, color, 2000, None))
+
+    def test_tree_reuse(self):
+        mcts = MonteCarloTreeSearch(seed=0)
+        board = BitBoard.from_move_string('44')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        mcts.search(board, color, 1000, None)
+        self.assertEqual(0, mcts.reused_visits)
+        self.assertEqual(1000, sum(mcts.get_root_visits().values()))
+
+        board.move(3, settings.RED)
+        board.move(5, settings.YELLOW)
+        mcts.search(board, color, 500, None)
+        self.assertGreater(mcts.reused_visits, 0)
+        self.assertEqual(mcts.reused_visits + 500, mcts.visits[0])
+        self.assertEqual(mcts.reused_visits + 500, sum(mcts.get_root_visits().values()) + 1)
+
+        # Any other position starts a new tree
+        board = BitBoard.from_move_string('1')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        mcts.search(board, color, 100, None)
+        self.assertEqual(0, mcts.reused_visits)
+        self.assertEqual(100, mcts.visits[0])
+
+    def test_node_limit(self):
+        mcts = MonteCarloTreeSearch(max_nodes=50, seed=0)
+        board, color = BitBoard(), settings.RED
+        self.assertNotEqual(-1, mcts.search(board, color, 1000, None))
+        self.assertLessEqual(mcts.size, 50)
+        self.assertEqual(1000, sum(mcts.get_root_visits().values()))
+
+    def test_time_budget(self):
+        mcts = MonteCarloTreeSearch(seed=0)
+        board, color = BitBoard(), settings.RED
+        self.assertNotEqual(-1, mcts.search(board, color, None, 20))
+        self.assertLess(mcts.elapsed, 1.0)
+
+    def test_mcts_player(self):
+        board = Board()
+        player_ai = PlayerAI(settings.RED, difficulty=settings.MCTS, mcts_iterations=500)
+        self.assertEqual(True, board.valid_move(player_ai.get_move(board=board)))
+
+    def test_worker_visits(self):
+        # A worker that gets two tasks of the same move only returns the visits of the second one again
+        board = BitBoard.from_move_string('4')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        visits, rollouts, _ = search_mcts_tree(board, color, 300, None)
+        self.assertEqual(300, sum(visits.values()))
+        visits, rollouts, _ = search_mcts_tree(board, color, 200, None)
+        self.assertEqual(200, rollouts)
+        self.assertEqual(200, sum(visits.values()))
+
+    def test_parallel_mcts_player(self):
+        board = Board()
+        board.move(4, settings.RED)
+        player_ai = PlayerAI(settings.YELLOW, difficulty=settings.MCTS, workers=2, mcts_iterations=300, collect_stats=True)
+
+        try:
+            self.assertEqual(True, board.valid_move(player_ai.get_move(board=board)))
+            self.assertEqual(600, player_ai.mcts_rollouts)
+            self.assertEqual(2, len(player_ai.last_stats.rollout_rates))
+        finally:
+            player_ai.close()
+
+    def test_parallel_mcts_latency(self):
+        # More workers than processors, so tasks share processors or wait for one, the move still ends on time
+        board = Board()
+        player_ai = PlayerAI(settings.RED, difficulty=settings.MCTS, workers=3, mcts_iterations=None,
+                             mcts_time_budget_ms=300)
+
+        try:
+            player_ai.get_move(board=board)
+            board.move(4, settings.RED)
+            board.move(4, settings.YELLOW)
+            start = perf_counter()
+            self.assertEqual(True, board.valid_move(player_ai.get_move(board=board)))
+            self.assertLess(perf_counter() - start, 0.5)
+        finally:
+            player_ai.close()
+
+    def test_deadline(self):
+        mcts = MonteCarloTreeSearch(seed=0)
+        board, color = BitBoard(), settings.RED
+        self.assertEqual(-1, mcts.search(board, color, 1000, None, deadline=0.0))
+        self.assertEqual(0, mcts.iterations)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+from python_settings import settings
+from board import Board
+from move_cache import MoveCache
+from player_ai import PlayerAI
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestMoveCache(unittest.TestCase):
+    '''
+    Tests the memory-mapped move cache and PlayerAI's use of it.
+    '''
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'moves.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_probe_and_store(self):
+        cache = MoveCache(self.path, slots=64)
+        self.assertEqual(None, cache.probe(12345, 1))
+
+        cache.store(12345, 4, 3)
+        self.assertEqual(3, cache.probe(12345, 4))
+        self.assertEqual(3, cache.probe(12345, 2))
+        self.assertEqual(None, cache.probe(12345, 5))
+        # Same slot, other key
+        self.assertEqual(None, cache.probe(12345 + 64, 1))
+
+        # Shallower results do not replace deeper ones of the same key
+        cache.store(12345, 2, 5)
+        self.assertEqual(3, cache.probe(12345, 1))
+
+        # Other processes see the stores through their own mapping, and keep the slot count of the file
+        other_cache = MoveCache(self.path, slots=1024)
+        self.assertEqual(3, other_cache.probe(12345, 4))
+        self.assertEqual(64, other_cache.slots)
+        other_cache.store(999, 6, 7)
+        self.assertEqual(7, cache.probe(999, 6))
+
+        other_cache.close()
+        cache.close()
+
+    def test_torn_slot(self):
+        cache = MoveCache(self.path, slots=64)
+        cache.store(12345, 4, 3)
+        offset = cache.slot_offset(12345)
+        # A write of another key that only got halfway
+        cache.map[offset + 8:offset + 16] = MoveCache.SLOT.pack(0, 6 << 8 | 1)[8:]
+        self.assertEqual(None, cache.probe(12345, 1))
+        cache.close()
+
+    def test_other_board_size(self):
+        MoveCache(self.path, slots=64).open()
+
+        with patch.object(settings, 'COLS', 8):
+            self.assertRaises(ValueError, MoveCache(self.path).open)
+
+    def test_cached_moves(self):
+        board = Board()
+
+        board.move(4, settings.RED)
+        board.move(4, settings.YELLOW)
+        board.move(3, settings.RED)
+
+        player_ai = PlayerAI(settings.YELLOW, max_depth=4, move_cache_path=self.path)
+        best_move = player_ai.best_move(board)
+        self.assertEqual(PlayerAI(settings.YELLOW, max_depth=4).best_move(board), best_move)
+        self.assertEqual(1, player_ai.move_cache.stores)
+        player_ai.close()
+
+        # A new AI searching as deep finds the move in the file, a deeper one searches again
+        restarted_ai = PlayerAI(settings.YELLOW, max_depth=4, move_cache_path=self.path)
+        self.assertEqual(best_move, restarted_ai.best_move(board))
+        self.assertEqual(1, restarted_ai.move_cache.hits)
+        self.assertEqual(0, restarted_ai.node_count)
+
+        deeper_ai = PlayerAI(settings.YELLOW, max_depth=5, move_cache_path=self.path)
+        deeper_ai.best_move(board)
+        self.assertEqual(1, deeper_ai.move_cache.misses)
+        self.assertEqual(1, deeper_ai.move_cache.stores)
+
+        # Entries of the other color do not match
+        red_ai = PlayerAI(settings.RED, max_depth=4, move_cache_path=self.path)
+        red_ai.best_move(board)
+        self.assertEqual(0, red_ai.move_cache.hits)
+
+        for player in (restarted_ai, deeper_ai, red_ai):
+            player.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
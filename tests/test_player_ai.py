@@ -0,0 +1,218 @@
+import unittest
+import os
+import time
+from random import Random
+from python_settings import settings
+from board import Board
+from bitboard import BitBoard
+from player_ai import PlayerAI, SearchTimeout, search_root_move, worker_players
+from transposition_table import TranspositionTable
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+def random_positions(count, max_moves, seed=0):
+    '''
+    Returns count Boards that were reached by playing up to max_moves random moves without ending the game.
+    '''
+    random = Random(seed)
+    positions = []
+
+    while len(positions) < count:
+        board = Board()
+        color = settings.RED
+
+        for _ in range(random.randint(0, max_moves)):
+            board.move(random.choice(board.all_moves()), color)
+            color = settings.YELLOW if color == settings.RED else settings.RED
+
+            if board.gameover():
+                break
+
+        if not board.gameover():
+            positions.append((board, color))
+
+    return positions
+
+class TestPlayerAI(unittest.TestCase):
+    '''
+    Tests the search of the AI player for Connect Four.
+    '''
+    def test_alpha_beta_matches_minimax(self):
+        for board, color in random_positions(25, 20):
+            for depth in (1, 2, 3):
+                minimax_ai = PlayerAI(color, search=settings.MINIMAX_SEARCH, max_depth=depth)
+                alpha_beta_ai = PlayerAI(color, search=settings.ALPHA_BETA_SEARCH, max_depth=depth, batch_leaves=False)
+                batched_ai = PlayerAI(color, search=settings.ALPHA_BETA_SEARCH, max_depth=depth, batch_leaves=True)
+
+                self.assertEqual(minimax_ai.best_move(board), alpha_beta_ai.best_move(board))
+                self.assertEqual(minimax_ai.best_move(board), batched_ai.best_move(board))
+
+    def test_threat_evaluation(self):
+        for board, color in random_positions(10, 20, seed=2):
+            minimax_ai = PlayerAI(color, search=settings.MINIMAX_SEARCH, max_depth=3, evaluation=settings.THREAT_EVALUATION)
+            alpha_beta_ai = PlayerAI(color, max_depth=3, evaluation=settings.THREAT_EVALUATION)
+
+            self.assertEqual(minimax_ai.best_move(board), alpha_beta_ai.best_move(board))
+
+        board = Board()
+
+        for column in (2, 3):
+            board.move(column, settings.RED)
+
+        # Only the threat evaluation sees that an open two on the bottom row has to be blocked at depth 1
+        self.assertIn(PlayerAI(settings.YELLOW, max_depth=1, evaluation=settings.THREAT_EVALUATION).best_move(board), ('1', '4'))
+        self.assertEqual('3', PlayerAI(settings.YELLOW, max_depth=1).best_move(board))
+
+    def test_transposition_table_kept_between_turns(self):
+        for replacement in (settings.TT_DEPTH_PREFERRED, settings.TT_LRU):
+            table = TranspositionTable(max_entries=1024, replacement=replacement)
+            alpha_beta_ais = {color: PlayerAI(color, max_depth=3, transposition_table=table) for color in (settings.RED, settings.YELLOW)}
+
+            for board, color in random_positions(10, 12, seed=1) * 2:
+                minimax_ai = PlayerAI(color, search=settings.MINIMAX_SEARCH, max_depth=3)
+                self.assertEqual(minimax_ai.best_move(board), alpha_beta_ais[color].best_move(board))
+
+            self.assertGreater(table.get_stats()['hits'], 0)
+
+    def test_mirrored_positions_share_entries(self):
+        board = BitBoard.from_move_string('1121')
+        mirrored_board = BitBoard.from_move_string('7767')
+        table = TranspositionTable()
+        alpha_beta_ai = PlayerAI(settings.YELLOW, max_depth=4, transposition_table=table)
+
+        move = int(alpha_beta_ai.best_move(board))
+        stores = table.get_stats()['stores']
+        mirrored_move = int(alpha_beta_ai.best_move(mirrored_board))
+
+        self.assertEqual(settings.COLS + 1 - move, mirrored_move)
+        self.assertEqual(stores, table.get_stats()['stores'])
+
+    def test_parallel_matches_serial(self):
+        parallel_ais = {color: PlayerAI(color, max_depth=4, workers=2) for color in (settings.RED, settings.YELLOW)}
+
+        try:
+            for board, color in random_positions(5, 16, seed=2):
+                serial_ai = PlayerAI(color, max_depth=4)
+                self.assertEqual(serial_ai.best_move(board), parallel_ais[color].best_move(board))
+        finally:
+            for parallel_ai in parallel_ais.values():
+                parallel_ai.close()
+
+    def test_parallel_search_options(self):
+        options = dict(max_depth=3, batch_leaves=False, tactical_check=False, evaluation=settings.THREAT_EVALUATION)
+        parallel_ais = {color: PlayerAI(color, workers=2, **options) for color in (settings.RED, settings.YELLOW)}
+
+        try:
+            for board, color in random_positions(5, 12, seed=4):
+                serial_ai = PlayerAI(color, **options)
+                self.assertEqual(serial_ai.best_move(board), parallel_ais[color].best_move(board))
+        finally:
+            for parallel_ai in parallel_ais.values():
+                parallel_ai.close()
+
+        # Worker players are created with every search option of the AI that submitted the task
+        parent_ai = PlayerAI(settings.RED, **options)
+        board = parent_ai.create_search_board(Board())
+        search_root_move(board, 4, 3, settings.RED, parent_ai.search_options())
+        worker_ai = worker_players[settings.RED, tuple(sorted(parent_ai.search_options().items()))]
+        self.assertEqual(parent_ai.search_options(), worker_ai.search_options())
+
+        board = parent_ai.create_search_board(Board())
+        self.assertRaises(SearchTimeout, search_root_move, board, 4, 4, settings.RED, parent_ai.search_options(),
+                          time.time() - 1)
+        self.assertEqual(None, worker_ai.deadline)
+
+    def test_search_stats(self):
+        for board, color in random_positions(5, 16, seed=3):
+            stats_ai = PlayerAI(color, max_depth=4, collect_stats=True)
+            move, stats = stats_ai.get_move_with_stats(board)
+
+            self.assertEqual(PlayerAI(color, max_depth=4).best_column(board), move)
+            self.assertIs(stats, stats_ai.last_stats)
+            self.assertEqual([4], list(stats.depth_times))
+            self.assertEqual(stats.leaves, stats.evaluations)
+            self.assertGreater(stats.nodes, stats.leaves)
+            self.assertLessEqual(stats.table_hits, stats.table_probes)
+            self.assertEqual(move, stats.to_record()['move'])
+            self.assertEqual(move, stats_ai.get_column(board=board))
+
+    def test_iterative_deepening_time_budget(self):
+        board = Board()
+        board.move(4, settings.RED)
+        hard_ai = PlayerAI(settings.YELLOW, difficulty=settings.HARD, time_budget_ms=200)
+
+        start = time.perf_counter()
+        move = hard_ai.get_move(board=board)
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(True, board.valid_move(move))
+        self.assertEqual(None, hard_ai.deadline)
+
+    def test_takes_immediate_win(self):
+        board = Board()
+
+        for column in (1, 2, 3):
+            board.move(column, settings.RED)
+            board.move(column, settings.YELLOW)
+
+        self.assertEqual('4', PlayerAI(settings.RED).best_move(board))
+        self.assertEqual('4', PlayerAI(settings.RED, difficulty=settings.HARD, time_budget_ms=100).get_move(board=board))
+
+    def test_blocks_immediate_loss(self):
+        board = Board()
+
+        for column in (1, 2, 3):
+            board.move(column, settings.RED)
+
+        board.move(7, settings.YELLOW)
+        self.assertEqual('4', PlayerAI(settings.YELLOW).best_move(board))
+
+    def test_tactical_moves(self):
+        player = PlayerAI(settings.RED)
+
+        # RED can win in column 4 and has to block YELLOW in column 7, the win comes first
+        board = BitBoard.from_move_string('172737')
+        self.assertEqual((4, None), player.tactical_moves(board))
+
+        board = BitBoard.from_move_string('172767')
+        self.assertEqual((7, None), player.tactical_moves(board))
+
+        # Playing column 4 would let YELLOW complete the second row on top of it
+        board = BitBoard.from_move_string('6625731725')
+        self.assertEqual((None, [1, 2, 3, 5, 6, 7]), player.tactical_moves(board))
+        self.assertNotEqual('4', player.best_move(board))
+        self.assertEqual((None, None), PlayerAI(settings.RED, tactical_check=False).tactical_moves(board))
+
+    def test_random_column(self):
+        board = Board()
+        player_ai = PlayerAI(settings.RED, difficulty=settings.EASY)
+
+        # Every column but 3 and 6 is full
+        for column in (1, 2, 4, 5, 7):
+            for row in range(settings.ROWS):
+                board.move(column, settings.RED if row % 2 == 0 else settings.YELLOW)
+
+        columns = [player_ai.random_column(board) for _ in range(200)]
+        self.assertEqual({3, 6}, set(columns))
+        self.assertIn(player_ai.get_move(board=board), ('3', '6'))
+
+        for column in (3, 6):
+            for row in range(settings.ROWS):
+                board.move(column, settings.RED if row % 2 == 0 else settings.YELLOW)
+
+        self.assertEqual(-1, player_ai.random_column(board))
+
+        # Columns filled or emptied directly on the grid
+        board = Board()
+
+        for column in range(settings.COLS):
+            if column != 4:
+                board.board[0][column] = settings.RED
+
+        self.assertEqual({5}, {player_ai.random_column(board) for _ in range(50)})
+        board.board[0][0] = settings.EMPTY
+        self.assertEqual({1, 5}, {player_ai.random_column(board) for _ in range(100)})
+
+
+if __name__ == '__main__':
+    unittest.main()
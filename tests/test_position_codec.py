@@ -0,0 +1,48 @@
+import unittest
+import os
+import tempfile
+from random import Random
+from python_settings import settings
+from board import Board
+from bitboard import BitBoard
+from position_codec import pack_positions, unpack_positions, write_positions, read_positions
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestPositionCodec(unittest.TestCase):
+    '''
+    Tests packing, writing and reading positions as 64 bit keys.
+    '''
+    def setUp(self):
+        random = Random(0)
+        self.boards = [BitBoard()]
+        color = settings.RED
+
+        while not self.boards[-1].gameover():
+            board = BitBoard.from_move_string(self.boards[-1].to_move_string())
+            board.move(random.choice(board.all_moves()), color)
+            color = settings.YELLOW if color == settings.RED else settings.RED
+            self.boards.append(board)
+
+    def test_pack_unpack(self):
+        keys = pack_positions(self.boards)
+
+        self.assertEqual(8, keys.itemsize)
+        self.assertEqual([repr(board) for board in self.boards], [repr(board) for board in unpack_positions(keys)])
+        self.assertEqual([repr(board) for board in self.boards], [repr(board) for board in unpack_positions(keys, Board)])
+
+    def test_write_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'positions.bin')
+
+            self.assertEqual(len(self.boards), write_positions(path, self.boards))
+            self.assertEqual(len(self.boards), write_positions(path, self.boards[:1]) + len(self.boards) - 1)
+            self.assertEqual(8 * (len(self.boards) + 1), os.path.getsize(path))
+
+            keys = read_positions(path)
+
+        self.assertEqual(list(pack_positions(self.boards)) + [self.boards[0].to_key()], list(keys))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import os
+from python_settings import settings
+from self_play import SelfPlay, play_game
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestSelfPlay(unittest.TestCase):
+    '''
+    Tests the headless AI vs AI game runner.
+    '''
+    def test_play_game(self):
+        result = play_game({'difficulty': settings.EASY}, {'difficulty': settings.MEDIUM, 'max_depth': 2}, settings.RED, 0)
+
+        self.assertIn(result['winner'], (settings.RED, settings.YELLOW, None))
+        self.assertEqual(result['moves'], len(result['move_times'][settings.RED]) + len(result['move_times'][settings.YELLOW]))
+        self.assertEqual(result['moves'], play_game({'difficulty': settings.EASY}, {'difficulty': settings.MEDIUM, 'max_depth': 2}, settings.RED, 0)['moves'])
+
+    def test_run(self):
+        easy = {'difficulty': settings.EASY}
+        medium = {'difficulty': settings.MEDIUM, 'max_depth': 2}
+        serial = SelfPlay(easy, medium, 8, seed=5).run()
+        parallel = SelfPlay(easy, medium, 8, seed=5, workers=2).run()
+
+        self.assertEqual(8, serial['games'])
+        self.assertEqual(8, serial['red_wins'] + serial['yellow_wins'] + serial['draws'])
+        self.assertGreater(serial['yellow_wins'], serial['red_wins'])
+
+        for key in ('red_wins', 'yellow_wins', 'draws', 'average_moves'):
+            self.assertEqual(serial[key], parallel[key])
+
+    def test_openings(self):
+        medium = {'difficulty': settings.MEDIUM, 'max_depth': 2}
+        results = [play_game(medium, medium, settings.RED, seed, 2) for seed in range(4)]
+
+        self.assertEqual([2] * 4, [len(result['opening']) for result in results])
+        self.assertGreater(len({result['opening'] for result in results}), 1)
+        self.assertEqual(results[1], dict(play_game(medium, medium, settings.RED, 1, 2), move_times=results[1]['move_times']))
+        self.assertEqual(results[0]['moves'] - 2, len(results[0]['move_times'][settings.RED]) + len(results[0]['move_times'][settings.YELLOW]))
+
+        # Without an opening every game between two search difficulties is the same game
+        summary = SelfPlay(medium, medium, 4, first_color=settings.RED, opening_moves=0).run()
+        self.assertEqual(1, summary['openings'])
+        summary = SelfPlay(medium, medium, 4, first_color=settings.RED, seed=3, opening_moves=2).run()
+        self.assertGreater(summary['openings'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
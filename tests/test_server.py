@@ -0,0 +1,181 @@
+import unittest
+import os
+import asyncio
+import json
+from time import perf_counter
+from unittest.mock import patch
+from python_settings import settings
+from board import Board
+from player_ai import PlayerAI
+from server import GameServer, GameSession, search_session_move, worker_players
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestServer(unittest.TestCase):
+    '''
+    Tests the asyncio game server over a local TCP connection.
+    '''
+    def setUp(self):
+        self.game_server = GameServer(workers=2, ai_options={'max_depth': 2})
+
+    def tearDown(self):
+        self.game_server.close()
+
+    def run_client(self, client):
+        async def run():
+            server = await self.game_server.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+
+            async with server:
+                return await client(port)
+
+        return asyncio.run(run())
+
+    async def request(self, reader, writer, **request):
+        writer.write((json.dumps(request) + '\n').encode())
+        await writer.drain()
+
+        return json.loads(await reader.readline())
+
+    def test_play_game(self):
+        async def client(port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            state = await self.request(reader, writer, command='new')
+            session = state['session']
+
+            while not state['gameover']:
+                self.assertEqual('human', state['turn'])
+                column = next(j + 1 for j in range(settings.COLS) if state['board'][0][j] == settings.EMPTY)
+                state = await self.request(reader, writer, command='move', session=session, column=column)
+                self.assertEqual(True, state['ok'])
+
+            latency = await self.request(reader, writer, command='close', session=session)
+            writer.close()
+            await writer.wait_closed()
+
+            return state, latency
+
+        state, latency = self.run_client(client)
+
+        self.assertIn(state['winner'], ('human', 'ai', None))
+        self.assertEqual(True, any('Wins!' in message or 'Tie!' in message for message in state['messages']))
+        ai_pieces = sum(row.count(settings.YELLOW) for row in state['board'])
+        self.assertEqual(ai_pieces, latency['latency']['search']['count'])
+        self.assertGreater(latency['latency']['request']['count'], 0)
+
+    def test_concurrent_sessions(self):
+        async def client(port):
+            connections = [await asyncio.open_connection('127.0.0.1', port) for _ in range(4)]
+            states = await asyncio.gather(*(self.request(reader, writer, command='new') for reader, writer in connections))
+            moves = await asyncio.gather(*(self.request(reader, writer, command='move', session=state['session'], column=4)
+                                           for (reader, writer), state in zip(connections, states)))
+
+            for _, writer in connections:
+                writer.close()
+                await writer.wait_closed()
+            await writer.wait_closed()
+
+            return states, moves
+
+        states, moves = self.run_client(client)
+
+        self.assertEqual(4, len({state['session'] for state in states}))
+        self.assertEqual([True] * 4, [move['ok'] for move in moves])
+
+    def test_slow_session(self):
+        # A HARD session searches for its whole time budget, a MEDIUM depth 2 session keeps being served meanwhile
+        self.game_server.ai_options['time_budget_ms'] = 1500
+
+        async def client(port):
+            connections = [await asyncio.open_connection('127.0.0.1', port) for _ in range(2)]
+            (slow_reader, slow_writer), (fast_reader, fast_writer) = connections
+            slow_state = await self.request(slow_reader, slow_writer, command='new', difficulty=settings.HARD)
+            fast_state = await self.request(fast_reader, fast_writer, command='new', difficulty=settings.MEDIUM)
+            start = perf_counter()
+
+            async def fast_moves():
+                for column in (1, 1, 1):
+                    await self.request(fast_reader, fast_writer, command='move', session=fast_state['session'], column=column)
+
+                return perf_counter() - start
+
+            slow_move = self.request(slow_reader, slow_writer, command='move', session=slow_state['session'], column=7)
+            slow_state, fast_time = await asyncio.gather(slow_move, fast_moves())
+            slow_time = perf_counter() - start
+
+            for _, writer in connections:
+                writer.close()
+                await writer.wait_closed()
+
+            return slow_state, slow_time, fast_time
+
+        slow_state, slow_time, fast_time = self.run_client(client)
+
+        self.assertEqual(True, slow_state['ok'])
+        self.assertGreater(slow_time, 1.4)
+        self.assertLess(fast_time, 1.0)
+
+    def test_invalid_requests(self):
+        async def client(port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            responses = [
+                await self.request(reader, writer, command='fly'),
+                await self.request(reader, writer, command='move', session=99, column=1),
+            ]
+            state = await self.request(reader, writer, command='new')
+            responses.append(await self.request(reader, writer, command='move', session=state['session'], column=9))
+            responses.append(await self.request(reader, writer, command='new', difficulty='x'))
+            responses.append(await self.request(reader, writer, command='new', difficulty=99))
+            responses.append(await self.request(reader, writer, command='move', session=state['session'], column='x'))
+            # The connection is still served after every bad request
+            responses.append(await self.request(reader, writer, command='state', session=state['session']))
+            writer.close()
+            await writer.wait_closed()
+
+            return responses
+
+        responses = self.run_client(client)
+
+        self.assertEqual(['invalid request', 'unknown session', 'invalid move', 'invalid difficulty', 'invalid difficulty',
+                          'invalid move'], [response['error'] for response in responses[:-1]])
+        self.assertEqual(True, responses[-1]['ok'])
+        self.assertEqual(1, len(self.game_server.sessions))
+
+    def test_failing_request(self):
+        async def client(port):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            state = await self.request(reader, writer, command='new')
+            self.game_server.sessions[state['session']].get_state = None
+            response = await self.request(reader, writer, command='state', session=state['session'])
+            latency = await self.request(reader, writer, command='latency', session=state['session'])
+            writer.close()
+            await writer.wait_closed()
+
+            return response, latency
+
+        response, latency = self.run_client(client)
+
+        self.assertEqual(False, response['ok'])
+        self.assertEqual('internal error: TypeError', response['error'])
+        self.assertEqual(True, latency['ok'])
+
+    def test_session_players(self):
+        # The session's AI only stands in for the AI searched by the workers
+        session = GameSession(1, {'difficulty': settings.MCTS})
+        self.assertNotIsInstance(session.connect_four.player2, PlayerAI)
+        self.assertEqual(settings.AI_STR, session.connect_four.player2.get_player_str())
+
+        # Workers keep at most settings.SERVER_WORKER_PLAYERS AIs
+        worker_players.clear()
+
+        with patch.object(settings, 'SERVER_WORKER_PLAYERS', 2):
+            for session_id in range(1, 4):
+                column, _ = search_session_move(('test', session_id), settings.YELLOW, {'max_depth': 2}, Board())
+                self.assertEqual(True, Board().valid_column(column))
+
+        self.assertEqual([('test', 2), ('test', 3)], list(worker_players))
+        worker_players.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import os
+import tempfile
+from time import perf_counter
+from random import Random
+from python_settings import settings
+from bitboard import BitBoard
+from board import Board
+from solver import Solver
+from opening_book import OpeningBook
+from player_ai import PlayerAI
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestSolver(unittest.TestCase):
+    '''
+    Tests the perfect play solver and its opening book.
+    '''
+    def brute_force(self, board, color) -> int:
+        # Scores every line of play to the end of the game, using the same score convention as the solver
+        best_score = None
+        opposing_color = settings.YELLOW if color == settings.RED else settings.RED
+
+        for move in board.all_moves():
+            board.move(move, color)
+
+            if board.winner():
+                score = (settings.ROWS * settings.COLS + 2 - board.moves_played) // 2
+            elif board.tie():
+                score = 0
+            else:
+                score = -self.brute_force(board, opposing_color)
+
+            board.undo_move(move)
+
+            if best_score is None or score > best_score:
+                best_score = score
+
+        return best_score
+
+    def test_matches_brute_force(self):
+        random = Random(3)
+        tested = 0
+
+        while tested < 15:
+            board, color = BitBoard(), settings.RED
+
+            while board.moves_played < random.randint(32, 36) and not board.gameover():
+                board.move(random.choice(board.all_moves()), color)
+                color = settings.YELLOW if color == settings.RED else settings.RED
+
+            if not board.gameover():
+                self.assertEqual(self.brute_force(board, color), Solver().solve(board, color))
+                tested += 1
+
+    def test_known_positions(self):
+        solver = Solver()
+
+        board = BitBoard.from_move_string('2252576253462244111563365343671351441')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        self.assertEqual(-1, solver.solve(board, color))
+
+        board = BitBoard.from_move_string('7422341735647741166133573473242566')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        self.assertEqual(1, solver.solve(board, color))
+
+    def test_mirrored_positions(self):
+        # A position and its mirror image share their transposition table entries, so solving the mirror image
+        # after the position takes far fewer nodes than solving it first
+        board = BitBoard.from_move_string('74223417356477411661')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        mirrored_board = BitBoard.from_move_string('14665471532411477227')
+        solver = Solver()
+
+        score = solver.solve(board, color)
+        nodes = solver.node_count
+        self.assertEqual(score, solver.solve(mirrored_board, color))
+        self.assertLess(solver.node_count - nodes, nodes // 10)
+
+    def test_plies_to_end(self):
+        solver = Solver()
+        board = BitBoard.from_move_string('112233')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+
+        score = solver.solve(board, color)
+        self.assertEqual(1, solver.plies_to_end(score, board.moves_played))
+
+        # Bottom row threats on both sides of 2, 3, 4 can not both be blocked
+        board = BitBoard.from_move_string('22334')
+        color = settings.RED if board.moves_played % 2 == 0 else settings.YELLOW
+        score = solver.solve(board, color)
+        self.assertLess(score, 0)
+        self.assertEqual(2, solver.plies_to_end(score, board.moves_played))
+
+    def test_opening_book(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'book.bin')
+
+            with open(path, 'wb') as book_file:
+                book_file.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, settings.ROWS, settings.COLS, settings.CONNECT, 1, 3))
+
+                for key, score in ((5, 1), (10, -2), (400, 0)):
+                    book_file.write(OpeningBook.RECORD.pack(key, score))
+
+            book = OpeningBook(path)
+            self.assertEqual(None, book.map)
+            self.assertEqual(-2, book.lookup(10))
+            self.assertEqual(0, book.lookup(400))
+            self.assertEqual(None, book.lookup(7))
+            self.assertEqual(1, book.get_plies())
+            book.close()
+
+    def test_perfect_player(self):
+        board = Board()
+
+        for move in (1, 2, 3):
+            board.move(move, settings.RED)
+            board.move(move, settings.YELLOW)
+
+        ai = PlayerAI(settings.RED, difficulty=settings.PERFECT, time_budget_ms=100)
+        self.assertEqual('4', ai.get_move(board=board))
+
+    def test_perfect_time_budget(self):
+        # Positions at the solver threshold can take seconds to solve, the move still has to fit the time budget
+        random = Random(5)
+        tested = 0
+
+        while tested < 6:
+            board, color = BitBoard(), settings.RED
+            position = Board()
+
+            while board.moves_played < settings.SOLVER_MIN_MOVES and not board.gameover():
+                move = random.choice(board.all_moves())
+                board.move(move, color)
+                position.move(move, color)
+                color = settings.YELLOW if color == settings.RED else settings.RED
+
+            if board.gameover():
+                continue
+
+            ai = PlayerAI(color, difficulty=settings.PERFECT, time_budget_ms=300)
+            start = perf_counter()
+            self.assertEqual(True, position.valid_move(ai.get_move(board=position)))
+            self.assertLess(perf_counter() - start, 0.6)
+            tested += 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+from random import Random
+from copy import deepcopy
+from python_settings import settings
+from bitboard import BitBoard
+from threat_bitboard import ThreatBitBoard
+from geometry import winning_lines
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+def count_open_lines(board, player_color):
+    '''
+    Returns the open line counts of player_color computed from scratch over every winning line.
+    '''
+    opposing_color = settings.YELLOW if player_color == settings.RED else settings.RED
+    open_lines = [0] * 5
+
+    for line in board.lines:
+        if not any(board.pieces[opposing_color] >> bit & 1 for bit in line):
+            open_lines[sum(board.pieces[player_color] >> bit & 1 for bit in line)] += 1
+
+    return open_lines
+
+class TestThreatBitBoard(unittest.TestCase):
+    '''
+    Tests the incremental open line counts and threats of ThreatBitBoard.
+    '''
+    def setUp(self):
+        self.board1 = ThreatBitBoard()
+
+    def test_winning_lines(self):
+        lines, cell_lines = winning_lines(settings.ROWS, settings.COLS, settings.CONNECT)
+
+        self.assertEqual(69, len(lines))
+        self.assertEqual(69 * 4, sum(len(cell) for cell in cell_lines))
+        # The center slot of the second row from the bottom is part of the most lines
+        self.assertEqual(13, max(len(cell) for cell in cell_lines))
+
+    def test_open_lines_match_scan(self):
+        random = Random(3)
+
+        for _ in range(10):
+            color = settings.RED
+            self.board1.initialize_new_board()
+
+            while not self.board1.gameover():
+                for player_move in self.board1.all_moves():
+                    self.board1.move(player_move, color)
+                    self.board1.undo_move(player_move)
+
+                self.board1.move(random.choice(self.board1.all_moves()), color)
+                color = settings.YELLOW if color == settings.RED else settings.RED
+
+                for player_color in (settings.RED, settings.YELLOW):
+                    self.assertEqual(count_open_lines(self.board1, player_color), self.board1.open_lines[player_color])
+
+            copy = ThreatBitBoard.from_board(self.board1)
+            self.assertEqual(self.board1.open_lines, copy.open_lines)
+            self.assertEqual(self.board1.line_counts, deepcopy(self.board1).line_counts)
+
+    def test_first_color(self):
+        self.board1.move(4, settings.YELLOW)
+        self.assertEqual(settings.YELLOW, self.board1.first_color)
+        self.assertEqual(settings.YELLOW, ThreatBitBoard.from_board(self.board1).first_color)
+
+        self.board1.move(4, settings.RED)
+        self.assertEqual(None, ThreatBitBoard.from_board(self.board1).first_color)
+
+        self.board1.undo_move(4)
+        self.board1.undo_move(4)
+        self.assertEqual(None, self.board1.first_color)
+
+    def test_threats(self):
+        for column in (1, 2, 3):
+            self.board1.move(column, settings.RED)
+
+        threats = self.board1.threats(settings.RED)
+
+        # The open three on the bottom row threatens the fourth column, which is on an odd row
+        self.assertEqual(1 << (3 * (settings.ROWS + 1)), threats)
+        self.assertEqual(settings.OPEN_THREE_VALUE + settings.OPEN_TWO_VALUE + settings.ODD_EVEN_THREAT_VALUE,
+                         self.board1.get_threat_score(settings.RED))
+        self.assertEqual(0, self.board1.threats(settings.YELLOW))
+
+
+if __name__ == '__main__':
+    unittest.main()
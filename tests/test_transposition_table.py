@@ -0,0 +1,52 @@
+import unittest
+import os
+from python_settings import settings
+from transposition_table import TranspositionTable
+
+os.environ["SETTINGS_MODULE"] = 'settings'
+
+class TestTranspositionTable(unittest.TestCase):
+    '''
+    Tests the transposition table used by the AI search.
+    '''
+    def test_probe_and_store(self):
+        table = TranspositionTable(max_entries=8)
+        self.assertEqual(None, table.probe(3))
+
+        table.store(3, 2, 100, settings.TT_EXACT, 4)
+        self.assertEqual((2, 100, settings.TT_EXACT, 4), table.probe(3))
+        self.assertEqual(1, table.get_stats()['hits'])
+        self.assertEqual(1, table.get_stats()['misses'])
+
+    def test_depth_preferred(self):
+        table = TranspositionTable(max_entries=8, replacement=settings.TT_DEPTH_PREFERRED)
+        table.store(3, 5, 100, settings.TT_EXACT, 4)
+
+        # 11 maps to the same slot as 3 but was searched shallower, so the deeper entry is kept
+        table.store(11, 2, 50, settings.TT_EXACT, 1)
+        self.assertEqual(None, table.probe(11))
+        self.assertEqual(5, table.probe(3)[0])
+
+        table.store(11, 6, 50, settings.TT_EXACT, 1)
+        self.assertEqual(None, table.probe(3))
+        self.assertEqual(6, table.probe(11)[0])
+
+    def test_lru(self):
+        table = TranspositionTable(max_entries=2, replacement=settings.TT_LRU)
+        table.store(1, 1, 10, settings.TT_EXACT, 1)
+        table.store(2, 1, 20, settings.TT_EXACT, 2)
+        table.probe(1)
+        table.store(3, 1, 30, settings.TT_EXACT, 3)
+
+        self.assertEqual(None, table.probe(2))
+        self.assertEqual(10, table.probe(1)[1])
+        self.assertEqual(30, table.probe(3)[1])
+        self.assertEqual(1, table.get_stats()['evictions'])
+
+    def test_shared(self):
+        self.assertIs(TranspositionTable.shared(), TranspositionTable.shared())
+        self.assertIsNot(TranspositionTable.shared(), TranspositionTable.shared('other'))
+
+
+if __name__ == '__main__':
+    unittest.main()